@@ -0,0 +1,4 @@
+"""Benchmarks for reasoner-converter.
+
+Run with `python -m benchmarks.run --help` from the repository root.
+"""
@@ -0,0 +1,631 @@
+"""Benchmark converters on synthetic messages.
+
+Reports throughput (objects/s), peak traced memory, memory blocks allocated
+and still retained after a run (i.e. by the output; tracemalloc cannot count
+blocks that were freed), and garbage collections triggered per run, and
+optionally saves them as JSON for comparison between commits:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+"""
+import argparse
+import atexit
+from collections.abc import Mapping
+import gc
+import io
+from itertools import islice
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from reasoner_converter import codegen, jsonio, models
+from reasoner_converter.bindings import ResultDowngrader, ResultUpgrader
+from reasoner_converter.compact import CompactKnowledgeGraph
+from reasoner_converter.lazy import lazy_downgrade_Message, lazy_upgrade_Message
+from reasoner_converter.parallel import available_cpus, parallel_map
+from reasoner_converter.downgrading import (
+    downgrade_BiolinkEntity, downgrade_Edge, downgrade_KnowledgeGraph,
+    downgrade_Message, downgrade_Node, downgrade_Query, downgrade_QueryGraph,
+    downgrade_Result,
+)
+from reasoner_converter.session import DowngradeSession, UpgradeSession
+from reasoner_converter.store import KnowledgeGraphStore, upgrade_message_store
+from reasoner_converter.streaming import downgrade_message_stream, upgrade_message_stream
+from reasoner_converter.synthetic import message0, message1
+from reasoner_converter.upgrading import (
+    upgrade_BiolinkEntity, upgrade_Edge, upgrade_KnowledgeGraph,
+    upgrade_Message, upgrade_Node, upgrade_Query, upgrade_QueryGraph,
+    upgrade_Result,
+)
+from reasoner_converter.util import message_size
+
+BENCHMARKS = dict()
+# worker processes for *_parallel benchmarks
+WORKERS = available_cpus()
+
+
+def benchmark(fcn):
+    """Register benchmark.
+
+    fcn(message0, message1) returns (run, objects) where run() performs the
+    conversion and objects is the number of objects it converts.
+    """
+    BENCHMARKS[fcn.__name__] = fcn
+    return fcn
+
+
+@benchmark
+def upgrade_message(msg0, msg1):
+    """Benchmark upgrade message."""
+    return lambda: upgrade_Message(msg0), message_size(msg0)
+
+
+@benchmark
+def downgrade_message(msg0, msg1):
+    """Benchmark downgrade message."""
+    return lambda: downgrade_Message(msg1), message_size(msg1)
+
+
+@benchmark
+def upgrade_query(msg0, msg1):
+    """Benchmark upgrade query."""
+    query = {"message": msg0}
+    return lambda: upgrade_Query(query), message_size(msg0)
+
+
+@benchmark
+def downgrade_query(msg0, msg1):
+    """Benchmark downgrade query."""
+    query = {"message": msg1}
+    return lambda: downgrade_Query(query), message_size(msg1)
+
+
+@benchmark
+def upgrade_query_json(msg0, msg1):
+    """Benchmark upgrade query from request body, with the standard library."""
+    data = json.dumps({"message": msg0}).encode()
+    return lambda: json.dumps(upgrade_Query(json.loads(data))).encode(), message_size(msg0)
+
+
+@benchmark
+def upgrade_query_bytes(msg0, msg1):
+    """Benchmark upgrade query from request body, with the fastest JSON backend."""
+    data = json.dumps({"message": msg0}).encode()
+    return lambda: jsonio.upgrade_query_bytes(data), message_size(msg0)
+
+
+@benchmark
+def downgrade_query_json(msg0, msg1):
+    """Benchmark downgrade query from request body, with the standard library."""
+    data = json.dumps({"message": msg1}).encode()
+    return lambda: json.dumps(downgrade_Query(json.loads(data))).encode(), message_size(msg1)
+
+
+@benchmark
+def downgrade_query_bytes(msg0, msg1):
+    """Benchmark downgrade query from request body, with the fastest JSON backend."""
+    data = json.dumps({"message": msg1}).encode()
+    return lambda: jsonio.downgrade_query_bytes(data), message_size(msg1)
+
+
+@benchmark
+def upgrade_message_parallel(msg0, msg1):
+    """Benchmark upgrade message with workers, where they can pay off."""
+    return lambda: upgrade_Message(msg0, workers=WORKERS), message_size(msg0)
+
+
+@benchmark
+def downgrade_message_parallel(msg0, msg1):
+    """Benchmark downgrade message with workers, where they can pay off."""
+    return lambda: downgrade_Message(msg1, workers=WORKERS), message_size(msg1)
+
+
+@benchmark
+def upgrade_nodes_parallel(msg0, msg1):
+    """Benchmark upgrade nodes in worker processes, always."""
+    nodes = msg0["knowledge_graph"]["nodes"]
+    return lambda: list(parallel_map(upgrade_Node, ((node,) for node in nodes), WORKERS)), len(nodes)
+
+
+@benchmark
+def upgrade_results_parallel(msg0, msg1):
+    """Benchmark upgrade results in worker processes, always."""
+    results = msg0["results"]
+    return lambda: list(parallel_map(
+        upgrade_Result, ((result,) for result in results), WORKERS,
+    )), len(results)
+
+
+@benchmark
+def downgrade_results_parallel(msg0, msg1):
+    """Benchmark downgrade results in worker processes, always."""
+    results = msg1["results"]
+    return lambda: list(parallel_map(
+        downgrade_Result, ((result,) for result in results), WORKERS,
+    )), len(results)
+
+
+@benchmark
+def upgrade_knowledge_graph(msg0, msg1):
+    """Benchmark upgrade knowledge graph."""
+    kgraph = msg0["knowledge_graph"]
+    return lambda: upgrade_KnowledgeGraph(kgraph), len(kgraph["nodes"]) + len(kgraph["edges"])
+
+
+@benchmark
+def downgrade_knowledge_graph(msg0, msg1):
+    """Benchmark downgrade knowledge graph."""
+    kgraph = msg1["knowledge_graph"]
+    return lambda: downgrade_KnowledgeGraph(kgraph), len(kgraph["nodes"]) + len(kgraph["edges"])
+
+
+@benchmark
+def upgrade_query_graph(msg0, msg1):
+    """Benchmark upgrade query graph."""
+    qgraph = msg0["query_graph"]
+    return lambda: upgrade_QueryGraph(qgraph), len(qgraph["nodes"]) + len(qgraph["edges"])
+
+
+@benchmark
+def downgrade_query_graph(msg0, msg1):
+    """Benchmark downgrade query graph."""
+    qgraph = msg1["query_graph"]
+    return lambda: downgrade_QueryGraph(qgraph), len(qgraph["nodes"]) + len(qgraph["edges"])
+
+
+@benchmark
+def upgrade_node(msg0, msg1):
+    """Benchmark upgrade node."""
+    nodes = msg0["knowledge_graph"]["nodes"]
+    return lambda: [upgrade_Node(node) for node in nodes], len(nodes)
+
+
+@benchmark
+def downgrade_node(msg0, msg1):
+    """Benchmark downgrade node."""
+    nodes = msg1["knowledge_graph"]["nodes"]
+    return lambda: [downgrade_Node(node, id_) for id_, node in nodes.items()], len(nodes)
+
+
+@benchmark
+def upgrade_edge(msg0, msg1):
+    """Benchmark upgrade edge."""
+    edges = msg0["knowledge_graph"]["edges"]
+    return lambda: [upgrade_Edge(edge) for edge in edges], len(edges)
+
+
+@benchmark
+def downgrade_edge(msg0, msg1):
+    """Benchmark downgrade edge."""
+    edges = msg1["knowledge_graph"]["edges"]
+    return lambda: [downgrade_Edge(edge, id_) for id_, edge in edges.items()], len(edges)
+
+
+@benchmark
+def upgrade_node_generated(msg0, msg1):
+    """Benchmark generated upgrade node."""
+    nodes = msg0["knowledge_graph"]["nodes"]
+    return lambda: [codegen.upgrade_Node(node) for node in nodes], len(nodes)
+
+
+@benchmark
+def downgrade_node_generated(msg0, msg1):
+    """Benchmark generated downgrade node."""
+    nodes = msg1["knowledge_graph"]["nodes"]
+    return lambda: [codegen.downgrade_Node(node, id_) for id_, node in nodes.items()], len(nodes)
+
+
+@benchmark
+def upgrade_edge_generated(msg0, msg1):
+    """Benchmark generated upgrade edge."""
+    edges = msg0["knowledge_graph"]["edges"]
+    return lambda: [codegen.upgrade_Edge(edge) for edge in edges], len(edges)
+
+
+@benchmark
+def downgrade_edge_generated(msg0, msg1):
+    """Benchmark generated downgrade edge."""
+    edges = msg1["knowledge_graph"]["edges"]
+    return lambda: [codegen.downgrade_Edge(edge, id_) for id_, edge in edges.items()], len(edges)
+
+
+@benchmark
+def upgrade_result_generated(msg0, msg1):
+    """Benchmark generated upgrade result."""
+    results = msg0["results"]
+    return lambda: [codegen.upgrade_Result(result) for result in results], len(results)
+
+
+@benchmark
+def downgrade_result_generated(msg0, msg1):
+    """Benchmark generated downgrade result."""
+    results = msg1["results"]
+    return lambda: [codegen.downgrade_Result(result) for result in results], len(results)
+
+
+@benchmark
+def upgrade_message_generated(msg0, msg1):
+    """Benchmark generated upgrade message."""
+    return lambda: upgrade_Message(msg0, generated=True), message_size(msg0)
+
+
+@benchmark
+def downgrade_message_generated(msg0, msg1):
+    """Benchmark generated downgrade message."""
+    return lambda: downgrade_Message(msg1, generated=True), message_size(msg1)
+
+
+@benchmark
+def upgrade_result(msg0, msg1):
+    """Benchmark upgrade result."""
+    results = msg0["results"]
+    return lambda: [upgrade_Result(result) for result in results], len(results)
+
+
+@benchmark
+def downgrade_result(msg0, msg1):
+    """Benchmark downgrade result."""
+    results = msg1["results"]
+    return lambda: [downgrade_Result(result) for result in results], len(results)
+
+
+@benchmark
+def upgrade_node_model(msg0, msg1):
+    """Benchmark upgrade typed node model."""
+    nodes = [models.Node092.from_dict(node) for node in msg0["knowledge_graph"]["nodes"]]
+    return lambda: [models.upgrade_Node(node) for node in nodes], len(nodes)
+
+
+@benchmark
+def downgrade_node_model(msg0, msg1):
+    """Benchmark downgrade typed node model."""
+    nodes = {
+        id_: models.Node100.from_dict(node)
+        for id_, node in msg1["knowledge_graph"]["nodes"].items()
+    }
+    return lambda: [models.downgrade_Node(node, id_) for id_, node in nodes.items()], len(nodes)
+
+
+@benchmark
+def upgrade_edge_model(msg0, msg1):
+    """Benchmark upgrade typed edge model."""
+    edges = [models.Edge092.from_dict(edge) for edge in msg0["knowledge_graph"]["edges"]]
+    return lambda: [models.upgrade_Edge(edge) for edge in edges], len(edges)
+
+
+@benchmark
+def downgrade_edge_model(msg0, msg1):
+    """Benchmark downgrade typed edge model."""
+    edges = {
+        id_: models.Edge100.from_dict(edge)
+        for id_, edge in msg1["knowledge_graph"]["edges"].items()
+    }
+    return lambda: [models.downgrade_Edge(edge, id_) for id_, edge in edges.items()], len(edges)
+
+
+@benchmark
+def upgrade_result_model(msg0, msg1):
+    """Benchmark upgrade typed result model."""
+    results = [models.Result092.from_dict(result) for result in msg0["results"]]
+    return lambda: [models.upgrade_Result(result) for result in results], len(results)
+
+
+@benchmark
+def downgrade_result_model(msg0, msg1):
+    """Benchmark downgrade typed result model."""
+    results = [models.Result100.from_dict(result) for result in msg1["results"]]
+    return lambda: [models.downgrade_Result(result) for result in results], len(results)
+
+
+@benchmark
+def upgrade_results_indexed(msg0, msg1):
+    """Benchmark upgrade results against the query graph."""
+    results = msg0["results"]
+    upgrader = ResultUpgrader(msg0["query_graph"])
+    return lambda: upgrader.convert_all(results), len(results)
+
+
+@benchmark
+def downgrade_results_indexed(msg0, msg1):
+    """Benchmark downgrade results against the query graph."""
+    results = msg1["results"]
+    downgrader = ResultDowngrader(msg1["query_graph"])
+    return lambda: downgrader.convert_all(results), len(results)
+
+
+@benchmark
+def upgrade_biolink_entity(msg0, msg1):
+    """Benchmark upgrade biolink entity."""
+    entities = [
+        node_type
+        for node in msg0["knowledge_graph"]["nodes"]
+        for node_type in node["type"]
+    ]
+    return lambda: [upgrade_BiolinkEntity(entity) for entity in entities], len(entities)
+
+
+@benchmark
+def downgrade_biolink_entity(msg0, msg1):
+    """Benchmark downgrade biolink entity."""
+    entities = [
+        category
+        for node in msg1["knowledge_graph"]["nodes"].values()
+        for category in node["category"]
+    ]
+    return lambda: [downgrade_BiolinkEntity(entity) for entity in entities], len(entities)
+
+
+# Features that trade generality for speed or memory. Their objects are
+# those of the whole message (or knowledge graph), so that throughput is
+# comparable with the plain conversions above.
+
+
+def _session_step(session, message):
+    """Convert message with session, with 1% of its nodes modified since."""
+    nodes = message["knowledge_graph"]["nodes"]
+    session.convert(message)
+    modified = list(nodes.values() if isinstance(nodes, dict) else nodes)[::100]
+
+    def run():
+        session.mark_modified(*modified)
+        return session.convert(message)
+    return run
+
+
+@benchmark
+def upgrade_message_session(msg0, msg1):
+    """Benchmark upgrade session step, with 1% of nodes modified."""
+    return _session_step(UpgradeSession(), msg0), message_size(msg0)
+
+
+@benchmark
+def downgrade_message_session(msg0, msg1):
+    """Benchmark downgrade session step, with 1% of nodes modified."""
+    return _session_step(DowngradeSession(), msg1), message_size(msg1)
+
+
+@benchmark
+def upgrade_message_stream_bytes(msg0, msg1):
+    """Benchmark streaming upgrade message."""
+    data = json.dumps(msg0).encode()
+    return (
+        lambda: upgrade_message_stream(io.BytesIO(data), io.BytesIO()),
+        message_size(msg0),
+    )
+
+
+@benchmark
+def downgrade_message_stream_bytes(msg0, msg1):
+    """Benchmark streaming downgrade message."""
+    data = json.dumps(msg1).encode()
+    return (
+        lambda: downgrade_message_stream(io.BytesIO(data), io.BytesIO()),
+        message_size(msg1),
+    )
+
+
+def _lazy_access(message):
+    """Access the first 10 results and 10 nodes of a lazily converted message."""
+    results = message["results"][:10]
+    nodes = message["knowledge_graph"]["nodes"]
+    keys = islice(nodes, 10) if isinstance(nodes, Mapping) else range(10)
+    return results, [nodes[key] for key in keys]
+
+
+@benchmark
+def upgrade_message_lazy(msg0, msg1):
+    """Benchmark lazy upgrade message, using 10 results and 10 nodes."""
+    return lambda: _lazy_access(lazy_upgrade_Message(msg0)), message_size(msg0)
+
+
+@benchmark
+def downgrade_message_lazy(msg0, msg1):
+    """Benchmark lazy downgrade message, using 10 results and 10 nodes."""
+    return lambda: _lazy_access(lazy_downgrade_Message(msg1)), message_size(msg1)
+
+
+def _tmp_path(name):
+    """Get a path in a temporary directory, removed at exit."""
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, True)
+    return os.path.join(directory, name)
+
+
+@benchmark
+def upgrade_message_store_build(msg0, msg1):
+    """Benchmark building an upgraded knowledge graph store from a stream."""
+    data = json.dumps(msg0).encode()
+    path = _tmp_path("kgraph.store")
+    kgraph = msg0["knowledge_graph"]
+    return (
+        lambda: upgrade_message_store(io.BytesIO(data), path),
+        len(kgraph["nodes"]) + len(kgraph["edges"]),
+    )
+
+
+@benchmark
+def store_lookup(msg0, msg1):
+    """Benchmark looking up every node and edge in a knowledge graph store."""
+    path = _tmp_path("kgraph.store")
+    upgrade_message_store(io.BytesIO(json.dumps(msg0).encode()), path)
+    store = KnowledgeGraphStore(path)
+    atexit.register(store.close)
+    node_ids = [knode["id"] for knode in msg0["knowledge_graph"]["nodes"]]
+    edge_ids = [kedge["id"] for kedge in msg0["knowledge_graph"]["edges"]]
+    return (
+        lambda: (
+            [store.nodes[id_] for id_ in node_ids],
+            [store.edges[id_] for id_ in edge_ids],
+        ),
+        len(node_ids) + len(edge_ids),
+    )
+
+
+@benchmark
+def compact_from_092(msg0, msg1):
+    """Benchmark building a compact knowledge graph from 0.9.2."""
+    kgraph = msg0["knowledge_graph"]
+    return (
+        lambda: CompactKnowledgeGraph.from_092(kgraph),
+        len(kgraph["nodes"]) + len(kgraph["edges"]),
+    )
+
+
+@benchmark
+def compact_from_100(msg0, msg1):
+    """Benchmark building a compact knowledge graph from 1.0.0."""
+    kgraph = msg1["knowledge_graph"]
+    return (
+        lambda: CompactKnowledgeGraph.from_100(kgraph),
+        len(kgraph["nodes"]) + len(kgraph["edges"]),
+    )
+
+
+@benchmark
+def compact_to_100(msg0, msg1):
+    """Benchmark rendering a compact knowledge graph as 1.0.0."""
+    kgraph = msg0["knowledge_graph"]
+    compact = CompactKnowledgeGraph.from_092(kgraph)
+    return compact.to_100, len(kgraph["nodes"]) + len(kgraph["edges"])
+
+
+def measure(run, objects, repeat):
+    """Measure run()."""
+    seconds = float("inf")
+    collections = 0
+    for _ in range(repeat):
+        gc.collect()
+        before = sum(stats["collections"] for stats in gc.get_stats())
+        start = time.perf_counter()
+        run()
+        seconds = min(seconds, time.perf_counter() - start)
+        collections += sum(stats["collections"] for stats in gc.get_stats()) - before
+
+    gc.collect()
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    output = run()
+    _, peak = tracemalloc.get_traced_memory()
+    # only growth, so that blocks freed elsewhere (e.g. caches) don't offset it
+    retained = sum(
+        max(stat.count_diff, 0)
+        for stat in tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+    )
+    tracemalloc.stop()
+    del output
+
+    return {
+        "objects": objects,
+        "seconds": seconds,
+        "objects_per_second": objects / seconds if seconds else None,
+        "peak_bytes": peak,
+        "retained_blocks": retained,
+        "gc_collections": collections / repeat,
+    }
+
+
+def _commit():
+    """Get the current git commit, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _rate(objects_per_second):
+    """Format throughput, which is None if too fast to time."""
+    if objects_per_second is None:
+        return "n/a"
+    return f"{objects_per_second:,.0f}"
+
+
+def compare(report, baseline):
+    """Print throughput of report relative to baseline."""
+    print(f"{'benchmark':<28} {'baseline/s':>14} {'current/s':>14} {'ratio':>7}")
+    for name, result in report["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["objects_per_second"]
+        after = result["objects_per_second"]
+        if not before or not after:
+            # too fast to time
+            print(f"{name:<28} {_rate(before):>14} {_rate(after):>14} {'n/a':>7}")
+            continue
+        print(f"{name:<28} {before:>14,.0f} {after:>14,.0f} {after / before:>7.2f}")
+
+
+def main(argv=None):
+    """Run benchmarks."""
+    global WORKERS
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--edges", type=int, default=10000)
+    parser.add_argument("--results", type=int, default=10000)
+    parser.add_argument("--attributes", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, default=WORKERS,
+        help="worker processes for *_parallel benchmarks (default: available CPUs)",
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS), default=None,
+        help="benchmarks to run (default: all)",
+    )
+    parser.add_argument("--output", help="save results as JSON to this file")
+    parser.add_argument("--compare", help="compare against results saved earlier")
+    args = parser.parse_args(argv)
+    WORKERS = args.workers
+
+    params = {
+        "nodes": args.nodes,
+        "edges": args.edges,
+        "results": args.results,
+        "attributes": args.attributes,
+        "seed": args.seed,
+    }
+    msg0 = message0(**params)
+    msg1 = message1(**params)
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "json_backend": jsonio.BACKEND,
+            "repeat": args.repeat,
+            "workers": args.workers,
+            **params,
+        },
+        "results": dict(),
+    }
+    for name in args.only or BENCHMARKS:
+        run, objects = BENCHMARKS[name](msg0, msg1)
+        result = measure(run, objects, args.repeat)
+        report["results"][name] = result
+        print(
+            f"{name:<28} {_rate(result['objects_per_second']):>14} obj/s"
+            f" {result['peak_bytes'] / 2 ** 20:>9.1f} MiB peak",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(report, stream, indent=2)
+    if args.compare:
+        with open(args.compare, "r") as stream:
+            compare(report, json.load(stream))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Attribute conversion.
+
+0.9.2 Nodes and Edges carry arbitrary extra properties, which become 1.0.0
+Attributes of type "data", and vice versa. All such attributes share the
+same constant keys and type, and nameless attributes get precomputed
+default names.
+
+LazyAttributes holds the (name, value) pairs and only builds Attribute
+dicts when they are accessed, which saves most of their memory; downgrading
+reads the pairs directly. Serializers such as json do not recognize
+LazyAttributes, so materialize() them first, or pass json_default as their
+default, as this package's serializers do.
+"""
+from collections.abc import Sequence
+
+DATA_TYPE = "EDAM:data_0006"  # "data"
+_DEFAULT_NAMES = tuple(f"attribute{idx:02d}" for idx in range(100))
+
+
+def default_name(idx):
+    """Get default name of the idx-th Attribute."""
+    if idx < len(_DEFAULT_NAMES):
+        return _DEFAULT_NAMES[idx]
+    return f"attribute{idx:02d}"
+
+
+class LazyAttributes(Sequence):
+    """Sequence of "data" Attributes, built on access."""
+
+    __slots__ = ("pairs", "_cache")
+
+    def __init__(self, pairs):
+        """Initialize from (name, value) pairs."""
+        self.pairs = pairs
+        self._cache = None
+
+    def __getitem__(self, idx):
+        """Get Attribute(s)."""
+        return self.materialize()[idx]
+
+    def __len__(self):
+        """Get number of Attributes."""
+        return len(self.pairs)
+
+    def __eq__(self, other):
+        """Compare with another sequence of Attributes."""
+        if isinstance(other, LazyAttributes):
+            return self.pairs == other.pairs
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return self.materialize() == list(other)
+
+    def __repr__(self):
+        """Represent."""
+        return f"LazyAttributes({self.pairs!r})"
+
+    def __getstate__(self):
+        """Get state for pickling."""
+        return self.pairs
+
+    def __setstate__(self, state):
+        """Set state from pickling."""
+        self.pairs = state
+        self._cache = None
+
+    def materialize(self):
+        """Build and return the list of Attribute dicts."""
+        if self._cache is None:
+            self._cache = [
+                {"name": name, "type": DATA_TYPE, "value": value}
+                for name, value in self.pairs
+            ]
+        return self._cache
+
+
+def json_default(obj):
+    """Get a JSON-serializable equivalent of obj, for json.dumps(default=...)."""
+    if isinstance(obj, LazyAttributes):
+        return obj.materialize()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def upgrade_attributes(obj, reserved, lazy=False):
+    """Move extra properties of obj into a list of 1.0.0 Attributes.
+
+    Properties named in reserved are left in obj; all others are removed.
+    If lazy, LazyAttributes are returned.
+    """
+    names = [key for key in obj if key not in reserved]
+    if lazy:
+        return LazyAttributes([(name, obj.pop(name)) for name in names])
+    return [
+        {"name": name, "type": DATA_TYPE, "value": obj.pop(name)}
+        for name in names
+    ]
+
+
+def downgrade_attributes(attributes, new):
+    """Add 1.0.0 Attributes to new as 0.9.2 properties."""
+    if isinstance(attributes, LazyAttributes):
+        new.update(attributes.pairs)
+        return new
+    for idx, attribute in enumerate(attributes):
+        name = attribute["name"] if "name" in attribute else default_name(idx)
+        new[name] = attribute["value"]
+    return new
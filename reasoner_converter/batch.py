@@ -0,0 +1,79 @@
+"""Batch conversion of many Queries/Messages.
+
+    for converted in upgrade_many(queries, workers=4):
+        if converted.error is not None:
+            ...
+        else:
+            use(converted.value)
+
+Each item may be a Query or a Message. Results are yielded in input order
+as (value, error) pairs, so that one invalid item (e.g. a QNode that
+downgrade_QNode rejects) is reported as its error rather than aborting the
+batch. Set-up is shared across the batch: worker processes are started
+once, and with intern=True, repeated strings are shared across all items.
+"""
+from collections import namedtuple
+
+from .downgrading import downgrade_Message, downgrade_Query
+from .parallel import executor_for, parallel_map
+from .upgrading import upgrade_Message, upgrade_Query
+from .util import intern_strings
+
+# items per worker task
+CHUNK_SIZE = 100
+
+CONVERTERS = {
+    "upgrade": {"query": upgrade_Query, "message": upgrade_Message},
+    "downgrade": {"query": downgrade_Query, "message": downgrade_Message},
+}
+
+Converted = namedtuple("Converted", ["value", "error"])
+
+
+def _convert(direction, obj, inplace):
+    """Convert a Query or Message, returning (value, error)."""
+    kind = "query" if "message" in obj else "message"
+    try:
+        return CONVERTERS[direction][kind](obj, inplace=inplace), None
+    except Exception as err:
+        return None, err
+
+
+def _convert_many(direction, objs, workers, chunksize, inplace, intern):
+    """Convert Queries/Messages, yielding Converted(value, error)."""
+    table = dict() if intern else None
+    with executor_for(workers) as executor:
+        for value, error in parallel_map(
+                _convert,
+                ((direction, obj, inplace) for obj in objs),
+                executor, chunksize,
+        ):
+            if table is not None and value is not None:
+                intern_strings(value, table)
+            yield Converted(value, error)
+
+
+def upgrade_many(objs, workers=None, chunksize=CHUNK_SIZE, inplace=False, intern=False):
+    """Upgrade Queries/Messages from 0.9.2 to 1.0.0.
+
+    Yields Converted(value, error) for each, in order.
+    If workers (a number of processes or an Executor) is provided, items are
+    converted in parallel, in chunks of chunksize.
+    If inplace, items are modified rather than copied (only when converted
+    serially).
+    If intern, repeated strings are shared across all outputs.
+    """
+    return _convert_many("upgrade", objs, workers, chunksize, inplace, intern)
+
+
+def downgrade_many(objs, workers=None, chunksize=CHUNK_SIZE, inplace=False, intern=False):
+    """Downgrade Queries/Messages from 1.0.0 to 0.9.2.
+
+    Yields Converted(value, error) for each, in order.
+    If workers (a number of processes or an Executor) is provided, items are
+    converted in parallel, in chunks of chunksize.
+    If inplace, items are modified rather than copied (only when converted
+    serially).
+    If intern, repeated strings are shared across all outputs.
+    """
+    return _convert_many("downgrade", objs, workers, chunksize, inplace, intern)
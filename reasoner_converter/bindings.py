@@ -0,0 +1,99 @@
+"""Batch Result conversion against a QueryGraph.
+
+The Results of a Message all bind the same QueryGraph, so ResultUpgrader and
+ResultDowngrader read the query node and edge ids from it once and convert
+any number of Results against them. Along the way, each binding's qg_id is
+checked against the QueryGraph, raising ValueError if it is unknown.
+Bindings with no extra properties, by far the most common kind, are built
+directly rather than by copying and renaming keys.
+
+    upgrader = ResultUpgrader(message["query_graph"])
+    results = upgrader.convert_all(message["results"])
+"""
+from .downgrading import downgrade_EdgeBinding, downgrade_NodeBinding
+from .upgrading import upgrade_EdgeBinding, upgrade_NodeBinding
+
+
+def _unknown(kind, qg_id):
+    """Build error for binding to unknown query graph element."""
+    return ValueError(f"{kind} binding to unknown qg_id {qg_id!r}")
+
+
+class ResultUpgrader:
+    """Upgrade Results from 0.9.2 to 1.0.0 for a 0.9.2 QueryGraph."""
+
+    def __init__(self, qgraph):
+        """Initialize."""
+        self.qnode_ids = frozenset(qnode["id"] for qnode in qgraph["nodes"])
+        self.qedge_ids = frozenset(qedge["id"] for qedge in qgraph["edges"])
+
+    @staticmethod
+    def _bindings(bindings, qg_ids, kind, convert):
+        """Upgrade and group bindings by qg_id."""
+        new = dict()
+        for binding in bindings:
+            qg_id = binding["qg_id"]
+            slot = new.get(qg_id, None)
+            if slot is None:
+                if qg_id not in qg_ids:
+                    raise _unknown(kind, qg_id)
+                slot = new[qg_id] = []
+            kg_id = binding["kg_id"]
+            if len(binding) == 2 and not isinstance(kg_id, list):
+                slot.append({"id": kg_id})
+            else:
+                slot.extend(convert(binding))
+        return new
+
+    def convert(self, result):
+        """Upgrade Result from 0.9.2 to 1.0.0."""
+        result = {**result}
+        result["node_bindings"] = self._bindings(
+            result.pop("node_bindings"), self.qnode_ids, "node", upgrade_NodeBinding,
+        )
+        result["edge_bindings"] = self._bindings(
+            result.pop("edge_bindings"), self.qedge_ids, "edge", upgrade_EdgeBinding,
+        )
+        return result
+
+    def convert_all(self, results):
+        """Upgrade Results from 0.9.2 to 1.0.0."""
+        return [self.convert(result) for result in results]
+
+
+class ResultDowngrader:
+    """Downgrade Results from 1.0.0 to 0.9.2 for a 1.0.0 QueryGraph."""
+
+    def __init__(self, qgraph):
+        """Initialize."""
+        self.qnode_ids = frozenset(qgraph["nodes"])
+        self.qedge_ids = frozenset(qgraph["edges"])
+
+    @staticmethod
+    def _bindings(bindings, qg_ids, kind, convert):
+        """Downgrade and flatten bindings."""
+        new = []
+        for qg_id, slot in bindings.items():
+            if qg_id not in qg_ids:
+                raise _unknown(kind, qg_id)
+            for binding in slot:
+                if len(binding) == 1:
+                    new.append({"qg_id": qg_id, "kg_id": binding["id"]})
+                else:
+                    new.append(convert(binding, qg_id))
+        return new
+
+    def convert(self, result):
+        """Downgrade Result from 1.0.0 to 0.9.2."""
+        result = {**result}
+        result["node_bindings"] = self._bindings(
+            result.pop("node_bindings"), self.qnode_ids, "node", downgrade_NodeBinding,
+        )
+        result["edge_bindings"] = self._bindings(
+            result.pop("edge_bindings"), self.qedge_ids, "edge", downgrade_EdgeBinding,
+        )
+        return result
+
+    def convert_all(self, results):
+        """Downgrade Results from 1.0.0 to 0.9.2."""
+        return [self.convert(result) for result in results]
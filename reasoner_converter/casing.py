@@ -0,0 +1,49 @@
+"""Casing cache management.
+
+The casing functions and Biolink term converters are memoized with bounded,
+thread-safe LRU caches (see `util.memoize`). This module reports their
+hit/miss statistics and allows clearing and pre-warming them.
+"""
+from typing import Dict, Iterable
+
+from .downgrading import downgrade_BiolinkEntity
+from .upgrading import upgrade_BiolinkEntity, upgrade_BiolinkRelation
+from .util import _pascal_case, _snake_case
+
+MEMOIZED = {
+    "snake_case": _snake_case,
+    "pascal_case": _pascal_case,
+    "upgrade_BiolinkEntity": upgrade_BiolinkEntity,
+    "upgrade_BiolinkRelation": upgrade_BiolinkRelation,
+    "downgrade_BiolinkEntity": downgrade_BiolinkEntity,
+}
+
+
+def cache_info() -> Dict[str, Dict[str, int]]:
+    """Get hit/miss statistics for each memoized function."""
+    return {
+        name: fcn.cache_info()._asdict()
+        for name, fcn in MEMOIZED.items()
+    }
+
+
+def cache_clear():
+    """Clear all casing caches."""
+    for fcn in MEMOIZED.values():
+        fcn.cache_clear()
+
+
+def prewarm(
+        entities: Iterable[str] = (),
+        relations: Iterable[str] = (),
+):
+    """Pre-populate the caches.
+
+    entities are 0.9.2 BiolinkEntities (e.g. "chemical_substance")
+    relations are 0.9.2 BiolinkRelations (e.g. "related_to")
+    Both directions of conversion are warmed.
+    """
+    for entity in entities:
+        downgrade_BiolinkEntity(upgrade_BiolinkEntity(entity))
+    for relation in relations:
+        upgrade_BiolinkRelation(relation)
@@ -0,0 +1,264 @@
+"""Command-line bulk conversion.
+
+    reasoner-converter upgrade response.json -o response_1.0.json
+    reasoner-converter downgrade archive/ -o archive_0.9.2/ --workers 8
+    reasoner-converter upgrade responses.jsonl -o upgraded.jsonl
+    cat responses.jsonl | reasoner-converter upgrade - > upgraded.jsonl
+
+Each JSON document or JSON Lines record may be a Query or a Message.
+.json files are converted by streaming, and .jsonl files one record at a
+time, so memory use does not grow with input size. Invalid records and
+files are reported on stderr and skipped, and the exit status is 1 if there
+were any.
+"""
+import argparse
+from collections import deque
+import json
+import os
+import sys
+import time
+
+from .downgrading import downgrade_Message, downgrade_Query
+from .parallel import parallel_map
+from .streaming import (
+    JSONReader,
+    downgrade_message_stream, downgrade_query_stream,
+    upgrade_message_stream, upgrade_query_stream,
+)
+from .upgrading import upgrade_Message, upgrade_Query
+
+EXTENSIONS = (".json", ".jsonl")
+# JSON Lines records per worker task
+CHUNK_SIZE = 100
+
+CONVERTERS = {
+    "upgrade": {"query": upgrade_Query, "message": upgrade_Message},
+    "downgrade": {"query": downgrade_Query, "message": downgrade_Message},
+}
+STREAM_CONVERTERS = {
+    "upgrade": {"query": upgrade_query_stream, "message": upgrade_message_stream},
+    "downgrade": {"query": downgrade_query_stream, "message": downgrade_message_stream},
+}
+MESSAGE_KEYS = ("query_graph", "knowledge_graph", "results")
+
+
+def convert_record(direction, record):
+    """Convert a Query or Message, in place."""
+    kind = "query" if "message" in record else "message"
+    return CONVERTERS[direction][kind](record, inplace=True)
+
+
+def describe(err):
+    """Describe an error in one line."""
+    return f"{type(err).__name__}: {err}"
+
+
+def convert_line(direction, line):
+    """Convert a JSON-encoded Query or Message.
+
+    Returns (converted JSON, None), or (None, error description) if it is
+    invalid.
+    """
+    try:
+        return json.dumps(convert_record(direction, json.loads(line))), None
+    except Exception as err:
+        return None, describe(err)
+
+
+def document_type(path):
+    """Determine whether a JSON file holds a Query or a Message.
+
+    Only reads as far as the first distinguishing top-level property.
+    """
+    with open(path, "rb") as stream:
+        reader = JSONReader(stream)
+        for key in reader.members():
+            if key == "message":
+                return "query"
+            if key in MESSAGE_KEYS:
+                return "message"
+            reader.skip()
+    return "message"
+
+
+def convert_json(direction, src, dst):
+    """Convert a .json file by streaming.
+
+    Returns the number of documents converted.
+    """
+    convert = STREAM_CONVERTERS[direction][document_type(src)]
+    with open(src, "rb") as instream, open(dst, "wb") as outstream:
+        convert(instream, outstream)
+    return 1
+
+
+def convert_jsonl(direction, instream, outstream, workers=None, progress=None, name="-"):
+    """Convert JSON Lines, one record at a time.
+
+    Invalid records are reported on stderr, by name and line number, and
+    skipped. Returns the numbers of records converted and failed.
+    """
+    converted = failed = 0
+    # line numbers of records submitted, in order
+    linenos = deque()
+
+    def lines():
+        """Generate arguments for non-blank lines."""
+        for lineno, line in enumerate(instream, 1):
+            if line.strip():
+                linenos.append(lineno)
+                yield direction, line
+
+    for line, error in parallel_map(convert_line, lines(), workers, CHUNK_SIZE):
+        lineno = linenos.popleft()
+        if error is not None:
+            print(f"{name}:{lineno}: {error}", file=sys.stderr)
+            failed += 1
+            continue
+        outstream.write(line + "\n")
+        converted += 1
+        if progress is not None:
+            progress.update()
+    return converted, failed
+
+
+def convert_file(direction, src, dst):
+    """Convert a .json or .jsonl file.
+
+    Errors are reported on stderr; an invalid .json file is skipped and
+    its partial output removed. Returns the numbers of documents/records
+    converted and failed.
+    """
+    if src.endswith(".jsonl"):
+        with open(src, "r") as instream, open(dst, "w") as outstream:
+            return convert_jsonl(direction, instream, outstream, name=src)
+    try:
+        return convert_json(direction, src, dst), 0
+    except Exception as err:
+        print(f"{src}: {describe(err)}", file=sys.stderr)
+        if os.path.exists(dst):
+            os.remove(dst)
+        return 0, 1
+
+
+def find_files(src, dst):
+    """Find files to convert under directory src, mirrored under dst."""
+    for dirpath, _, filenames in os.walk(src):
+        for filename in sorted(filenames):
+            if not filename.endswith(EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, filename)
+            yield path, os.path.join(dst, os.path.relpath(path, src))
+
+
+class Progress:
+    """Report progress and throughput on stderr."""
+
+    def __init__(self, unit, enabled=True, interval=1.0):
+        """Initialize."""
+        self.unit = unit
+        self.enabled = enabled
+        self.interval = interval
+        self.count = 0
+        self.start = self.last = time.monotonic()
+
+    def _report(self, end):
+        """Print counts and rate."""
+        elapsed = time.monotonic() - self.start
+        rate = self.count / elapsed if elapsed else 0.0
+        print(
+            f"\r{self.count} {self.unit} in {elapsed:.1f}s ({rate:.1f}/s)",
+            end=end, file=sys.stderr, flush=True,
+        )
+
+    def update(self, count=1):
+        """Record converted items."""
+        self.count += count
+        now = time.monotonic()
+        if self.enabled and now - self.last >= self.interval:
+            self.last = now
+            self._report("")
+
+    def close(self):
+        """Print final summary."""
+        if self.enabled:
+            self._report("\n")
+
+
+def _status(failed):
+    """Report the number of errors, and get the exit status."""
+    if not failed:
+        return 0
+    print(f"{failed} error{'s' if failed > 1 else ''}", file=sys.stderr)
+    return 1
+
+
+def main(argv=None):
+    """Run command-line interface."""
+    parser = argparse.ArgumentParser(
+        prog="reasoner-converter",
+        description="Convert TRAPI Queries/Messages between 0.9.2 and 1.0.0.",
+    )
+    parser.add_argument("direction", choices=sorted(CONVERTERS))
+    parser.add_argument(
+        "input",
+        help="a .json or .jsonl file, a directory of them, or - for JSON Lines on stdin",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="output file or directory (default: stdout; required for directories)",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="number of worker processes (default: convert serially)",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.input):
+        if args.output is None:
+            parser.error("--output is required when input is a directory")
+        progress = Progress("files", not args.quiet)
+        tasks = []
+        for src, dst in find_files(args.input, args.output):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            tasks.append((args.direction, src, dst))
+        failed = 0
+        for _, file_failed in parallel_map(convert_file, tasks, args.workers, 1):
+            failed += file_failed
+            progress.update()
+        progress.close()
+        return _status(failed)
+
+    progress = Progress("records", not args.quiet)
+    if args.input == "-" or args.input.endswith(".jsonl"):
+        instream = sys.stdin if args.input == "-" else open(args.input, "r")
+        outstream = sys.stdout if args.output is None else open(args.output, "w")
+        try:
+            _, failed = convert_jsonl(
+                args.direction, instream, outstream, args.workers, progress, args.input,
+            )
+        finally:
+            if instream is not sys.stdin:
+                instream.close()
+            if outstream is not sys.stdout:
+                outstream.close()
+    elif args.output is None:
+        failed = 0
+        try:
+            convert = STREAM_CONVERTERS[args.direction][document_type(args.input)]
+            with open(args.input, "rb") as instream:
+                convert(instream, sys.stdout)
+            progress.update()
+        except Exception as err:
+            print(f"{args.input}: {describe(err)}", file=sys.stderr)
+            failed = 1
+    else:
+        converted, failed = convert_file(args.direction, args.input, args.output)
+        progress.update(converted)
+    progress.close()
+    return _status(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,510 @@
+"""Converters generated from a declarative mapping spec.
+
+SPEC describes each component conversion as data: which properties are
+renamed to what, with which value conversion, whether they are required,
+whether converted values or verbatim properties take precedence, and what
+happens to the remaining properties. compile_converters() generates a
+specialized function for each from that description: a single pass over the
+input's properties that builds the output directly, with no per-call
+branching on the spec and no intermediate dicts. Use source() to view the
+generated code.
+
+SPEC covers every component from Query down to bindings, including the
+kg_id -> id binding renames and the list <-> map reshaping of graphs and
+bindings. The generated converters are equivalent to the hand-written ones
+in upgrading/downgrading (which remain the reference), except that they
+always copy and convert serially, and do not support inplace or
+lazy_attributes. They are used by the Message and Query converters there
+if generated=True. A future version mapping is another spec passed to
+compile_converters().
+
+Spec entries are {"args", "fixed", "properties", "other"}:
+
+- args: extra positional arguments, e.g. the id of a Node
+- fixed: {key: (arg, mode)}, output properties taken from args
+- properties: {key: rule or None}; None drops the property; a rule is
+  {"to": key, "convert": template (e.g. "f({})"), "mode": "set" or
+  "default", "required": bool, "skip_none": bool, "expand": bool}, or
+  {"flatten": "attributes"} to flatten 1.0.0 Attributes into the output;
+  with expand, the converter yields one output per item of the (list or
+  single) value, e.g. for 0.9.2 bindings with lists of kg_ids
+- other: what to do with remaining properties: "attributes" (make 0.9.2
+  properties into 1.0.0 Attributes), "keep" (copy verbatim), or "drop"
+
+mode "default" means that a verbatim property of the same name takes
+precedence.
+"""
+from .attributes import DATA_TYPE, downgrade_attributes
+from .downgrading import downgrade_BiolinkEntity, downgrade_BiolinkPredicate
+from .upgrading import upgrade_BiolinkEntity, upgrade_BiolinkRelation
+from .util import ensure_list
+
+SPEC = {
+    "upgrade_Node": {
+        "properties": {
+            "id": None,
+            "type": {
+                "to": "category",
+                "convert": "[upgrade_BiolinkEntity(item) for item in {}]",
+            },
+            "name": {"to": "name"},
+        },
+        "other": "attributes",
+    },
+    "upgrade_Edge": {
+        "properties": {
+            "id": None,
+            "source_id": {"to": "subject", "required": True},
+            "target_id": {"to": "object", "required": True},
+            "type": {"to": "predicate", "convert": "upgrade_BiolinkRelation({})"},
+            "relation": {"to": "relation"},
+        },
+        "other": "attributes",
+    },
+    "upgrade_QNode": {
+        "properties": {
+            "id": None,
+            "type": {
+                "to": "category",
+                "convert": "upgrade_BiolinkEntity({})",
+                "mode": "default",
+            },
+            "curie": {"to": "id"},
+        },
+        "other": "keep",
+    },
+    "upgrade_QEdge": {
+        "properties": {
+            "id": None,
+            "source_id": {"to": "subject", "mode": "default", "required": True},
+            "target_id": {"to": "object", "mode": "default", "required": True},
+            "type": {
+                "to": "predicate",
+                "convert": "upgrade_BiolinkRelation({})",
+                "mode": "default",
+            },
+        },
+        "other": "keep",
+    },
+    "upgrade_NodeBinding": {
+        "properties": {
+            "qg_id": None,
+            "kg_id": {"to": "id", "mode": "default", "required": True, "expand": True},
+        },
+        "other": "keep",
+    },
+    "upgrade_EdgeBinding": {
+        "properties": {
+            "qg_id": None,
+            "kg_id": {"to": "id", "mode": "default", "required": True, "expand": True},
+        },
+        "other": "keep",
+    },
+    "upgrade_KnowledgeGraph": {
+        "properties": {
+            "nodes": {
+                "to": "nodes",
+                "convert": "{{item['id']: upgrade_Node(item) for item in {}}}",
+                "required": True,
+            },
+            "edges": {
+                "to": "edges",
+                "convert": "{{item['id']: upgrade_Edge(item) for item in {}}}",
+                "required": True,
+            },
+        },
+        "other": "drop",
+    },
+    "upgrade_QueryGraph": {
+        "properties": {
+            "nodes": {
+                "to": "nodes",
+                "convert": "{{item['id']: upgrade_QNode(item) for item in {}}}",
+                "required": True,
+            },
+            "edges": {
+                "to": "edges",
+                "convert": "{{item['id']: upgrade_QEdge(item) for item in {}}}",
+                "required": True,
+            },
+        },
+        "other": "drop",
+    },
+    "upgrade_Result": {
+        "properties": {
+            "node_bindings": {
+                "to": "node_bindings",
+                "convert": "_group({}, upgrade_NodeBinding)",
+                "required": True,
+            },
+            "edge_bindings": {
+                "to": "edge_bindings",
+                "convert": "_group({}, upgrade_EdgeBinding)",
+                "required": True,
+            },
+        },
+        "other": "keep",
+    },
+    "upgrade_Message": {
+        "properties": {
+            "query_graph": {"to": "query_graph", "convert": "upgrade_QueryGraph({})"},
+            "knowledge_graph": {
+                "to": "knowledge_graph",
+                "convert": "upgrade_KnowledgeGraph({})",
+            },
+            "results": {
+                "to": "results",
+                "convert": "[upgrade_Result(item) for item in {}]",
+            },
+        },
+        "other": "drop",
+    },
+    "upgrade_Query": {
+        "properties": {
+            "message": {"to": "message", "convert": "upgrade_Message({})", "required": True},
+        },
+        "other": "keep",
+    },
+    "downgrade_Node": {
+        "args": ("id_",),
+        "fixed": {"id": ("id_", "set")},
+        "properties": {
+            "category": {
+                "to": "type",
+                "convert": "[downgrade_BiolinkEntity(item) for item in ensure_list({})]",
+                "skip_none": True,
+            },
+            "name": {"to": "name", "skip_none": True},
+            "attributes": {"flatten": "attributes"},
+        },
+        "other": "drop",
+    },
+    "downgrade_Edge": {
+        "args": ("id_",),
+        "fixed": {"id": ("id_", "set")},
+        "properties": {
+            "subject": {"to": "source_id", "required": True},
+            "object": {"to": "target_id", "required": True},
+            "predicate": {
+                "to": "type",
+                "convert": "downgrade_BiolinkPredicate({})",
+                "skip_none": True,
+            },
+            "relation": {"to": "relation", "skip_none": True},
+            "attributes": {"flatten": "attributes"},
+        },
+        "other": "drop",
+    },
+    "downgrade_QNode": {
+        "args": ("id_",),
+        "fixed": {"id": ("id_", "set")},
+        "properties": {
+            "category": {
+                "to": "type",
+                "convert": (
+                    "downgrade_BiolinkEntity(_single({}, "
+                    "'QNode with multiple categories is not backwards-compatible'))"
+                ),
+                "mode": "default",
+                "skip_none": True,
+            },
+            "id": {"to": "curie", "mode": "default", "skip_none": True},
+        },
+        "other": "keep",
+    },
+    "downgrade_QEdge": {
+        "args": ("id_",),
+        "fixed": {"id": ("id_", "default")},
+        "properties": {
+            "subject": {"to": "source_id", "mode": "default", "required": True},
+            "object": {"to": "target_id", "mode": "default", "required": True},
+            "predicate": {
+                "to": "type",
+                "convert": (
+                    "downgrade_BiolinkPredicate(_single({}, "
+                    "'QEdge with multiple predicates is not backwards-compatible'))"
+                ),
+                "mode": "default",
+                "skip_none": True,
+            },
+            "relation": {"to": "relation", "skip_none": True},
+        },
+        "other": "keep",
+    },
+    "downgrade_NodeBinding": {
+        "args": ("qg_id",),
+        "fixed": {"qg_id": ("qg_id", "default")},
+        "properties": {
+            "id": {"to": "kg_id", "mode": "default", "required": True},
+        },
+        "other": "keep",
+    },
+    "downgrade_EdgeBinding": {
+        "args": ("qg_id",),
+        "fixed": {"qg_id": ("qg_id", "default")},
+        "properties": {
+            "id": {"to": "kg_id", "mode": "default", "required": True},
+        },
+        "other": "keep",
+    },
+    "downgrade_KnowledgeGraph": {
+        "properties": {
+            "nodes": {
+                "to": "nodes",
+                "convert": "[downgrade_Node(item, key) for key, item in {}.items()]",
+                "required": True,
+            },
+            "edges": {
+                "to": "edges",
+                "convert": "[downgrade_Edge(item, key) for key, item in {}.items()]",
+                "required": True,
+            },
+        },
+        "other": "drop",
+    },
+    "downgrade_QueryGraph": {
+        "properties": {
+            "nodes": {
+                "to": "nodes",
+                "convert": "[downgrade_QNode(item, key) for key, item in {}.items()]",
+                "required": True,
+            },
+            "edges": {
+                "to": "edges",
+                "convert": "[downgrade_QEdge(item, key) for key, item in {}.items()]",
+                "required": True,
+            },
+        },
+        "other": "drop",
+    },
+    "downgrade_Result": {
+        "properties": {
+            "node_bindings": {
+                "to": "node_bindings",
+                "convert": (
+                    "[downgrade_NodeBinding(item, key) "
+                    "for key, items in {}.items() for item in items]"
+                ),
+                "required": True,
+            },
+            "edge_bindings": {
+                "to": "edge_bindings",
+                "convert": (
+                    "[downgrade_EdgeBinding(item, key) "
+                    "for key, items in {}.items() for item in items]"
+                ),
+                "required": True,
+            },
+        },
+        "other": "keep",
+    },
+    "downgrade_Message": {
+        "properties": {
+            "query_graph": {
+                "to": "query_graph",
+                "convert": "downgrade_QueryGraph({})",
+                "skip_none": True,
+            },
+            "knowledge_graph": {
+                "to": "knowledge_graph",
+                "convert": "downgrade_KnowledgeGraph({})",
+                "skip_none": True,
+            },
+            "results": {
+                "to": "results",
+                "convert": "[downgrade_Result(item) for item in {}]",
+                "skip_none": True,
+            },
+        },
+        "other": "drop",
+    },
+    "downgrade_Query": {
+        "properties": {
+            "message": {"to": "message", "convert": "downgrade_Message({})", "required": True},
+        },
+        "other": "keep",
+    },
+}
+
+_MISSING = object()
+
+
+def _single(value, message):
+    """Unwrap a list of one value, raising ValueError for more."""
+    if isinstance(value, list):
+        if len(value) > 1:
+            raise ValueError(message)
+        return value[0]
+    return value
+
+
+def _group(bindings, convert):
+    """Convert 0.9.2 bindings, grouped by qg_id."""
+    groups = dict()
+    for binding in bindings:
+        groups.setdefault(binding["qg_id"], []).extend(convert(binding))
+    return groups
+
+
+NAMESPACE = {
+    "__name__": __name__,
+    "DATA_TYPE": DATA_TYPE,
+    "_MISSING": _MISSING,
+    "_group": _group,
+    "_single": _single,
+    "downgrade_BiolinkEntity": downgrade_BiolinkEntity,
+    "downgrade_BiolinkPredicate": downgrade_BiolinkPredicate,
+    "downgrade_attributes": downgrade_attributes,
+    "ensure_list": ensure_list,
+    "upgrade_BiolinkEntity": upgrade_BiolinkEntity,
+    "upgrade_BiolinkRelation": upgrade_BiolinkRelation,
+}
+
+
+def generate(name, spec):
+    """Generate the source code of converter name from its spec."""
+    args = ", ".join(("obj",) + tuple(spec.get("args", ())))
+    other = spec["other"]
+    # with verbatim properties kept, converted values are assigned after
+    # the loop, so that precedence does not depend on property order
+    defer = other == "keep"
+    fixed = spec.get("fixed", dict())
+
+    lines = [f"def {name}({args}):"]
+    lines.append("    new = {" + ", ".join(
+        f"{key!r}: {arg}"
+        for key, (arg, mode) in fixed.items()
+        if mode == "set"
+    ) + "}")
+    if other == "attributes":
+        lines.append("    attributes = []")
+
+    rules = list(spec["properties"].items())
+    variables = dict()
+    # the property expanded into one output per item, if any
+    expand = None
+    for idx, (key, rule) in enumerate(rules):
+        if rule is None or "to" not in rule:
+            continue
+        if rule.get("expand", False):
+            if expand is not None or not rule.get("required", False):
+                raise ValueError(f"{name}: expand requires one required property")
+            expand = key
+        if defer or expand == key or rule.get("required", False):
+            variables[key] = f"_v{idx}"
+            lines.append(f"    _v{idx} = _MISSING")
+
+    lines.append("    for key, value in obj.items():")
+    keyword = "if"
+    for key, rule in rules:
+        lines.append(f"        {keyword} key == {key!r}:")
+        keyword = "elif"
+        if rule is None:
+            lines.append("            pass")
+            continue
+        indent = "            "
+        if rule.get("skip_none", False):
+            lines.append(f"{indent}if value is None:")
+            lines.append(f"{indent}    continue")
+        if "flatten" in rule:
+            lines.append(f"{indent}downgrade_attributes(value, new)")
+            continue
+        expression = rule.get("convert", "{}").format("value")
+        if key in variables and (defer or key == expand):
+            lines.append(f"{indent}{variables[key]} = {expression}")
+        elif key in variables:
+            lines.append(f"{indent}new[{rule['to']!r}] = {variables[key]} = {expression}")
+        else:
+            lines.append(f"{indent}new[{rule['to']!r}] = {expression}")
+    if other != "drop":
+        lines.append("        else:")
+        if other == "attributes":
+            lines.append(
+                "            attributes.append("
+                "{'name': key, 'type': DATA_TYPE, 'value': value})"
+            )
+        elif other == "keep":
+            lines.append("            new[key] = value")
+        else:
+            raise ValueError(f"Unknown treatment of other properties {other!r}")
+
+    for key, rule in rules:
+        if key not in variables:
+            continue
+        variable = variables[key]
+        if rule.get("required", False):
+            lines.append(f"    if {variable} is _MISSING:")
+            lines.append(f"        raise KeyError({key!r})")
+            indent = "    "
+        elif defer:
+            lines.append(f"    if {variable} is not _MISSING:")
+            indent = "        "
+        if not defer or key == expand:
+            continue
+        if rule.get("mode", "set") == "default":
+            lines.append(f"{indent}new.setdefault({rule['to']!r}, {variable})")
+        else:
+            lines.append(f"{indent}new[{rule['to']!r}] = {variable}")
+    for key, (arg, mode) in fixed.items():
+        if mode == "default":
+            lines.append(f"    new.setdefault({key!r}, {arg})")
+    if other == "attributes":
+        lines.append("    if attributes:")
+        lines.append("        new['attributes'] = attributes")
+    if expand is None:
+        lines.append("    return new")
+    else:
+        rule = spec["properties"][expand]
+        lines.append(f"    for item in ensure_list({variables[expand]}):")
+        if rule.get("mode", "set") == "default":
+            lines.append(f"        yield {{{rule['to']!r}: item, **new}}")
+        else:
+            lines.append(f"        yield {{**new, {rule['to']!r}: item}}")
+    return "\n".join(lines) + "\n"
+
+
+def compile_converters(spec=SPEC):
+    """Generate and compile converters from spec.
+
+    Returns a dict of name to function.
+    """
+    converters = dict()
+    # shared, so that converters can call each other
+    namespace = dict(NAMESPACE)
+    for name, component_spec in spec.items():
+        source = generate(name, component_spec)
+        exec(compile(source, f"<generated {name}>", "exec"), namespace)
+        converters[name] = namespace[name]
+        converters[name].__source__ = source
+        converters[name].__doc__ = f"Generated {name.replace('_', ' ', 1)} converter."
+    return converters
+
+
+def source(fcn):
+    """Get the source code of a generated converter."""
+    return fcn.__source__
+
+
+CONVERTERS = compile_converters()
+upgrade_Node = CONVERTERS["upgrade_Node"]
+upgrade_Edge = CONVERTERS["upgrade_Edge"]
+upgrade_QNode = CONVERTERS["upgrade_QNode"]
+upgrade_QEdge = CONVERTERS["upgrade_QEdge"]
+downgrade_Node = CONVERTERS["downgrade_Node"]
+downgrade_Edge = CONVERTERS["downgrade_Edge"]
+downgrade_QNode = CONVERTERS["downgrade_QNode"]
+downgrade_QEdge = CONVERTERS["downgrade_QEdge"]
+upgrade_NodeBinding = CONVERTERS["upgrade_NodeBinding"]
+upgrade_EdgeBinding = CONVERTERS["upgrade_EdgeBinding"]
+upgrade_KnowledgeGraph = CONVERTERS["upgrade_KnowledgeGraph"]
+upgrade_QueryGraph = CONVERTERS["upgrade_QueryGraph"]
+upgrade_Result = CONVERTERS["upgrade_Result"]
+upgrade_Message = CONVERTERS["upgrade_Message"]
+upgrade_Query = CONVERTERS["upgrade_Query"]
+downgrade_NodeBinding = CONVERTERS["downgrade_NodeBinding"]
+downgrade_EdgeBinding = CONVERTERS["downgrade_EdgeBinding"]
+downgrade_KnowledgeGraph = CONVERTERS["downgrade_KnowledgeGraph"]
+downgrade_QueryGraph = CONVERTERS["downgrade_QueryGraph"]
+downgrade_Result = CONVERTERS["downgrade_Result"]
+downgrade_Message = CONVERTERS["downgrade_Message"]
+downgrade_Query = CONVERTERS["downgrade_Query"]
@@ -0,0 +1,318 @@
+"""Compact knowledge graph representation.
+
+CURIEs, names, and Biolink terms are interned into a single string table and
+referenced by integer index. Nodes and edges are stored column-wise in
+parallel arrays (e.g. edge subject, object, and predicate indices), and
+attributes as tuples rather than dicts, which is much smaller than
+the equivalent JSON-like dicts for large graphs.
+
+A CompactKnowledgeGraph can be built from either TRAPI version and rendered,
+in full or one node/edge at a time, as either version. Null-valued
+properties are omitted.
+"""
+from array import array
+
+from .attributes import DATA_TYPE
+from .downgrading import downgrade_Edge, downgrade_Node
+from .upgrading import upgrade_BiolinkEntity, upgrade_BiolinkRelation
+
+NONE = -1
+
+
+class CompactKnowledgeGraph:
+    """Compact knowledge graph."""
+
+    __slots__ = (
+        "strings", "_string_index",
+        "category_sets", "_category_set_index",
+        "node_ids", "node_names", "node_categories", "node_attributes",
+        "edge_ids", "edge_subjects", "edge_objects", "edge_predicates",
+        "edge_relations", "edge_attributes",
+        "_node_index", "_edge_index",
+    )
+
+    def __init__(self):
+        """Initialize empty knowledge graph."""
+        self.strings = []
+        self._string_index = dict()
+        # a list of string indices (category list) or one (bare category)
+        self.category_sets = []
+        self._category_set_index = dict()
+        self.node_ids = array("q")
+        self.node_names = array("q")
+        self.node_categories = array("q")
+        # node position -> attributes, only for nodes that have any
+        self.node_attributes = dict()
+        self.edge_ids = array("q")
+        self.edge_subjects = array("q")
+        self.edge_objects = array("q")
+        self.edge_predicates = array("q")
+        self.edge_relations = array("q")
+        # edge position -> attributes, only for edges that have any
+        self.edge_attributes = dict()
+        self._node_index = None
+        self._edge_index = None
+
+    def __repr__(self):
+        """Represent."""
+        return (
+            f"<CompactKnowledgeGraph: {len(self.node_ids)} nodes, "
+            f"{len(self.edge_ids)} edges, {len(self.strings)} strings>"
+        )
+
+    def intern(self, string):
+        """Get the index of string, adding it if necessary."""
+        if string is None:
+            return NONE
+        try:
+            return self._string_index[string]
+        except KeyError:
+            idx = self._string_index[string] = len(self.strings)
+            self.strings.append(string)
+            return idx
+
+    def _intern_categories(self, category):
+        """Intern a category or list of categories."""
+        if category is None:
+            return NONE
+        if isinstance(category, list):
+            key = tuple(self.intern(value) for value in category)
+        else:
+            key = self.intern(category)
+        try:
+            return self._category_set_index[key]
+        except KeyError:
+            idx = self._category_set_index[key] = len(self.category_sets)
+            self.category_sets.append(key)
+            return idx
+
+    def _categories(self, idx):
+        """Get category or list of categories at idx."""
+        key = self.category_sets[idx]
+        if isinstance(key, tuple):
+            return [self.strings[value] for value in key]
+        return self.strings[key]
+
+    def _compact_attributes(self, attributes):
+        """Compact 1.0.0 Attributes.
+
+        Attributes with only name, type, and value become tuples; others are
+        kept as-is.
+        """
+        compacted = []
+        for attribute in attributes:
+            if (
+                    attribute.keys() <= {"name", "type", "value"}
+                    and isinstance(attribute.get("name", ""), str)
+                    and isinstance(attribute.get("type", None), str)
+            ):
+                compacted.append((
+                    self.intern(attribute.get("name", None)),
+                    self.intern(attribute["type"]),
+                    attribute.get("value", None),
+                ))
+            else:
+                compacted.append(attribute)
+        return compacted
+
+    def _attributes(self, compacted):
+        """Render 1.0.0 Attributes."""
+        attributes = []
+        for attribute in compacted:
+            if isinstance(attribute, tuple):
+                name, type_, value = attribute
+                rendered = {"type": self.strings[type_], "value": value}
+                if name != NONE:
+                    rendered["name"] = self.strings[name]
+                attributes.append(rendered)
+            else:
+                attributes.append(attribute)
+        return attributes
+
+    def _add_node(self, id_, name, categories, attributes):
+        """Add node with interned properties."""
+        self.node_ids.append(self.intern(id_))
+        self.node_names.append(self.intern(name))
+        self.node_categories.append(categories)
+        if attributes:
+            self.node_attributes[len(self.node_ids) - 1] = attributes
+        self._node_index = None
+
+    def _add_edge(self, id_, subject, object_, predicate, relation, attributes):
+        """Add edge with interned properties."""
+        self.edge_ids.append(self.intern(id_))
+        self.edge_subjects.append(self.intern(subject))
+        self.edge_objects.append(self.intern(object_))
+        self.edge_predicates.append(self.intern(predicate))
+        self.edge_relations.append(self.intern(relation))
+        if attributes:
+            self.edge_attributes[len(self.edge_ids) - 1] = attributes
+        self._edge_index = None
+
+    def add_node_100(self, id_, node):
+        """Add a 1.0.0 Node."""
+        self._add_node(
+            id_,
+            node.get("name", None),
+            self._intern_categories(node.get("category", None)),
+            self._compact_attributes(node.get("attributes", None) or []),
+        )
+
+    def add_edge_100(self, id_, edge):
+        """Add a 1.0.0 Edge."""
+        self._add_edge(
+            id_,
+            edge["subject"],
+            edge["object"],
+            edge.get("predicate", None),
+            edge.get("relation", None),
+            self._compact_attributes(edge.get("attributes", None) or []),
+        )
+
+    def add_node_092(self, node):
+        """Add a 0.9.2 Node."""
+        categories = NONE
+        if "type" in node:
+            categories = self._intern_categories([
+                upgrade_BiolinkEntity(node_type)
+                for node_type in node["type"]
+            ])
+        self._add_node(
+            node["id"],
+            node.get("name", None),
+            categories,
+            [
+                (self.intern(key), self.intern(DATA_TYPE), value)
+                for key, value in node.items()
+                if key not in ("id", "type", "name")
+            ],
+        )
+
+    def add_edge_092(self, edge):
+        """Add a 0.9.2 Edge."""
+        self._add_edge(
+            edge["id"],
+            edge["source_id"],
+            edge["target_id"],
+            upgrade_BiolinkRelation(edge.get("type", None)),
+            edge.get("relation", None),
+            [
+                (self.intern(key), self.intern(DATA_TYPE), value)
+                for key, value in edge.items()
+                if key not in ("id", "source_id", "target_id", "type", "relation")
+            ],
+        )
+
+    @classmethod
+    def from_100(cls, kgraph):
+        """Build from 1.0.0 KnowledgeGraph."""
+        new = cls()
+        for id_, node in kgraph["nodes"].items():
+            new.add_node_100(id_, node)
+        for id_, edge in kgraph["edges"].items():
+            new.add_edge_100(id_, edge)
+        return new
+
+    @classmethod
+    def from_092(cls, kgraph):
+        """Build from 0.9.2 KnowledgeGraph."""
+        new = cls()
+        for node in kgraph["nodes"]:
+            new.add_node_092(node)
+        for edge in kgraph["edges"]:
+            new.add_edge_092(edge)
+        return new
+
+    def _node_100(self, idx):
+        """Render node at position idx as 1.0.0 Node."""
+        node = dict()
+        if self.node_categories[idx] != NONE:
+            node["category"] = self._categories(self.node_categories[idx])
+        if self.node_names[idx] != NONE:
+            node["name"] = self.strings[self.node_names[idx]]
+        if idx in self.node_attributes:
+            node["attributes"] = self._attributes(self.node_attributes[idx])
+        return node
+
+    def _edge_100(self, idx):
+        """Render edge at position idx as 1.0.0 Edge."""
+        edge = {
+            "subject": self.strings[self.edge_subjects[idx]],
+            "object": self.strings[self.edge_objects[idx]],
+        }
+        if self.edge_predicates[idx] != NONE:
+            edge["predicate"] = self.strings[self.edge_predicates[idx]]
+        if self.edge_relations[idx] != NONE:
+            edge["relation"] = self.strings[self.edge_relations[idx]]
+        if idx in self.edge_attributes:
+            edge["attributes"] = self._attributes(self.edge_attributes[idx])
+        return edge
+
+    def _position(self, index, id_):
+        """Find position of id_ using index."""
+        try:
+            return index[self._string_index[id_]]
+        except KeyError:
+            raise KeyError(id_) from None
+
+    def node_position(self, id_):
+        """Get position of node by id."""
+        if self._node_index is None:
+            self._node_index = {sid: idx for idx, sid in enumerate(self.node_ids)}
+        return self._position(self._node_index, id_)
+
+    def edge_position(self, id_):
+        """Get position of edge by id."""
+        if self._edge_index is None:
+            self._edge_index = {sid: idx for idx, sid in enumerate(self.edge_ids)}
+        return self._position(self._edge_index, id_)
+
+    def node_100(self, id_):
+        """Get 1.0.0 Node by id."""
+        return self._node_100(self.node_position(id_))
+
+    def edge_100(self, id_):
+        """Get 1.0.0 Edge by id."""
+        return self._edge_100(self.edge_position(id_))
+
+    def node_092(self, id_):
+        """Get 0.9.2 Node by id."""
+        return downgrade_Node(self.node_100(id_), id_, inplace=True)
+
+    def edge_092(self, id_):
+        """Get 0.9.2 Edge by id."""
+        return downgrade_Edge(self.edge_100(id_), id_, inplace=True)
+
+    def iter_nodes_100(self):
+        """Iterate over (id, 1.0.0 Node) pairs."""
+        for idx, id_ in enumerate(self.node_ids):
+            yield self.strings[id_], self._node_100(idx)
+
+    def iter_edges_100(self):
+        """Iterate over (id, 1.0.0 Edge) pairs."""
+        for idx, id_ in enumerate(self.edge_ids):
+            yield self.strings[id_], self._edge_100(idx)
+
+    def iter_nodes_092(self):
+        """Iterate over 0.9.2 Nodes."""
+        for id_, node in self.iter_nodes_100():
+            yield downgrade_Node(node, id_, inplace=True)
+
+    def iter_edges_092(self):
+        """Iterate over 0.9.2 Edges."""
+        for id_, edge in self.iter_edges_100():
+            yield downgrade_Edge(edge, id_, inplace=True)
+
+    def to_100(self):
+        """Render as 1.0.0 KnowledgeGraph."""
+        return {
+            "nodes": dict(self.iter_nodes_100()),
+            "edges": dict(self.iter_edges_100()),
+        }
+
+    def to_092(self):
+        """Render as 0.9.2 KnowledgeGraph."""
+        return {
+            "nodes": list(self.iter_nodes_092()),
+            "edges": list(self.iter_edges_092()),
+        }
@@ -0,0 +1,64 @@
+"""Result deduplication.
+
+Reasoners often return duplicate results, and because a 0.9.2 binding with
+a list of kg_ids is upgraded to one 1.0.0 binding per id, upgraded results
+may also repeat bindings. dedupe_Result() drops repeated bindings within a
+1.0.0 Result, and dedupe_Results() also drops Results whose sets of
+bindings equal those of an earlier one, regardless of binding order. The
+first occurrence is kept, with its other properties (e.g. score).
+"""
+from .util import fingerprint
+
+
+def _binding_key(binding):
+    """Get a hashable key, equal for equal bindings."""
+    if len(binding) == 1 and "id" in binding:
+        return binding["id"]
+    return fingerprint(binding)
+
+
+def _dedupe(result):
+    """Drop repeated bindings from 1.0.0 Result, in place.
+
+    Returns a hashable key, equal for Results with the same bindings.
+    """
+    key = []
+    for prop in ("node_bindings", "edge_bindings"):
+        groups = result[prop]
+        for qg_id, bindings in groups.items():
+            if len(bindings) == 1:
+                key.append((prop, qg_id, frozenset((_binding_key(bindings[0]),))))
+                continue
+            keys = set()
+            unique = []
+            for binding in bindings:
+                binding_key = _binding_key(binding)
+                if binding_key in keys:
+                    continue
+                keys.add(binding_key)
+                unique.append(binding)
+            if len(unique) < len(bindings):
+                groups[qg_id] = unique
+            key.append((prop, qg_id, frozenset(keys)))
+    return frozenset(key)
+
+
+def dedupe_Result(result):
+    """Drop repeated bindings from 1.0.0 Result, in place, and return it."""
+    _dedupe(result)
+    return result
+
+
+def dedupe_Results(results):
+    """Drop repeated bindings and duplicate 1.0.0 Results.
+
+    Results are yielded in order, without those with the same bindings as
+    an earlier one. Bindings are deduplicated in place.
+    """
+    seen = set()
+    for result in results:
+        key = _dedupe(result)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield result
@@ -1,18 +1,38 @@
 """TRAPI 1.0.0 to 0.9.2."""
-from .util import ensure_list, snake_case
+from .attributes import downgrade_attributes
+from .parallel import (
+    CHUNK_SIZE, effective_workers, executor_for, parallel_map, parallel_sections,
+)
+from .util import ensure_list, intern_strings, memoize, snake_case
+from .vocabulary import DOWNGRADE_ENTITY, DOWNGRADE_PREDICATE
 
+@memoize
 def downgrade_BiolinkEntity(biolink_entity):
     """Downgrade BiolinkEntity from 1.0.0 to 0.9.2."""
+    if biolink_entity in DOWNGRADE_ENTITY:
+        return DOWNGRADE_ENTITY[biolink_entity]
     return snake_case(biolink_entity[8:])
 
 
 def downgrade_BiolinkPredicate(biolink_predicate):
     """Downgrade BiolinkPredicate (1.0.0) to BiolinkRelation (0.9.2)."""
+    if biolink_predicate in DOWNGRADE_PREDICATE:
+        return DOWNGRADE_PREDICATE[biolink_predicate]
     return biolink_predicate[8:]
 
 
-def downgrade_Node(node, id_):
-    """Downgrade Node from 1.0.0 to 0.9.2."""
+def _replace(obj, new):
+    """Replace the contents of obj with those of new."""
+    obj.clear()
+    obj.update(new)
+    return obj
+
+
+def downgrade_Node(node, id_, inplace=False):
+    """Downgrade Node from 1.0.0 to 0.9.2.
+
+    If inplace, node is modified and returned rather than copied.
+    """
     new = {"id": id_}
     if node.get("category", None) is not None:
         new["type"] = [
@@ -22,18 +42,17 @@ def downgrade_Node(node, id_):
     if node.get("name", None) is not None:
         new["name"] = node["name"]
     if node.get("attributes", None) is not None:
-        new = {
-            **new,
-            **{
-                attribute.get("name", f"attribute{idx:02d}"): attribute["value"]
-                for idx, attribute in enumerate(node["attributes"])
-            }
-        }
+        downgrade_attributes(node["attributes"], new)
+    if inplace:
+        return _replace(node, new)
     return new
 
 
-def downgrade_Edge(edge, id_):
-    """Downgrade Edge from 1.0.0 to 0.9.2."""
+def downgrade_Edge(edge, id_, inplace=False):
+    """Downgrade Edge from 1.0.0 to 0.9.2.
+
+    If inplace, edge is modified and returned rather than copied.
+    """
     new = {
         "id": id_,
         "source_id": edge["subject"],
@@ -44,161 +63,269 @@ def downgrade_Edge(edge, id_):
     if edge.get("relation", None) is not None:
         new["relation"] = edge["relation"]
     if edge.get("attributes", None) is not None:
-        new = {
-            **new,
-            **{
-                attribute.get("name", f"attribute{idx:02d}"): attribute["value"]
-                for idx, attribute in enumerate(edge.get("attributes", []))
+        downgrade_attributes(edge["attributes"], new)
+    if inplace:
+        return _replace(edge, new)
+    return new
+
+
+def downgrade_KnowledgeGraph(kgraph, workers=None, chunksize=CHUNK_SIZE, inplace=False):
+    """Downgrade KnowledgeGraph from 1.0.0 to 0.9.2.
+
+    If workers (a number of processes or an Executor) is provided, nodes and
+    edges are converted in parallel, in chunks of chunksize, where that can
+    pay off (see parallel).
+    If inplace, kgraph and its nodes and edges are modified and returned
+    rather than copied (nodes and edges only when converted serially).
+    """
+    workers = effective_workers(workers, len(kgraph["nodes"]) + len(kgraph["edges"]))
+    if workers is not None:
+        with executor_for(workers) as executor:
+            new = {
+                "nodes": list(parallel_map(
+                    downgrade_Node,
+                    ((knode, id_) for id_, knode in kgraph["nodes"].items()),
+                    executor, chunksize,
+                )),
+                "edges": list(parallel_map(
+                    downgrade_Edge,
+                    ((kedge, id_) for id_, kedge in kgraph["edges"].items()),
+                    executor, chunksize,
+                )),
             }
+    else:
+        new = {
+            "nodes": [
+                downgrade_Node(knode, id_, inplace)
+                for id_, knode in kgraph["nodes"].items()
+            ],
+            "edges": [
+                downgrade_Edge(kedge, id_, inplace)
+                for id_, kedge in kgraph["edges"].items()
+            ],
         }
+    if inplace:
+        return _replace(kgraph, new)
     return new
 
 
-def downgrade_KnowledgeGraph(kgraph):
-    """Downgrade KnowledgeGraph from 1.0.0 to 0.9.2."""
-    return {
-        "nodes": [
-            downgrade_Node(knode, id_)
-            for id_, knode in kgraph["nodes"].items()
-        ],
-        "edges": [
-            downgrade_Edge(kedge, id_)
-            for id_, kedge in kgraph["edges"].items()
-        ],
-    }
-
+def downgrade_QNode(qnode, id_, inplace=False):
+    """Downgrade QNode from 1.0.0 to 0.9.2.
 
-def downgrade_QNode(qnode, id_):
-    """Downgrade QNode from 1.0.0 to 0.9.2."""
-    qnode = {**qnode}
-    new = {"id": id_}
-    category = qnode.pop("category", None)
-    if category is not None:
-        if isinstance(category, list):
-            if len(category) > 1:
-                raise ValueError("QNode with multiple categories is not backwards-compatible")
-            new["type"] = downgrade_BiolinkEntity(category[0])
-        else:
-            new["type"] = downgrade_BiolinkEntity(category)
+    If inplace, qnode is modified and returned rather than copied.
+    """
+    category = qnode.get("category", None)
+    if isinstance(category, list):
+        if len(category) > 1:
+            raise ValueError("QNode with multiple categories is not backwards-compatible")
+        category = category[0]
+    if not inplace:
+        qnode = {**qnode}
+    qnode.pop("category", None)
     curie = qnode.pop("id", None)
+    qnode["id"] = id_
+    # remaining properties are kept verbatim, and take precedence
+    if category is not None:
+        qnode.setdefault("type", downgrade_BiolinkEntity(category))
     if curie is not None:
-        new["curie"] = curie
-    new = {
-        **new,
-        **qnode,
-    }
-    return new
+        qnode.setdefault("curie", curie)
+    return qnode
 
 
-def downgrade_QEdge(qedge, id_):
-    """Downgrade QEdge from 1.0.0 to 0.9.2."""
-    qedge = {**qedge}
-    new = {
-        "id": id_,
-        "source_id": qedge.pop("subject"),
-        "target_id": qedge.pop("object"),
-    }
-    predicate = qedge.pop("predicate", None)
-    if predicate is not None:
-        if isinstance(predicate, list):
-            if len(predicate) > 1:
-                raise ValueError("QEdge with multiple predicates is not backwards-compatible")
-            new["type"] = downgrade_BiolinkPredicate(predicate[0])
-        else:
-            new["type"] = downgrade_BiolinkPredicate(predicate)
+def downgrade_QEdge(qedge, id_, inplace=False):
+    """Downgrade QEdge from 1.0.0 to 0.9.2.
+
+    If inplace, qedge is modified and returned rather than copied.
+    """
+    predicate = qedge.get("predicate", None)
+    if isinstance(predicate, list):
+        if len(predicate) > 1:
+            raise ValueError("QEdge with multiple predicates is not backwards-compatible")
+        predicate = predicate[0]
+    if not inplace:
+        qedge = {**qedge}
+    qedge.pop("predicate", None)
+    subject = qedge.pop("subject")
+    object_ = qedge.pop("object")
     relation = qedge.pop("relation", None)
+    # remaining properties are kept verbatim, and take precedence
+    qedge.setdefault("id", id_)
+    qedge.setdefault("source_id", subject)
+    qedge.setdefault("target_id", object_)
+    if predicate is not None:
+        qedge.setdefault("type", downgrade_BiolinkPredicate(predicate))
     if relation is not None:
-        new["relation"] = relation
-    new = {
-        **new,
-        **qedge,
-    }
-    return new
+        qedge["relation"] = relation
+    return qedge
+
 
+def downgrade_QueryGraph(qgraph, inplace=False):
+    """Downgrade QueryGraph from 1.0.0 to 0.9.2.
 
-def downgrade_QueryGraph(qgraph):
-    """Downgrade QueryGraph from 1.0.0 to 0.9.2."""
-    return {
+    If inplace, qgraph and its nodes and edges are modified and returned
+    rather than copied.
+    """
+    new = {
         "nodes": [
-            downgrade_QNode(qnode, id_)
+            downgrade_QNode(qnode, id_, inplace)
             for id_, qnode in qgraph["nodes"].items()
         ],
         "edges": [
-            downgrade_QEdge(qedge, id_)
+            downgrade_QEdge(qedge, id_, inplace)
             for id_, qedge in qgraph["edges"].items()
         ],
     }
+    if inplace:
+        return _replace(qgraph, new)
+    return new
 
 
-def downgrade_NodeBinding(node_binding, qg_id):
-    """Downgrade NodeBinding from 1.0.0 to 0.9.2."""
-    new = {
-        "qg_id": qg_id,
-        "kg_id": node_binding["id"],
-    }
-    for key, value in node_binding.items():
-        if key == "id":
-            continue
-        new[key] = value
-    return new
+def downgrade_NodeBinding(node_binding, qg_id, inplace=False):
+    """Downgrade NodeBinding from 1.0.0 to 0.9.2.
 
+    If inplace, node_binding is modified and returned rather than copied.
+    """
+    if not inplace:
+        node_binding = {**node_binding}
+    kg_id = node_binding.pop("id")
+    # remaining properties are kept verbatim, and take precedence
+    node_binding.setdefault("qg_id", qg_id)
+    node_binding.setdefault("kg_id", kg_id)
+    return node_binding
 
-def downgrade_EdgeBinding(edge_binding, qg_id):
-    """Downgrade EdgeBinding from 1.0.0 to 0.9.2."""
-    new = {
-        "qg_id": qg_id,
-        "kg_id": edge_binding["id"],
-    }
-    for key, value in edge_binding.items():
-        if key == "id":
-            continue
-        new[key] = value
-    return new
 
+def downgrade_EdgeBinding(edge_binding, qg_id, inplace=False):
+    """Downgrade EdgeBinding from 1.0.0 to 0.9.2.
 
-def downgrade_Result(result):
-    """Downgrade Result from 1.0.0 to 0.9.2."""
-    result = {**result}
-    new = {
-        "node_bindings": [],
-        "edge_bindings": [],
-    }
+    If inplace, edge_binding is modified and returned rather than copied.
+    """
+    if not inplace:
+        edge_binding = {**edge_binding}
+    kg_id = edge_binding.pop("id")
+    # remaining properties are kept verbatim, and take precedence
+    edge_binding.setdefault("qg_id", qg_id)
+    edge_binding.setdefault("kg_id", kg_id)
+    return edge_binding
+
+
+def downgrade_Result(result, inplace=False):
+    """Downgrade Result from 1.0.0 to 0.9.2.
+
+    If inplace, result and its bindings are modified and returned rather
+    than copied.
+    """
+    if not inplace:
+        result = {**result}
+    node_bindings = []
     for qg_id, nbs in result.pop("node_bindings").items():
-        new["node_bindings"].extend(
-            downgrade_NodeBinding(nb, qg_id)
+        node_bindings.extend(
+            downgrade_NodeBinding(nb, qg_id, inplace)
             for nb in nbs
         )
+    edge_bindings = []
     for qg_id, ebs in result.pop("edge_bindings").items():
-        new["edge_bindings"].extend(
-            downgrade_EdgeBinding(eb, qg_id)
+        edge_bindings.extend(
+            downgrade_EdgeBinding(eb, qg_id, inplace)
             for eb in ebs
         )
-    new = {
-        **new,
-        **result,
-    }
-    return new
+    result["node_bindings"] = node_bindings
+    result["edge_bindings"] = edge_bindings
+    return result
 
 
-def downgrade_Message(message):
-    """Downgrade Message from 1.0.0 to 0.9.2."""
+def downgrade_Results(results, workers=None, chunksize=CHUNK_SIZE, inplace=False):
+    """Downgrade Results from 1.0.0 to 0.9.2.
+
+    Results are yielded in order, so that the first can be used before the
+    last are converted. If workers (a number of processes or an Executor) is
+    provided, they are converted in parallel, in chunks of chunksize, where
+    that can pay off (see parallel).
+    If inplace, results are modified and yielded rather than copied (only
+    when converted serially).
+    """
+    if hasattr(results, "__len__"):
+        workers = effective_workers(workers, len(results))
+    if workers is None:
+        for result in results:
+            yield downgrade_Result(result, inplace)
+        return
+    yield from parallel_map(
+        downgrade_Result,
+        ((result,) for result in results),
+        workers, chunksize,
+    )
+
+
+def downgrade_Message(
+        message,
+        workers=None,
+        chunksize=CHUNK_SIZE,
+        inplace=False,
+        intern=False,
+        generated=False,
+):
+    """Downgrade Message from 1.0.0 to 0.9.2.
+
+    If workers (a number of processes or an Executor) is provided, the
+    knowledge graph and results are converted in parallel, where that can
+    pay off (see parallel).
+    If inplace, message and its contents are modified and returned rather
+    than copied.
+    If intern, repeated strings in the output (e.g. CURIEs in the knowledge
+    graph and bindings) are replaced by a single shared instance.
+    If generated, components are converted by the converters generated from
+    codegen.SPEC, which do not support workers or inplace.
+    """
+    if generated:
+        if workers is not None or inplace:
+            raise ValueError("Generated converters do not support workers or inplace")
+        # codegen imports this module
+        from .codegen import downgrade_Message as convert
+        new = convert(message)
+        if intern:
+            intern_strings(new, dict())
+        return new
     new = dict()
-    if message.get("query_graph", None) is not None:
-        new["query_graph"] = downgrade_QueryGraph(message["query_graph"])
-    if message.get("knowledge_graph", None) is not None:
-        new["knowledge_graph"] = downgrade_KnowledgeGraph(message["knowledge_graph"])
-    if message.get("results", None) is not None:
-        new["results"] = [
-            downgrade_Result(result)
-            for result in message["results"]
-        ]
+    # start a pool only if a section will use it
+    kgraph_parallel, results_parallel = parallel_sections(workers, message)
+    if not (kgraph_parallel or results_parallel):
+        workers = None
+    with executor_for(workers) as executor:
+        if message.get("query_graph", None) is not None:
+            new["query_graph"] = downgrade_QueryGraph(message["query_graph"], inplace)
+        if message.get("knowledge_graph", None) is not None:
+            new["knowledge_graph"] = downgrade_KnowledgeGraph(
+                message["knowledge_graph"], executor if kgraph_parallel else None,
+                chunksize, inplace,
+            )
+        if message.get("results", None) is not None:
+            new["results"] = list(downgrade_Results(
+                message["results"], executor if results_parallel else None,
+                chunksize, inplace,
+            ))
+    if intern:
+        intern_strings(new, dict())
+    if inplace:
+        return _replace(message, new)
     return new
 
 
-def downgrade_Query(query):
-    """Downgrade Query from 1.0.0 to 0.9.2."""
-    query = {**query}
-    return {
-        "message": downgrade_Message(query.pop("message")),
-        **query,
-    }
+def downgrade_Query(
+        query,
+        workers=None,
+        chunksize=CHUNK_SIZE,
+        inplace=False,
+        intern=False,
+        generated=False,
+):
+    """Downgrade Query from 1.0.0 to 0.9.2.
+
+    If inplace, query and its contents are modified and returned rather
+    than copied.
+    """
+    if not inplace:
+        query = {**query}
+    query["message"] = downgrade_Message(
+        query["message"], workers, chunksize, inplace, intern, generated,
+    )
+    return query
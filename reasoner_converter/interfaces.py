@@ -1,29 +1,173 @@
 """TRAPI interface conversions."""
-from functools import wraps
+import asyncio
+from functools import partial, wraps
+import inspect
+import time
 
 from .downgrading import downgrade_Message, downgrade_Query
 from .upgrading import upgrade_Query, upgrade_Message
+from .util import message_size
 
+# Messages with more knowledge graph nodes/edges and results than this are
+# converted in an executor rather than on the event loop.
+SIZE_THRESHOLD = 10000
 
-def downgrade_reasoner(fcn):
+
+def downgrade_reasoner(fcn=None, *, hook=None):
     """Make a 1.0.0 reasoner look like a 0.9.2 reasoner.
     
     fcn is a 1.0.0 interface
     data is a 0.9.2 paylod
+    If hook is provided, it is called with the timings of each call (see
+    _report).
     """
+    if fcn is None:
+        return partial(downgrade_reasoner, hook=hook)
+
     @wraps(fcn)
     def wrapped(data):
-        return downgrade_Message(fcn(upgrade_Query(data))["message"])
+        if hook is None:
+            return downgrade_Message(fcn(upgrade_Query(data))["message"])
+        start = time.perf_counter()
+        query = upgrade_Query(data)
+        converted = time.perf_counter()
+        message = fcn(query)["message"]
+        responded = time.perf_counter()
+        output = downgrade_Message(message)
+        _report(hook, (start, converted, responded, time.perf_counter()), data, message)
+        return output
     return wrapped
 
 
-def upgrade_reasoner(fcn):
+def upgrade_reasoner(fcn=None, *, hook=None):
     """Make a 0.9.2 reasoner look like a 1.0.0 reasoner.
     
     fcn is a 0.9.2 interface
     data is a 1.0.0 paylod
+    If hook is provided, it is called with the timings of each call (see
+    _report).
     """
+    if fcn is None:
+        return partial(upgrade_reasoner, hook=hook)
+
     @wraps(fcn)
     def wrapped(data):
-        return {"message": upgrade_Message(fcn(downgrade_Query(data)))}
+        if hook is None:
+            return {"message": upgrade_Message(fcn(downgrade_Query(data)))}
+        start = time.perf_counter()
+        query = downgrade_Query(data)
+        converted = time.perf_counter()
+        message = fcn(query)
+        responded = time.perf_counter()
+        output = {"message": upgrade_Message(message)}
+        _report(hook, (start, converted, responded, time.perf_counter()), data, message)
+        return output
+    return wrapped
+
+
+def _report(hook, times, query, message):
+    """Call hook with timings of a wrapped reasoner call.
+
+    times are the perf_counter() values at the start, after converting the
+    input, after calling the reasoner, and after converting the output.
+    hook receives a dict of:
+    input_conversion_seconds, reasoner_seconds, output_conversion_seconds,
+    input_size (of the Query's Message), and output_size (of the reasoner's
+    Message), with sizes as given by message_size.
+    """
+    start, converted, responded, end = times
+    hook({
+        "input_conversion_seconds": converted - start,
+        "reasoner_seconds": responded - converted,
+        "output_conversion_seconds": end - responded,
+        "input_size": message_size(query.get("message", None)),
+        "output_size": message_size(message),
+    })
+
+
+async def _convert(fcn, data, size, threshold, executor):
+    """Apply conversion fcn to data, in executor if size exceeds threshold."""
+    if size <= threshold:
+        return fcn(data)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, fcn, data)
+
+
+async def _call(fcn, data):
+    """Call reasoner fcn, awaiting the response if necessary."""
+    response = fcn(data)
+    if inspect.isawaitable(response):
+        response = await response
+    return response
+
+
+def async_downgrade_reasoner(fcn=None, *, threshold=SIZE_THRESHOLD, executor=None, hook=None):
+    """Make a 1.0.0 async reasoner look like a 0.9.2 async reasoner.
+
+    fcn is a 1.0.0 interface, either a coroutine function or a plain function
+    data is a 0.9.2 paylod
+    Messages larger than threshold (see message_size) are converted in
+    executor, by default the event loop's default executor.
+    If hook is provided, it is called with the timings of each call (see
+    _report).
+    """
+    if fcn is None:
+        return partial(
+            async_downgrade_reasoner,
+            threshold=threshold, executor=executor, hook=hook,
+        )
+
+    @wraps(fcn)
+    async def wrapped(data):
+        start = time.perf_counter()
+        query = await _convert(
+            upgrade_Query, data,
+            message_size(data.get("message", None)), threshold, executor,
+        )
+        converted = time.perf_counter()
+        message = (await _call(fcn, query))["message"]
+        responded = time.perf_counter()
+        output = await _convert(
+            downgrade_Message, message,
+            message_size(message), threshold, executor,
+        )
+        if hook is not None:
+            _report(hook, (start, converted, responded, time.perf_counter()), data, message)
+        return output
+    return wrapped
+
+
+def async_upgrade_reasoner(fcn=None, *, threshold=SIZE_THRESHOLD, executor=None, hook=None):
+    """Make a 0.9.2 async reasoner look like a 1.0.0 async reasoner.
+
+    fcn is a 0.9.2 interface, either a coroutine function or a plain function
+    data is a 1.0.0 paylod
+    Messages larger than threshold (see message_size) are converted in
+    executor, by default the event loop's default executor.
+    If hook is provided, it is called with the timings of each call (see
+    _report).
+    """
+    if fcn is None:
+        return partial(
+            async_upgrade_reasoner,
+            threshold=threshold, executor=executor, hook=hook,
+        )
+
+    @wraps(fcn)
+    async def wrapped(data):
+        start = time.perf_counter()
+        query = await _convert(
+            downgrade_Query, data,
+            message_size(data.get("message", None)), threshold, executor,
+        )
+        converted = time.perf_counter()
+        message = await _call(fcn, query)
+        responded = time.perf_counter()
+        output = {"message": await _convert(
+            upgrade_Message, message,
+            message_size(message), threshold, executor,
+        )}
+        if hook is not None:
+            _report(hook, (start, converted, responded, time.perf_counter()), data, message)
+        return output
     return wrapped
@@ -0,0 +1,87 @@
+"""Convert JSON-encoded TRAPI bytes.
+
+    body_1 = upgrade_query_bytes(body_0)
+
+Uses the fastest available JSON backend: orjson or ujson if installed
+(pip install reasoner-converter[fast]), otherwise the standard library.
+Because the parsed objects are not visible to the caller, they are
+converted in place, without copying, before being serialized.
+"""
+import json
+
+from .attributes import json_default
+from .downgrading import downgrade_Message, downgrade_Query
+from .upgrading import upgrade_Message, upgrade_Query
+
+BACKENDS = ("orjson", "ujson", "json")
+
+
+def _backend(name):
+    """Get (loads, dumps) for backend.
+
+    dumps returns bytes, and serializes LazyAttributes.
+    """
+    if name == "orjson":
+        import orjson
+        return orjson.loads, lambda obj: orjson.dumps(obj, default=json_default)
+    if name == "ujson":
+        import ujson
+        return ujson.loads, lambda obj: ujson.dumps(
+            obj, ensure_ascii=False, default=json_default,
+        ).encode()
+    if name == "json":
+        return json.loads, lambda obj: json.dumps(
+            obj, ensure_ascii=False, default=json_default,
+        ).encode()
+    raise ValueError(f"Unknown JSON backend {name!r}")
+
+
+def use_backend(name=None):
+    """Select JSON backend by name, or the fastest available if None."""
+    global BACKEND, loads, dumps
+    for candidate in BACKENDS if name is None else (name,):
+        try:
+            loads, dumps = _backend(candidate)
+        except ImportError:
+            if name is not None:
+                raise
+            continue
+        BACKEND = candidate
+        return
+
+
+BACKEND = None
+loads = dumps = None
+use_backend()
+
+
+def upgrade_query_bytes(data, **kwargs):
+    """Upgrade JSON-encoded Query from 0.9.2 to 1.0.0.
+
+    Keyword arguments (e.g. workers, intern) are passed to upgrade_Query.
+    """
+    return dumps(upgrade_Query(loads(data), inplace=True, **kwargs))
+
+
+def downgrade_query_bytes(data, **kwargs):
+    """Downgrade JSON-encoded Query from 1.0.0 to 0.9.2.
+
+    Keyword arguments (e.g. workers, intern) are passed to downgrade_Query.
+    """
+    return dumps(downgrade_Query(loads(data), inplace=True, **kwargs))
+
+
+def upgrade_message_bytes(data, **kwargs):
+    """Upgrade JSON-encoded Message from 0.9.2 to 1.0.0.
+
+    Keyword arguments (e.g. workers, intern) are passed to upgrade_Message.
+    """
+    return dumps(upgrade_Message(loads(data), inplace=True, **kwargs))
+
+
+def downgrade_message_bytes(data, **kwargs):
+    """Downgrade JSON-encoded Message from 1.0.0 to 0.9.2.
+
+    Keyword arguments (e.g. workers, intern) are passed to downgrade_Message.
+    """
+    return dumps(downgrade_Message(loads(data), inplace=True, **kwargs))
@@ -0,0 +1,182 @@
+"""Lazy TRAPI conversions.
+
+lazy_upgrade_Message and lazy_downgrade_Message return read-only views that
+behave like the dicts returned by upgrade_Message and downgrade_Message, but
+convert each Node, Edge, and Result only when it is first accessed, and
+cache it. Call materialize() for the fully-converted plain dict (e.g. to
+serialize it).
+"""
+from collections.abc import Mapping, Sequence
+
+from .downgrading import (
+    downgrade_Edge, downgrade_Node, downgrade_QueryGraph, downgrade_Result,
+)
+from .upgrading import (
+    upgrade_Edge, upgrade_Node, upgrade_QueryGraph, upgrade_Result,
+)
+
+_MISSING = object()
+
+
+def _materialize(value):
+    """Convert lazy views within value to plain dicts/lists."""
+    if isinstance(value, (LazyMapping, LazySequence)):
+        return value.materialize()
+    return value
+
+
+class LazyMapping(Mapping):
+    """Mapping that converts each value on first access.
+
+    source maps keys to unconverted values; convert(key, value) converts one.
+    """
+
+    def __init__(self, source, convert):
+        """Initialize."""
+        self._source = source
+        self._convert = convert
+        self._cache = dict()
+
+    def __getitem__(self, key):
+        """Get converted value."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = self._cache[key] = self._convert(key, self._source[key])
+        return value
+
+    def __contains__(self, key):
+        """Check for key without converting its value."""
+        return key in self._source
+
+    def __iter__(self):
+        """Iterate over keys."""
+        return iter(self._source)
+
+    def __len__(self):
+        """Get number of items."""
+        return len(self._source)
+
+    def __repr__(self):
+        """Represent."""
+        return f"<{type(self).__name__}: {len(self._cache)}/{len(self)} converted>"
+
+    def materialize(self):
+        """Convert all values and return a plain dict."""
+        return {
+            key: _materialize(self[key])
+            for key in self._source
+        }
+
+
+class LazySequence(Sequence):
+    """Sequence that converts each element on first access.
+
+    source is a sequence of unconverted elements; convert(element) converts
+    one.
+    """
+
+    def __init__(self, source, convert):
+        """Initialize."""
+        self._source = source
+        self._convert = convert
+        self._cache = [_MISSING] * len(source)
+
+    def __getitem__(self, idx):
+        """Get converted element(s)."""
+        if isinstance(idx, slice):
+            return [self[jdx] for jdx in range(*idx.indices(len(self)))]
+        value = self._cache[idx]
+        if value is _MISSING:
+            value = self._cache[idx] = self._convert(self._source[idx])
+        return value
+
+    def __len__(self):
+        """Get number of elements."""
+        return len(self._source)
+
+    def __eq__(self, other):
+        """Compare element-wise with another sequence."""
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        """Represent."""
+        converted = sum(value is not _MISSING for value in self._cache)
+        return f"<{type(self).__name__}: {converted}/{len(self)} converted>"
+
+    def materialize(self):
+        """Convert all elements and return a plain list."""
+        return [_materialize(value) for value in self]
+
+
+def _downgrade_node_item(item):
+    """Downgrade (id, Node) pair."""
+    return downgrade_Node(item[1], item[0])
+
+
+def _downgrade_edge_item(item):
+    """Downgrade (id, Edge) pair."""
+    return downgrade_Edge(item[1], item[0])
+
+
+def _lazy_upgrade_section(key, value):
+    """Upgrade Message property lazily."""
+    if key == "query_graph":
+        return upgrade_QueryGraph(value)
+    if key == "knowledge_graph":
+        return LazyMapping(
+            {
+                "nodes": {knode["id"]: knode for knode in value["nodes"]},
+                "edges": {kedge["id"]: kedge for kedge in value["edges"]},
+            },
+            lambda key, elements: LazyMapping(
+                elements,
+                lambda _, element: (upgrade_Node if key == "nodes" else upgrade_Edge)(element),
+            ),
+        )
+    return LazySequence(value, upgrade_Result)
+
+
+def _lazy_downgrade_section(key, value):
+    """Downgrade Message property lazily."""
+    if key == "query_graph":
+        return downgrade_QueryGraph(value)
+    if key == "knowledge_graph":
+        return LazyMapping(
+            {
+                "nodes": list(value["nodes"].items()),
+                "edges": list(value["edges"].items()),
+            },
+            lambda key, items: LazySequence(
+                items,
+                _downgrade_node_item if key == "nodes" else _downgrade_edge_item,
+            ),
+        )
+    return LazySequence(value, downgrade_Result)
+
+
+def lazy_upgrade_Message(message):
+    """Upgrade Message from 0.9.2 to 1.0.0, lazily."""
+    return LazyMapping(
+        {
+            key: message[key]
+            for key in ("query_graph", "knowledge_graph", "results")
+            if key in message
+        },
+        _lazy_upgrade_section,
+    )
+
+
+def lazy_downgrade_Message(message):
+    """Downgrade Message from 1.0.0 to 0.9.2, lazily."""
+    return LazyMapping(
+        {
+            key: message[key]
+            for key in ("query_graph", "knowledge_graph", "results")
+            if message.get(key, None) is not None
+        },
+        _lazy_downgrade_section,
+    )
@@ -0,0 +1,671 @@
+"""Typed TRAPI component models.
+
+Node, Edge, QNode, QEdge, NodeBinding, EdgeBinding, and Result, for 0.9.2
+(e.g. Node092) and 1.0.0 (e.g. Node100), as classes with __slots__ rather
+than dicts. Properties not defined by the model are kept in extra. Build
+models with from_dict(), convert them with the upgrade_*/downgrade_*
+functions here, which read and write attributes directly rather than
+looking up keys, and render them with to_dict() only when done:
+
+    node = upgrade_Node(Node092.from_dict(node_092)).to_dict()
+
+Conversions follow those of upgrading/downgrading, except that
+null-valued properties are omitted from to_dict(). Models are converted
+into new models; the originals are not modified, but may share values
+(e.g. extra properties and attributes) with them.
+"""
+from .attributes import LazyAttributes, downgrade_attributes
+from .downgrading import downgrade_BiolinkEntity, downgrade_BiolinkPredicate
+from .upgrading import upgrade_BiolinkEntity, upgrade_BiolinkRelation
+from .util import ensure_list
+
+
+class Model:
+    """Base TRAPI component model."""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        """Compare with another model of the same type."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in self.__slots__
+        )
+
+    def __repr__(self):
+        """Represent."""
+        return "{}({})".format(type(self).__name__, ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__
+        ))
+
+
+def _set(new, key, value):
+    """Set new[key] to value, unless it is None."""
+    if value is not None:
+        new[key] = value
+
+
+# 0.9.2
+
+
+class Node092(Model):
+    """0.9.2 Node."""
+
+    __slots__ = ("id", "type", "name", "extra")
+
+    def __init__(self, id, type=None, name=None, extra=None):
+        """Initialize."""
+        self.id = id
+        self.type = type
+        self.name = name
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, node):
+        """Build from dict."""
+        extra = {**node}
+        return cls(extra.pop("id"), extra.pop("type", None), extra.pop("name", None), extra)
+
+    def to_dict(self):
+        """Render as dict."""
+        new = {"id": self.id}
+        _set(new, "type", self.type)
+        _set(new, "name", self.name)
+        new.update(self.extra)
+        return new
+
+
+class Edge092(Model):
+    """0.9.2 Edge."""
+
+    __slots__ = ("id", "source_id", "target_id", "type", "relation", "extra")
+
+    def __init__(self, id, source_id, target_id, type=None, relation=None, extra=None):
+        """Initialize."""
+        self.id = id
+        self.source_id = source_id
+        self.target_id = target_id
+        self.type = type
+        self.relation = relation
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, edge):
+        """Build from dict."""
+        extra = {**edge}
+        return cls(
+            extra.pop("id"), extra.pop("source_id"), extra.pop("target_id"),
+            extra.pop("type", None), extra.pop("relation", None), extra,
+        )
+
+    def to_dict(self):
+        """Render as dict."""
+        new = {
+            "id": self.id,
+            "source_id": self.source_id,
+            "target_id": self.target_id,
+        }
+        _set(new, "type", self.type)
+        _set(new, "relation", self.relation)
+        new.update(self.extra)
+        return new
+
+
+class QNode092(Model):
+    """0.9.2 QNode."""
+
+    __slots__ = ("id", "type", "curie", "extra")
+
+    def __init__(self, id, type=None, curie=None, extra=None):
+        """Initialize."""
+        self.id = id
+        self.type = type
+        self.curie = curie
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, qnode):
+        """Build from dict."""
+        extra = {**qnode}
+        return cls(extra.pop("id"), extra.pop("type", None), extra.pop("curie", None), extra)
+
+    def to_dict(self):
+        """Render as dict."""
+        new = {"id": self.id}
+        _set(new, "type", self.type)
+        _set(new, "curie", self.curie)
+        new.update(self.extra)
+        return new
+
+
+class QEdge092(Model):
+    """0.9.2 QEdge."""
+
+    __slots__ = ("id", "source_id", "target_id", "type", "relation", "extra")
+
+    def __init__(self, id, source_id, target_id, type=None, relation=None, extra=None):
+        """Initialize."""
+        self.id = id
+        self.source_id = source_id
+        self.target_id = target_id
+        self.type = type
+        self.relation = relation
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, qedge):
+        """Build from dict."""
+        extra = {**qedge}
+        return cls(
+            extra.pop("id"), extra.pop("source_id"), extra.pop("target_id"),
+            extra.pop("type", None), extra.pop("relation", None), extra,
+        )
+
+    def to_dict(self):
+        """Render as dict."""
+        new = {
+            "id": self.id,
+            "source_id": self.source_id,
+            "target_id": self.target_id,
+        }
+        _set(new, "type", self.type)
+        _set(new, "relation", self.relation)
+        new.update(self.extra)
+        return new
+
+
+class NodeBinding092(Model):
+    """0.9.2 NodeBinding."""
+
+    __slots__ = ("qg_id", "kg_id", "extra")
+
+    def __init__(self, qg_id, kg_id, extra=None):
+        """Initialize."""
+        self.qg_id = qg_id
+        self.kg_id = kg_id
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, node_binding):
+        """Build from dict."""
+        extra = {**node_binding}
+        return cls(extra.pop("qg_id"), extra.pop("kg_id"), extra)
+
+    def to_dict(self):
+        """Render as dict."""
+        return {"qg_id": self.qg_id, "kg_id": self.kg_id, **self.extra}
+
+
+class EdgeBinding092(Model):
+    """0.9.2 EdgeBinding."""
+
+    __slots__ = ("qg_id", "kg_id", "extra")
+
+    def __init__(self, qg_id, kg_id, extra=None):
+        """Initialize."""
+        self.qg_id = qg_id
+        self.kg_id = kg_id
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, edge_binding):
+        """Build from dict."""
+        extra = {**edge_binding}
+        return cls(extra.pop("qg_id"), extra.pop("kg_id"), extra)
+
+    def to_dict(self):
+        """Render as dict."""
+        return {"qg_id": self.qg_id, "kg_id": self.kg_id, **self.extra}
+
+
+class Result092(Model):
+    """0.9.2 Result.
+
+    node_bindings and edge_bindings are lists of NodeBinding092/EdgeBinding092.
+    """
+
+    __slots__ = ("node_bindings", "edge_bindings", "extra")
+
+    def __init__(self, node_bindings, edge_bindings, extra=None):
+        """Initialize."""
+        self.node_bindings = node_bindings
+        self.edge_bindings = edge_bindings
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, result):
+        """Build from dict."""
+        extra = {**result}
+        return cls(
+            [NodeBinding092.from_dict(nb) for nb in extra.pop("node_bindings")],
+            [EdgeBinding092.from_dict(eb) for eb in extra.pop("edge_bindings")],
+            extra,
+        )
+
+    def to_dict(self):
+        """Render as dict."""
+        return {
+            **self.extra,
+            "node_bindings": [nb.to_dict() for nb in self.node_bindings],
+            "edge_bindings": [eb.to_dict() for eb in self.edge_bindings],
+        }
+
+
+# 1.0.0
+
+
+class Node100(Model):
+    """1.0.0 Node."""
+
+    __slots__ = ("category", "name", "attributes", "extra")
+
+    def __init__(self, category=None, name=None, attributes=None, extra=None):
+        """Initialize."""
+        self.category = category
+        self.name = name
+        self.attributes = attributes
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, node):
+        """Build from dict."""
+        extra = {**node}
+        return cls(
+            extra.pop("category", None), extra.pop("name", None),
+            extra.pop("attributes", None), extra,
+        )
+
+    def to_dict(self):
+        """Render as dict."""
+        new = dict()
+        _set(new, "category", self.category)
+        _set(new, "name", self.name)
+        _set(new, "attributes", _materialize(self.attributes))
+        new.update(self.extra)
+        return new
+
+
+class Edge100(Model):
+    """1.0.0 Edge."""
+
+    __slots__ = ("subject", "object", "predicate", "relation", "attributes", "extra")
+
+    def __init__(self, subject, object, predicate=None, relation=None, attributes=None, extra=None):
+        """Initialize."""
+        self.subject = subject
+        self.object = object
+        self.predicate = predicate
+        self.relation = relation
+        self.attributes = attributes
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, edge):
+        """Build from dict."""
+        extra = {**edge}
+        return cls(
+            extra.pop("subject"), extra.pop("object"), extra.pop("predicate", None),
+            extra.pop("relation", None), extra.pop("attributes", None), extra,
+        )
+
+    def to_dict(self):
+        """Render as dict."""
+        new = {"subject": self.subject, "object": self.object}
+        _set(new, "predicate", self.predicate)
+        _set(new, "relation", self.relation)
+        _set(new, "attributes", _materialize(self.attributes))
+        new.update(self.extra)
+        return new
+
+
+class QNode100(Model):
+    """1.0.0 QNode."""
+
+    __slots__ = ("id", "category", "extra")
+
+    def __init__(self, id=None, category=None, extra=None):
+        """Initialize."""
+        self.id = id
+        self.category = category
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, qnode):
+        """Build from dict."""
+        extra = {**qnode}
+        return cls(extra.pop("id", None), extra.pop("category", None), extra)
+
+    def to_dict(self):
+        """Render as dict."""
+        new = dict()
+        _set(new, "id", self.id)
+        _set(new, "category", self.category)
+        new.update(self.extra)
+        return new
+
+
+class QEdge100(Model):
+    """1.0.0 QEdge."""
+
+    __slots__ = ("subject", "object", "predicate", "relation", "extra")
+
+    def __init__(self, subject, object, predicate=None, relation=None, extra=None):
+        """Initialize."""
+        self.subject = subject
+        self.object = object
+        self.predicate = predicate
+        self.relation = relation
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, qedge):
+        """Build from dict."""
+        extra = {**qedge}
+        return cls(
+            extra.pop("subject"), extra.pop("object"), extra.pop("predicate", None),
+            extra.pop("relation", None), extra,
+        )
+
+    def to_dict(self):
+        """Render as dict."""
+        new = {"subject": self.subject, "object": self.object}
+        _set(new, "predicate", self.predicate)
+        _set(new, "relation", self.relation)
+        new.update(self.extra)
+        return new
+
+
+class NodeBinding100(Model):
+    """1.0.0 NodeBinding."""
+
+    __slots__ = ("id", "extra")
+
+    def __init__(self, id, extra=None):
+        """Initialize."""
+        self.id = id
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, node_binding):
+        """Build from dict."""
+        extra = {**node_binding}
+        return cls(extra.pop("id"), extra)
+
+    def to_dict(self):
+        """Render as dict."""
+        return {"id": self.id, **self.extra}
+
+
+class EdgeBinding100(Model):
+    """1.0.0 EdgeBinding."""
+
+    __slots__ = ("id", "extra")
+
+    def __init__(self, id, extra=None):
+        """Initialize."""
+        self.id = id
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, edge_binding):
+        """Build from dict."""
+        extra = {**edge_binding}
+        return cls(extra.pop("id"), extra)
+
+    def to_dict(self):
+        """Render as dict."""
+        return {"id": self.id, **self.extra}
+
+
+class Result100(Model):
+    """1.0.0 Result.
+
+    node_bindings and edge_bindings map qg_ids to lists of
+    NodeBinding100/EdgeBinding100.
+    """
+
+    __slots__ = ("node_bindings", "edge_bindings", "extra")
+
+    def __init__(self, node_bindings, edge_bindings, extra=None):
+        """Initialize."""
+        self.node_bindings = node_bindings
+        self.edge_bindings = edge_bindings
+        self.extra = extra if extra is not None else dict()
+
+    @classmethod
+    def from_dict(cls, result):
+        """Build from dict."""
+        extra = {**result}
+        return cls(
+            {
+                qg_id: [NodeBinding100.from_dict(nb) for nb in nbs]
+                for qg_id, nbs in extra.pop("node_bindings").items()
+            },
+            {
+                qg_id: [EdgeBinding100.from_dict(eb) for eb in ebs]
+                for qg_id, ebs in extra.pop("edge_bindings").items()
+            },
+            extra,
+        )
+
+    def to_dict(self):
+        """Render as dict."""
+        return {
+            **self.extra,
+            "node_bindings": {
+                qg_id: [nb.to_dict() for nb in nbs]
+                for qg_id, nbs in self.node_bindings.items()
+            },
+            "edge_bindings": {
+                qg_id: [eb.to_dict() for eb in ebs]
+                for qg_id, ebs in self.edge_bindings.items()
+            },
+        }
+
+
+def _materialize(attributes):
+    """Get Attribute dicts from attributes, which may be LazyAttributes."""
+    if isinstance(attributes, LazyAttributes):
+        return attributes.materialize()
+    return attributes
+
+
+def _attributes(extra):
+    """Make 0.9.2 extra properties into 1.0.0 Attributes, or None."""
+    if not extra:
+        return None
+    return LazyAttributes(list(extra.items()))
+
+
+# 0.9.2 -> 1.0.0
+
+
+def upgrade_Node(node):
+    """Upgrade Node092 to Node100."""
+    return Node100(
+        None if node.type is None else [upgrade_BiolinkEntity(value) for value in node.type],
+        node.name,
+        _attributes(node.extra),
+    )
+
+
+def upgrade_Edge(edge):
+    """Upgrade Edge092 to Edge100."""
+    return Edge100(
+        edge.source_id,
+        edge.target_id,
+        upgrade_BiolinkRelation(edge.type),
+        edge.relation,
+        _attributes(edge.extra),
+    )
+
+
+def upgrade_QNode(qnode):
+    """Upgrade QNode092 to QNode100."""
+    extra = {**qnode.extra}
+    # remaining properties are kept verbatim, and take precedence
+    category = extra.pop("category", None)
+    if category is None and qnode.type is not None:
+        category = upgrade_BiolinkEntity(qnode.type)
+    return QNode100(qnode.curie, category, extra)
+
+
+def upgrade_QEdge(qedge):
+    """Upgrade QEdge092 to QEdge100."""
+    extra = {**qedge.extra}
+    # remaining properties are kept verbatim, and take precedence
+    predicate = extra.pop("predicate", None)
+    if predicate is None:
+        predicate = upgrade_BiolinkRelation(qedge.type)
+    return QEdge100(
+        extra.pop("subject", qedge.source_id),
+        extra.pop("object", qedge.target_id),
+        predicate,
+        qedge.relation,
+        extra,
+    )
+
+
+def upgrade_NodeBinding(node_binding):
+    """Upgrade NodeBinding092, yielding a NodeBinding100 per kg_id."""
+    for kg_id in ensure_list(node_binding.kg_id):
+        yield NodeBinding100(kg_id, {**node_binding.extra})
+
+
+def upgrade_EdgeBinding(edge_binding):
+    """Upgrade EdgeBinding092, yielding an EdgeBinding100 per kg_id."""
+    for kg_id in ensure_list(edge_binding.kg_id):
+        yield EdgeBinding100(kg_id, {**edge_binding.extra})
+
+
+def _group_bindings(bindings, model):
+    """Upgrade 0.9.2 bindings into lists of model, by qg_id."""
+    grouped = dict()
+    for binding in bindings:
+        try:
+            group = grouped[binding.qg_id]
+        except KeyError:
+            group = grouped[binding.qg_id] = []
+        if isinstance(binding.kg_id, list):
+            group.extend(model(kg_id, {**binding.extra}) for kg_id in binding.kg_id)
+        else:
+            group.append(model(binding.kg_id, {**binding.extra}))
+    return grouped
+
+
+def upgrade_Result(result):
+    """Upgrade Result092 to Result100."""
+    return Result100(
+        _group_bindings(result.node_bindings, NodeBinding100),
+        _group_bindings(result.edge_bindings, EdgeBinding100),
+        {**result.extra},
+    )
+
+
+# 1.0.0 -> 0.9.2
+
+
+def downgrade_Node(node, id_):
+    """Downgrade Node100 to Node092."""
+    return Node092(
+        id_,
+        None if node.category is None else [
+            downgrade_BiolinkEntity(value)
+            for value in ensure_list(node.category)
+        ],
+        node.name,
+        dict() if node.attributes is None else downgrade_attributes(node.attributes, dict()),
+    )
+
+
+def downgrade_Edge(edge, id_):
+    """Downgrade Edge100 to Edge092."""
+    return Edge092(
+        id_,
+        edge.subject,
+        edge.object,
+        None if edge.predicate is None else downgrade_BiolinkPredicate(edge.predicate),
+        edge.relation,
+        dict() if edge.attributes is None else downgrade_attributes(edge.attributes, dict()),
+    )
+
+
+def downgrade_QNode(qnode, id_):
+    """Downgrade QNode100 to QNode092."""
+    category = qnode.category
+    if isinstance(category, list):
+        if len(category) > 1:
+            raise ValueError("QNode with multiple categories is not backwards-compatible")
+        category = category[0]
+    extra = {**qnode.extra}
+    # remaining properties are kept verbatim, and take precedence
+    type_ = extra.pop("type", None)
+    if type_ is None and category is not None:
+        type_ = downgrade_BiolinkEntity(category)
+    curie = extra.pop("curie", None)
+    if curie is None:
+        curie = qnode.id
+    return QNode092(id_, type_, curie, extra)
+
+
+def downgrade_QEdge(qedge, id_):
+    """Downgrade QEdge100 to QEdge092."""
+    predicate = qedge.predicate
+    if isinstance(predicate, list):
+        if len(predicate) > 1:
+            raise ValueError("QEdge with multiple predicates is not backwards-compatible")
+        predicate = predicate[0]
+    extra = {**qedge.extra}
+    # remaining properties are kept verbatim, and take precedence
+    type_ = extra.pop("type", None)
+    if type_ is None and predicate is not None:
+        type_ = downgrade_BiolinkPredicate(predicate)
+    return QEdge092(
+        extra.pop("id", id_),
+        extra.pop("source_id", qedge.subject),
+        extra.pop("target_id", qedge.object),
+        type_,
+        qedge.relation,
+        extra,
+    )
+
+
+def downgrade_NodeBinding(node_binding, qg_id):
+    """Downgrade NodeBinding100 to NodeBinding092."""
+    extra = {**node_binding.extra}
+    # remaining properties are kept verbatim, and take precedence
+    return NodeBinding092(
+        extra.pop("qg_id", qg_id),
+        extra.pop("kg_id", node_binding.id),
+        extra,
+    )
+
+
+def downgrade_EdgeBinding(edge_binding, qg_id):
+    """Downgrade EdgeBinding100 to EdgeBinding092."""
+    extra = {**edge_binding.extra}
+    # remaining properties are kept verbatim, and take precedence
+    return EdgeBinding092(
+        extra.pop("qg_id", qg_id),
+        extra.pop("kg_id", edge_binding.id),
+        extra,
+    )
+
+
+def downgrade_Result(result):
+    """Downgrade Result100 to Result092."""
+    return Result092(
+        [
+            downgrade_NodeBinding(nb, qg_id)
+            for qg_id, nbs in result.node_bindings.items()
+            for nb in nbs
+        ],
+        [
+            downgrade_EdgeBinding(eb, qg_id)
+            for qg_id, ebs in result.edge_bindings.items()
+            for eb in ebs
+        ],
+        {**result.extra},
+    )
@@ -0,0 +1,266 @@
+"""Opt-in converter instrumentation.
+
+    with Profile() as profile:
+        upgrade_Query(query)
+    print(profile.prometheus())
+
+While a Profile is active, every upgrade_*/downgrade_* converter and the
+casing functions record their number of calls, cumulative (inclusive) time,
+and number of objects converted (e.g. knowledge graph nodes/edges and
+results). While any Profile is active, wrappers replace the references to
+those functions in this package's modules, so calls within the package and
+through its module attributes (e.g. upgrading.upgrade_Query) are measured;
+references held elsewhere, e.g. names imported into other modules, are
+not. The wrappers are removed when the last Profile exits, so there is no
+cost otherwise.
+
+The active Profile is per context, i.e. per thread or asyncio task, so
+concurrent conversions in other threads are not recorded, and each can use
+its own Profile; only one can be active at a time in a context. Worker
+processes are not measured.
+
+Each measurement can also be passed to callback(name, seconds, objects),
+and coarse-grained converters can be reported as OpenTelemetry spans by
+passing a tracer (e.g. opentelemetry.trace.get_tracer(__name__)).
+"""
+from functools import wraps
+import inspect
+import sys
+import threading
+import time
+
+from . import attributes, downgrading, upgrading, util
+from .util import message_size
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python 3.6
+    class ContextVar:
+        """Per-thread stand-in for contextvars.ContextVar."""
+
+        def __init__(self, name, default=None):
+            """Initialize."""
+            self.name = name
+            self._default = default
+            self._local = threading.local()
+
+        def get(self):
+            """Get value."""
+            return getattr(self._local, "value", self._default)
+
+        def set(self, value):
+            """Set value, returning a token to reset it."""
+            token = self.get()
+            self._local.value = value
+            return token
+
+        def reset(self, token):
+            """Reset value."""
+            self._local.value = token
+
+# converters reported as OpenTelemetry spans, if a tracer is provided
+SPAN_FUNCTIONS = frozenset((
+    "upgrade_Query", "upgrade_Message", "upgrade_QueryGraph",
+    "upgrade_KnowledgeGraph", "upgrade_Results",
+    "downgrade_Query", "downgrade_Message", "downgrade_QueryGraph",
+    "downgrade_KnowledgeGraph", "downgrade_Results",
+))
+# object counts for converters of containers, by component name
+_SIZES = {
+    "Query": lambda query: message_size(query["message"]),
+    "Message": message_size,
+    "KnowledgeGraph": lambda graph: len(graph["nodes"]) + len(graph["edges"]),
+    "QueryGraph": lambda graph: len(graph["nodes"]) + len(graph["edges"]),
+}
+
+_ACTIVE = ContextVar("reasoner_converter_profile", default=None)
+_INSTALL_LOCK = threading.Lock()
+# number of active Profiles, in any context
+_ACTIVE_COUNT = 0
+# id(original) -> (original, wrapper)
+_WRAPPERS = dict()
+
+
+def _targets():
+    """Find functions to instrument, by name."""
+    targets = {
+        "snake_case": util.snake_case,
+        "pascal_case": util.pascal_case,
+    }
+    for module in (upgrading, downgrading, attributes):
+        for name, value in vars(module).items():
+            if (
+                    name.startswith(("upgrade_", "downgrade_"))
+                    and callable(value)
+                    and not isinstance(value, type)
+            ):
+                targets[name] = value
+    return targets
+
+
+def _measure_iterator(profile, name, iterator):
+    """Yield from iterator, recording to profile."""
+    seconds = 0.0
+    objects = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                seconds += time.perf_counter() - start
+            objects += 1
+            yield value
+    finally:
+        profile.record(name, seconds, objects)
+
+
+def _instrument(name, fcn):
+    """Wrap fcn to record measurements to the active Profile, if any."""
+    if inspect.isgeneratorfunction(fcn):
+        @wraps(fcn)
+        def wrapper(*args, **kwargs):
+            profile = _ACTIVE.get()
+            if profile is None:
+                return fcn(*args, **kwargs)
+            return _measure_iterator(profile, name, fcn(*args, **kwargs))
+        return wrapper
+
+    size = _SIZES.get(name.split("_", 1)[-1], None)
+    # the argument to size, if passed by keyword
+    param = next(iter(inspect.signature(fcn).parameters), None)
+    span = name in SPAN_FUNCTIONS
+
+    @wraps(fcn)
+    def wrapper(*args, **kwargs):
+        profile = _ACTIVE.get()
+        if profile is None:
+            return fcn(*args, **kwargs)
+        if size is None:
+            objects = 1
+        elif args:
+            objects = size(args[0])
+        elif param in kwargs:
+            objects = size(kwargs[param])
+        else:
+            objects = 0
+        if span and profile.tracer is not None:
+            with profile.tracer.start_as_current_span(name) as current:
+                current.set_attribute("reasoner_converter.objects", objects)
+                start = time.perf_counter()
+                try:
+                    return fcn(*args, **kwargs)
+                finally:
+                    profile.record(name, time.perf_counter() - start, objects)
+        start = time.perf_counter()
+        try:
+            return fcn(*args, **kwargs)
+        finally:
+            profile.record(name, time.perf_counter() - start, objects)
+    return wrapper
+
+
+def _namespaces():
+    """Get the namespaces of this package's modules."""
+    package = __name__.rpartition(".")[0]
+    return [
+        vars(module)
+        for name, module in list(sys.modules.items())
+        if name.startswith(package + ".") and module is not None
+    ]
+
+
+def _install():
+    """Replace references to instrumented functions with wrappers."""
+    if not _WRAPPERS:
+        _WRAPPERS.update(
+            (id(fcn), (fcn, _instrument(name, fcn)))
+            for name, fcn in _targets().items()
+        )
+    for namespace in _namespaces():
+        for attr, value in list(namespace.items()):
+            entry = _WRAPPERS.get(id(value), None)
+            if entry is not None and entry[0] is value:
+                namespace[attr] = entry[1]
+
+
+def _uninstall():
+    """Restore references to instrumented functions."""
+    originals = {
+        id(wrapper): original
+        for original, wrapper in _WRAPPERS.values()
+    }
+    for namespace in _namespaces():
+        for attr, value in list(namespace.items()):
+            original = originals.get(id(value), None)
+            if original is not None and _WRAPPERS[id(original)][1] is value:
+                namespace[attr] = original
+
+
+class Profile:
+    """Converter call counts, time, and object counts."""
+
+    def __init__(self, callback=None, tracer=None):
+        """Initialize."""
+        self.callback = callback
+        self.tracer = tracer
+        # name -> {"calls", "seconds", "objects"}
+        self.stats = dict()
+        self._lock = threading.Lock()
+        self._token = None
+
+    def record(self, name, seconds, objects=1):
+        """Record a measurement, e.g. of a reasoner call."""
+        with self._lock:
+            try:
+                stats = self.stats[name]
+            except KeyError:
+                stats = self.stats[name] = {"calls": 0, "seconds": 0.0, "objects": 0}
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["objects"] += objects
+        if self.callback is not None:
+            self.callback(name, seconds, objects)
+
+    def reset(self):
+        """Discard measurements."""
+        with self._lock:
+            self.stats.clear()
+
+    def __enter__(self):
+        """Activate, in the current context."""
+        global _ACTIVE_COUNT
+        if _ACTIVE.get() is not None:
+            raise RuntimeError("Another Profile is already active")
+        with _INSTALL_LOCK:
+            if not _ACTIVE_COUNT:
+                _install()
+            _ACTIVE_COUNT += 1
+        self._token = _ACTIVE.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        """Deactivate."""
+        global _ACTIVE_COUNT
+        _ACTIVE.reset(self._token)
+        self._token = None
+        with _INSTALL_LOCK:
+            _ACTIVE_COUNT -= 1
+            if not _ACTIVE_COUNT:
+                _uninstall()
+
+    def prometheus(self, prefix="reasoner_converter"):
+        """Export measurements in the Prometheus text format."""
+        lines = []
+        for metric, key, help_ in (
+                ("calls_total", "calls", "Converter calls."),
+                ("seconds_total", "seconds", "Cumulative converter time, in seconds."),
+                ("objects_total", "objects", "Objects converted."),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, stats in sorted(self.stats.items()):
+                lines.append(f'{prefix}_{metric}{{function="{name}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
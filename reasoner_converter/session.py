@@ -0,0 +1,166 @@
+"""Incremental conversion of a Message across workflow steps.
+
+A session remembers its previous conversion, so when an updated Message is
+converted again only the nodes, edges, and results that were added or
+changed are re-converted; unchanged ones are reused from the previous
+output:
+
+    session = UpgradeSession()
+    message1 = session.convert(message0)  # converts everything
+    message0["knowledge_graph"]["edges"].append(new_edge)
+    message1 = session.convert(message0)  # converts only new_edge
+
+Nodes and edges are matched by knowledge graph id and results by identity,
+and are reused only if they are the same objects as before, so checking for
+changes costs a dict lookup per object. Objects modified in place must be
+passed to mark_modified() before the next conversion:
+
+    message0["knowledge_graph"]["nodes"][0]["name"] = "..."
+    session.mark_modified(message0["knowledge_graph"]["nodes"][0])
+
+Messages that are copied or re-parsed between steps therefore get no
+reuse. Reused objects are shared between successive outputs; treat them as
+read-only.
+"""
+from abc import ABC, abstractmethod
+
+from .downgrading import (
+    downgrade_Edge, downgrade_Node, downgrade_QueryGraph, downgrade_Result,
+)
+from .upgrading import (
+    upgrade_Edge, upgrade_Node, upgrade_QueryGraph, upgrade_Result,
+)
+
+
+class _Session(ABC):
+    """Conversion session."""
+
+    def __init__(self):
+        """Initialize."""
+        # id -> (original, converted)
+        self._nodes = dict()
+        self._edges = dict()
+        # id(original) -> (original, converted)
+        self._results = dict()
+        # ids of originals modified in place
+        self._modified = set()
+        # counts for the most recent conversion
+        self.converted = 0
+        self.reused = 0
+
+    def mark_modified(self, *objs):
+        """Mark nodes, edges, or results as modified in place.
+
+        They are re-converted by the next conversion.
+        """
+        self._modified.update(id(obj) for obj in objs)
+
+    def _lookup(self, cache, new_cache, key, obj, convert, *args):
+        """Get converted obj, from cache if unchanged."""
+        entry = cache.get(key, None)
+        if entry is None or entry[0] is not obj or id(obj) in self._modified:
+            entry = (obj, convert(obj, *args))
+            self.converted += 1
+        else:
+            self.reused += 1
+        new_cache[key] = entry
+        return entry[1]
+
+    def _convert_results(self, results, convert):
+        """Convert results and update cache."""
+        new_cache = dict()
+        new = [
+            self._lookup(self._results, new_cache, id(result), result, convert)
+            for result in results
+        ]
+        self._results = new_cache
+        return new
+
+    def _start(self):
+        """Start a conversion."""
+        self.converted = self.reused = 0
+
+    def _finish(self):
+        """Finish a conversion."""
+        self._modified.clear()
+
+    def reset(self):
+        """Forget previous conversions."""
+        self.__init__()
+
+    @abstractmethod
+    def convert(self, message):
+        """Convert Message."""
+
+    def convert_query(self, query):
+        """Convert Query."""
+        return {
+            **query,
+            "message": self.convert(query["message"]),
+        }
+
+
+class UpgradeSession(_Session):
+    """Incrementally upgrade Messages from 0.9.2 to 1.0.0."""
+
+    def _convert_kgraph(self, kgraph):
+        """Upgrade KnowledgeGraph and update cache."""
+        nodes, edges = dict(), dict()
+        new = {
+            "nodes": {
+                knode["id"]: self._lookup(self._nodes, nodes, knode["id"], knode, upgrade_Node)
+                for knode in kgraph["nodes"]
+            },
+            "edges": {
+                kedge["id"]: self._lookup(self._edges, edges, kedge["id"], kedge, upgrade_Edge)
+                for kedge in kgraph["edges"]
+            },
+        }
+        self._nodes, self._edges = nodes, edges
+        return new
+
+    def convert(self, message):
+        """Upgrade Message from 0.9.2 to 1.0.0."""
+        self._start()
+        new = dict()
+        if "query_graph" in message:
+            new["query_graph"] = upgrade_QueryGraph(message["query_graph"])
+        if "knowledge_graph" in message:
+            new["knowledge_graph"] = self._convert_kgraph(message["knowledge_graph"])
+        if "results" in message:
+            new["results"] = self._convert_results(message["results"], upgrade_Result)
+        self._finish()
+        return new
+
+
+class DowngradeSession(_Session):
+    """Incrementally downgrade Messages from 1.0.0 to 0.9.2."""
+
+    def _convert_kgraph(self, kgraph):
+        """Downgrade KnowledgeGraph and update cache."""
+        nodes, edges = dict(), dict()
+        new = {
+            "nodes": [
+                self._lookup(self._nodes, nodes, id_, knode, downgrade_Node, id_)
+                for id_, knode in kgraph["nodes"].items()
+            ],
+            "edges": [
+                self._lookup(self._edges, edges, id_, kedge, downgrade_Edge, id_)
+                for id_, kedge in kgraph["edges"].items()
+            ],
+        }
+        self._nodes, self._edges = nodes, edges
+        return new
+
+    def convert(self, message):
+        """Downgrade Message from 1.0.0 to 0.9.2."""
+        self._start()
+        new = dict()
+        if message.get("query_graph", None) is not None:
+            new["query_graph"] = downgrade_QueryGraph(message["query_graph"])
+        if message.get("knowledge_graph", None) is not None:
+            new["knowledge_graph"] = self._convert_kgraph(message["knowledge_graph"])
+        if message.get("results", None) is not None:
+            new["results"] = self._convert_results(message["results"], downgrade_Result)
+        self._finish()
+        return new
@@ -0,0 +1,339 @@
+"""Memory-mapped store of a converted knowledge graph.
+
+For knowledge graphs too big to hold in memory, convert them once into a
+file and look nodes and edges up by id, decoding only the records that are
+used:
+
+    with open("response_0.9.2.json", "rb") as stream:
+        upgrade_message_store(stream, "kgraph.store")
+    with KnowledgeGraphStore("kgraph.store") as store:
+        node = store.nodes["MONDO:0005737"]
+
+The file holds one record per node/edge: its id and JSON-encoded converted
+form. Per-table indexes of 64-bit id hashes, sorted, with the corresponding
+record offsets are memory-mapped too, so opening a store reads nothing but
+its trailer and lookups cost a binary search.
+"""
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+import hashlib
+import mmap
+import os
+import struct
+
+from . import jsonio
+from .downgrading import downgrade_Edge, downgrade_Node
+from .streaming import JSONReader
+from .upgrading import upgrade_Edge, upgrade_Node
+
+MAGIC = b"RCKGS001"
+# id length, record length
+RECORD = struct.Struct("<II")
+# node table offset, node count, edge table offset, edge count, version,
+# magic (written last, so that its presence marks a complete file)
+TRAILER = struct.Struct("<QQQQ8s8s")
+
+
+def _hash(id_):
+    """Get a stable 64-bit hash of id."""
+    return int.from_bytes(
+        hashlib.blake2b(id_.encode(), digest_size=8).digest(), "little",
+    )
+
+
+class KnowledgeGraphStoreWriter:
+    """Write a KnowledgeGraphStore file."""
+
+    def __init__(self, path, version):
+        """Initialize."""
+        self.version = version
+        self.path = path
+        self._stream = open(path, "wb")
+        self._stream.write(MAGIC)
+        self._offset = len(MAGIC)
+        # table -> (id hashes, record offsets), in insertion order
+        self._tables = {
+            "nodes": (array("Q"), array("Q")),
+            "edges": (array("Q"), array("Q")),
+        }
+
+    def _add(self, table, id_, obj):
+        """Add record."""
+        id_bytes = id_.encode()
+        data = jsonio.dumps(obj)
+        hashes, offsets = self._tables[table]
+        hashes.append(_hash(id_))
+        offsets.append(self._offset)
+        self._stream.write(RECORD.pack(len(id_bytes), len(data)))
+        self._stream.write(id_bytes)
+        self._stream.write(data)
+        self._offset += RECORD.size + len(id_bytes) + len(data)
+
+    def add_node(self, id_, node):
+        """Add converted node."""
+        self._add("nodes", id_, node)
+
+    def add_edge(self, id_, edge):
+        """Add converted edge."""
+        self._add("edges", id_, edge)
+
+    def _write_table(self, table):
+        """Write table: insertion-order offsets, sorted hashes and their offsets."""
+        hashes, offsets = self._tables[table]
+        order = sorted(range(len(hashes)), key=hashes.__getitem__)
+        start = self._offset
+        for values in (
+                offsets,
+                array("Q", (hashes[idx] for idx in order)),
+                array("Q", (offsets[idx] for idx in order)),
+        ):
+            data = values.tobytes()
+            self._stream.write(data)
+            self._offset += len(data)
+        return start, len(hashes)
+
+    def close(self):
+        """Write indexes and close file."""
+        # align tables for memoryview casts
+        padding = -self._offset % 8
+        self._stream.write(b"\0" * padding)
+        self._offset += padding
+        nodes = self._write_table("nodes")
+        edges = self._write_table("edges")
+        self._stream.write(TRAILER.pack(*nodes, *edges, self.version.encode(), MAGIC))
+        self._stream.close()
+
+    def abort(self):
+        """Close and remove the incomplete file."""
+        self._stream.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit context, finishing the file, or removing it on error."""
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class StoreTable(Mapping):
+    """Mapping of id to node or edge, read from a KnowledgeGraphStore."""
+
+    def __init__(self, buffer, offset, count):
+        """Initialize."""
+        self._buffer = buffer
+        self._count = count
+        base = memoryview(buffer)
+        table = base[offset:offset + 24 * count]
+        view = table.cast("Q")
+        self._offsets = view[:count]
+        self._hashes = view[count:2 * count]
+        self._sorted_offsets = view[2 * count:]
+        # all must be released before the buffer can be closed
+        self._views = (
+            base, table, view, self._offsets, self._hashes, self._sorted_offsets,
+        )
+
+    def _id(self, offset):
+        """Read id of record at offset."""
+        id_length, _ = RECORD.unpack_from(self._buffer, offset)
+        start = offset + RECORD.size
+        return self._buffer[start:start + id_length].decode()
+
+    def _value(self, offset):
+        """Read object of record at offset."""
+        id_length, length = RECORD.unpack_from(self._buffer, offset)
+        start = offset + RECORD.size + id_length
+        return jsonio.loads(self._buffer[start:start + length])
+
+    def _find(self, id_):
+        """Find offset of record for id, or None."""
+        if not isinstance(id_, str):
+            return None
+        hash_ = _hash(id_)
+        idx = bisect_left(self._hashes, hash_)
+        # check each record with this hash, in case of collisions
+        while idx < self._count and self._hashes[idx] == hash_:
+            offset = self._sorted_offsets[idx]
+            if self._id(offset) == id_:
+                return offset
+            idx += 1
+        return None
+
+    def __getitem__(self, id_):
+        """Get node or edge by id."""
+        offset = self._find(id_)
+        if offset is None:
+            raise KeyError(id_)
+        return self._value(offset)
+
+    def __contains__(self, id_):
+        """Check for id without decoding its node or edge."""
+        return self._find(id_) is not None
+
+    def __iter__(self):
+        """Iterate over ids, in insertion order."""
+        for offset in self._offsets:
+            yield self._id(offset)
+
+    def __len__(self):
+        """Get number of nodes or edges."""
+        return self._count
+
+    def iter_items(self):
+        """Iterate over (id, node/edge) pairs, in insertion order."""
+        for offset in self._offsets:
+            yield self._id(offset), self._value(offset)
+
+    def _release(self):
+        """Release views of the buffer."""
+        for view in reversed(self._views):
+            view.release()
+
+
+class KnowledgeGraphStore:
+    """Read-only, memory-mapped converted KnowledgeGraph.
+
+    nodes and edges map ids to 1.0.0 or 0.9.2 (see version) nodes and edges.
+    """
+
+    def __init__(self, path):
+        """Open store."""
+        self._file = open(path, "rb")
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # e.g. an empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a knowledge graph store")
+        if (
+                len(self._buffer) < len(MAGIC) + TRAILER.size
+                or self._buffer[:len(MAGIC)] != MAGIC
+        ):
+            self.close()
+            raise ValueError(f"{path} is not a knowledge graph store")
+        (
+            node_offset, node_count, edge_offset, edge_count, version, magic,
+        ) = TRAILER.unpack_from(self._buffer, len(self._buffer) - TRAILER.size)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is incomplete")
+        self.version = version.rstrip(b"\0").decode()
+        self.nodes = StoreTable(self._buffer, node_offset, node_count)
+        self.edges = StoreTable(self._buffer, edge_offset, edge_count)
+
+    def __repr__(self):
+        """Represent."""
+        return (
+            f"<KnowledgeGraphStore {self.version}: "
+            f"{len(self.nodes)} nodes, {len(self.edges)} edges>"
+        )
+
+    def to_dict(self):
+        """Load the whole KnowledgeGraph."""
+        if self.version == "0.9.2":
+            return {
+                "nodes": [node for _, node in self.nodes.iter_items()],
+                "edges": [edge for _, edge in self.edges.iter_items()],
+            }
+        return {
+            "nodes": dict(self.nodes.iter_items()),
+            "edges": dict(self.edges.iter_items()),
+        }
+
+    def close(self):
+        """Close store."""
+        for table in (getattr(self, "nodes", None), getattr(self, "edges", None)):
+            if table is not None:
+                table._release()
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        """Enter context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Exit context."""
+        self.close()
+
+
+def upgrade_KnowledgeGraph_store(kgraph, path):
+    """Upgrade KnowledgeGraph from 0.9.2 to 1.0.0, into a store at path."""
+    with KnowledgeGraphStoreWriter(path, "1.0.0") as writer:
+        for knode in kgraph["nodes"]:
+            writer.add_node(knode["id"], upgrade_Node(knode))
+        for kedge in kgraph["edges"]:
+            writer.add_edge(kedge["id"], upgrade_Edge(kedge))
+
+
+def downgrade_KnowledgeGraph_store(kgraph, path):
+    """Downgrade KnowledgeGraph from 1.0.0 to 0.9.2, into a store at path."""
+    with KnowledgeGraphStoreWriter(path, "0.9.2") as writer:
+        for id_, knode in kgraph["nodes"].items():
+            writer.add_node(id_, downgrade_Node(knode, id_))
+        for id_, kedge in kgraph["edges"].items():
+            writer.add_edge(id_, downgrade_Edge(kedge, id_))
+
+
+def _find_kgraph(reader):
+    """Advance reader to the knowledge graph of a Query or Message.
+
+    Returns whether one was found.
+    """
+    for key in reader.members():
+        if key == "knowledge_graph" and reader.peek() != "n":
+            return True
+        if key == "message" and reader.peek() != "n":
+            return _find_kgraph(reader)
+        reader.skip()
+    return False
+
+
+def upgrade_message_store(instream, path):
+    """Upgrade the KnowledgeGraph of a streamed 0.9.2 Query or Message into a store.
+
+    Nodes and edges are read and converted one at a time.
+    """
+    reader = JSONReader(instream)
+    with KnowledgeGraphStoreWriter(path, "1.0.0") as writer:
+        if not _find_kgraph(reader):
+            return
+        for key in reader.members():
+            if key not in ("nodes", "edges"):
+                reader.skip()
+                continue
+            convert, add = (
+                (upgrade_Node, writer.add_node) if key == "nodes"
+                else (upgrade_Edge, writer.add_edge)
+            )
+            for _ in reader.elements():
+                element = reader.value()
+                id_ = element["id"]
+                add(id_, convert(element, inplace=True))
+
+
+def downgrade_message_store(instream, path):
+    """Downgrade the KnowledgeGraph of a streamed 1.0.0 Query or Message into a store.
+
+    Nodes and edges are read and converted one at a time.
+    """
+    reader = JSONReader(instream)
+    with KnowledgeGraphStoreWriter(path, "0.9.2") as writer:
+        if not _find_kgraph(reader):
+            return
+        for key in reader.members():
+            if key not in ("nodes", "edges"):
+                reader.skip()
+                continue
+            convert, add = (
+                (downgrade_Node, writer.add_node) if key == "nodes"
+                else (downgrade_Edge, writer.add_edge)
+            )
+            for id_ in reader.members():
+                add(id_, convert(reader.value(), id_, inplace=True))
@@ -0,0 +1,336 @@
+"""Streaming TRAPI conversions.
+
+These convert a JSON-encoded Message or Query read incrementally from a file
+or byte stream, writing the converted document to an output stream one
+query-graph, knowledge-graph node/edge, or result at a time. Peak memory is
+bounded by the largest single element rather than by the whole document,
+and elements larger than max_value_size characters are rejected.
+Decoded elements are owned here, so they are converted in place.
+"""
+import codecs
+import io
+import json
+
+from .attributes import json_default
+from .downgrading import (
+    downgrade_Edge, downgrade_Node, downgrade_QueryGraph, downgrade_Result,
+)
+from .upgrading import (
+    upgrade_Edge, upgrade_Node, upgrade_QueryGraph, upgrade_Result,
+)
+
+CHUNK_SIZE = 1 << 16
+# largest single element, in characters
+MAX_VALUE_SIZE = 1 << 28
+WHITESPACE = " \t\n\r"
+# errors this close to the end of the buffer may be due to a partial token
+# (e.g. "fals") rather than invalid JSON
+_PARTIAL_TOKEN = 8
+
+_decoder = json.JSONDecoder()
+
+
+class JSONReader:
+    """Incremental JSON reader over a text or binary stream."""
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE, max_value_size=MAX_VALUE_SIZE):
+        """Initialize."""
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._decoder = None
+        if not isinstance(stream, io.TextIOBase):
+            self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=None):
+        """Read more data into the buffer.
+
+        Returns False if the stream is exhausted.
+        """
+        if self._eof:
+            return False
+        chunk = self._stream.read(size or self._chunk_size)
+        # a partial multi-byte character decodes to "" before the end
+        self._eof = not chunk
+        if self._decoder is not None:
+            chunk = self._decoder.decode(chunk, final=self._eof)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it.
+
+        Returns "" at the end of the stream.
+        """
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Expected {char!r} but found {found or 'end of stream'!r}"
+            )
+        self._pos += 1
+
+    def _fill_value(self, size):
+        """Read more of a value into the buffer, up to max_value_size.
+
+        Returns False if the stream is exhausted.
+        """
+        if len(self._buffer) - self._pos >= self._max_value_size:
+            raise ValueError(
+                f"JSON value exceeds {self._max_value_size} characters"
+            )
+        return self._fill(min(size, self._max_value_size))
+
+    def value(self):
+        """Decode and return the next complete JSON value."""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as err:
+                truncated = (
+                    err.msg.startswith("Unterminated string")
+                    or len(self._buffer) - err.pos <= _PARTIAL_TOKEN
+                )
+                if not truncated or not self._fill_value(size):
+                    raise
+                size *= 2
+                continue
+            # a value at the very end of the buffer (e.g. a number) may
+            # continue in the next chunk
+            if end < len(self._buffer) or self._eof:
+                self._pos = end
+                return value
+            if not self._fill_value(size):
+                self._pos = end
+                return value
+            size *= 2
+
+    def members(self):
+        """Iterate over the keys of the next JSON object.
+
+        The caller must consume each member value (with value(), skip(), or
+        another iterator) before advancing.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key but found {key!r}")
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or '}}' but found {char!r}")
+
+    def elements(self):
+        """Iterate over the next JSON array.
+
+        Yields once per element; the caller must consume each element before
+        advancing.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' but found {char!r}")
+
+    def skip(self):
+        """Consume the next JSON value without materializing containers."""
+        char = self.peek()
+        if char == "{":
+            for _ in self.members():
+                self.skip()
+        elif char == "[":
+            for _ in self.elements():
+                self.skip()
+        else:
+            self.value()
+
+
+class JSONWriter:
+    """Minimal JSON writer over a text or binary stream."""
+
+    def __init__(self, stream):
+        """Initialize."""
+        if isinstance(stream, io.TextIOBase):
+            self.write = stream.write
+        else:
+            self.write = lambda text: stream.write(text.encode("utf-8"))
+
+    def key(self, key, first):
+        """Write an object key."""
+        self.write(("" if first else ",") + json.dumps(key) + ":")
+
+    def value(self, value):
+        """Write a complete value."""
+        self.write(json.dumps(value, default=json_default))
+
+
+def _is_null(reader):
+    """Consume and return True if the next value is null."""
+    if reader.peek() == "n":
+        reader.value()
+        return True
+    return False
+
+
+def _stream_upgrade_kgraph(reader, writer):
+    """Upgrade a KnowledgeGraph, one node/edge at a time."""
+    converters = {"nodes": upgrade_Node, "edges": upgrade_Edge}
+    writer.write("{")
+    first = True
+    for key in reader.members():
+        if key not in converters:
+            reader.skip()
+            continue
+        writer.key(key, first)
+        first = False
+        convert = converters[key]
+        writer.write("{")
+        for idx, _ in enumerate(reader.elements()):
+            element = reader.value()
+            writer.key(element["id"], idx == 0)
+            writer.value(convert(element, inplace=True))
+        writer.write("}")
+    writer.write("}")
+
+
+def _stream_downgrade_kgraph(reader, writer):
+    """Downgrade a KnowledgeGraph, one node/edge at a time."""
+    converters = {"nodes": downgrade_Node, "edges": downgrade_Edge}
+    writer.write("{")
+    first = True
+    for key in reader.members():
+        if key not in converters:
+            reader.skip()
+            continue
+        writer.key(key, first)
+        first = False
+        convert = converters[key]
+        writer.write("[")
+        for idx, id_ in enumerate(reader.members()):
+            if idx:
+                writer.write(",")
+            writer.value(convert(reader.value(), id_, inplace=True))
+        writer.write("]")
+    writer.write("}")
+
+
+def _stream_results(reader, writer, convert):
+    """Convert Results, one at a time."""
+    writer.write("[")
+    for idx, _ in enumerate(reader.elements()):
+        if idx:
+            writer.write(",")
+        writer.value(convert(reader.value(), inplace=True))
+    writer.write("]")
+
+
+def _stream_message(reader, writer, convert_qgraph, convert_kgraph, convert_result):
+    """Convert a Message.
+
+    Sections are written in input order. Null sections and unknown
+    properties are dropped.
+    """
+    writer.write("{")
+    first = True
+    for key in reader.members():
+        if key not in ("query_graph", "knowledge_graph", "results"):
+            reader.skip()
+            continue
+        if _is_null(reader):
+            continue
+        writer.key(key, first)
+        first = False
+        if key == "query_graph":
+            writer.value(convert_qgraph(reader.value(), inplace=True))
+        elif key == "knowledge_graph":
+            convert_kgraph(reader, writer)
+        else:
+            _stream_results(reader, writer, convert_result)
+    writer.write("}")
+
+
+def _stream_upgrade_message(reader, writer):
+    """Upgrade a Message."""
+    _stream_message(
+        reader, writer,
+        upgrade_QueryGraph, _stream_upgrade_kgraph, upgrade_Result,
+    )
+
+
+def _stream_downgrade_message(reader, writer):
+    """Downgrade a Message."""
+    _stream_message(
+        reader, writer,
+        downgrade_QueryGraph, _stream_downgrade_kgraph, downgrade_Result,
+    )
+
+
+def _stream_query(reader, writer, convert_message):
+    """Convert a Query, copying properties other than message verbatim."""
+    writer.write("{")
+    for idx, key in enumerate(reader.members()):
+        writer.key(key, idx == 0)
+        if key == "message":
+            convert_message(reader, writer)
+        else:
+            writer.value(reader.value())
+    writer.write("}")
+
+
+def upgrade_message_stream(instream, outstream, chunk_size=CHUNK_SIZE):
+    """Upgrade a JSON-encoded Message from 0.9.2 to 1.0.0."""
+    _stream_upgrade_message(JSONReader(instream, chunk_size), JSONWriter(outstream))
+
+
+def downgrade_message_stream(instream, outstream, chunk_size=CHUNK_SIZE):
+    """Downgrade a JSON-encoded Message from 1.0.0 to 0.9.2."""
+    _stream_downgrade_message(JSONReader(instream, chunk_size), JSONWriter(outstream))
+
+
+def upgrade_query_stream(instream, outstream, chunk_size=CHUNK_SIZE):
+    """Upgrade a JSON-encoded Query from 0.9.2 to 1.0.0."""
+    _stream_query(
+        JSONReader(instream, chunk_size), JSONWriter(outstream),
+        _stream_upgrade_message,
+    )
+
+
+def downgrade_query_stream(instream, outstream, chunk_size=CHUNK_SIZE):
+    """Downgrade a JSON-encoded Query from 1.0.0 to 0.9.2."""
+    _stream_query(
+        JSONReader(instream, chunk_size), JSONWriter(outstream),
+        _stream_downgrade_message,
+    )
@@ -0,0 +1,88 @@
+"""Synthetic TRAPI messages, e.g. for benchmarks and tests.
+
+Messages have varied categories, predicates, and attributes, and are
+reproducible for a given seed.
+"""
+import random
+
+from .upgrading import upgrade_Message
+
+CATEGORIES = [
+    "disease", "gene", "chemical_substance", "phenotypic_feature",
+    "biological_process", "anatomical_entity", "protein", "pathway",
+]
+PREDICATES = [
+    "related_to", "treats", "causes", "interacts_with",
+    "gene_associated_with_condition", "has_phenotype", "affects",
+]
+
+
+def message0(nodes=1000, edges=1000, results=1000, attributes=2, seed=0):
+    """Build a 0.9.2 Message.
+
+    nodes/edges are the knowledge graph size, results the number of results
+    (each binding two nodes and one edge), and attributes the number of
+    additional properties per node and edge.
+    """
+    rng = random.Random(seed)
+    node_ids = [f"CURIE:{idx}" for idx in range(nodes)]
+    kgraph = {
+        "nodes": [
+            {
+                "id": node_id,
+                "type": [rng.choice(CATEGORIES)],
+                "name": f"node {idx}",
+                **{
+                    f"attribute{jdx}": rng.random()
+                    for jdx in range(attributes)
+                },
+            }
+            for idx, node_id in enumerate(node_ids)
+        ],
+        "edges": [
+            {
+                "id": f"e{idx}",
+                "type": rng.choice(PREDICATES),
+                "source_id": rng.choice(node_ids),
+                "target_id": rng.choice(node_ids),
+                **{
+                    f"attribute{jdx}": rng.random()
+                    for jdx in range(attributes)
+                },
+            }
+            for idx in range(edges)
+        ],
+    }
+    return {
+        "query_graph": {
+            "nodes": [
+                {"id": "n0", "type": "disease"},
+                {"id": "n1", "type": "gene"},
+            ],
+            "edges": [
+                {"id": "e01", "type": "related_to", "source_id": "n0", "target_id": "n1"},
+            ],
+        },
+        "knowledge_graph": kgraph,
+        "results": [
+            {
+                "node_bindings": [
+                    {"qg_id": "n0", "kg_id": rng.choice(node_ids)},
+                    {"qg_id": "n1", "kg_id": rng.choice(node_ids)},
+                ],
+                "edge_bindings": [
+                    {"qg_id": "e01", "kg_id": f"e{rng.randrange(max(edges, 1))}"},
+                ],
+                "score": rng.random(),
+            }
+            for _ in range(results)
+        ],
+    }
+
+
+def message1(nodes=1000, edges=1000, results=1000, attributes=2, seed=0):
+    """Build a 1.0.0 Message.
+
+    See message0.
+    """
+    return upgrade_Message(message0(nodes, edges, results, attributes, seed))
@@ -1,128 +1,199 @@
 """TRAPI 0.9.2 to 1.0.0."""
 from collections import defaultdict
 
-from .util import ensure_list, pascal_case, snake_case
+from .attributes import upgrade_attributes
+from .dedupe import dedupe_Results
+from .parallel import (
+    CHUNK_SIZE, effective_workers, executor_for, parallel_map, parallel_sections,
+)
+from .util import ensure_list, intern_strings, memoize, pascal_case, snake_case
+from .vocabulary import UPGRADE_ENTITY, UPGRADE_PREDICATE
 
+# 0.9.2 properties that are not converted to attributes
+NODE_PROPERTIES = frozenset(("type", "name"))
+EDGE_PROPERTIES = frozenset(("source_id", "target_id", "type", "relation"))
 
+
+@memoize
 def upgrade_BiolinkEntity(biolink_entity):
     """Upgrade BiolinkEntity from 0.9.2 to 1.0.0."""
+    if biolink_entity in UPGRADE_ENTITY:
+        return UPGRADE_ENTITY[biolink_entity]
     if biolink_entity.startswith("biolink:"):
         return biolink_entity
     return "biolink:" + pascal_case(biolink_entity)
 
 
+@memoize
 def upgrade_BiolinkRelation(biolink_relation):
     """Upgrade BiolinkRelation (0.9.2) to BiolinkPredicate (1.0.0)."""
     if biolink_relation is None:
         return None
+    if biolink_relation in UPGRADE_PREDICATE:
+        return UPGRADE_PREDICATE[biolink_relation]
     if biolink_relation.startswith("biolink:"):
         return biolink_relation
     return "biolink:" + snake_case(biolink_relation)
 
 
-def upgrade_Node(node):
-    """Upgrade Node from 0.9.2 to 1.0.0."""
-    node = {**node}
-    node.pop("id")
-    new = dict()
+def upgrade_Node(node, inplace=False, lazy_attributes=False):
+    """Upgrade Node from 0.9.2 to 1.0.0.
+
+    If inplace, node is modified and returned rather than copied.
+    If lazy_attributes, attributes are LazyAttributes.
+    """
+    if not inplace:
+        node = {**node}
+    del node["id"]
+    # move remaining properties to attributes
+    attributes = upgrade_attributes(node, NODE_PROPERTIES, lazy_attributes)
     if "type" in node:
-        new["category"] = [
+        node["category"] = [
             upgrade_BiolinkEntity(node_type)  # node.type is a list[str]
             for node_type in node.pop("type")
         ]
-    if "name" in node:
-        new["name"] = node.pop("name")
-    if node:
-        # add remaining properties as attributes
-        new["attributes"] = [
-            {
-                "name": key,
-                "type": "EDAM:data_0006",  # "data"
-                "value": value,
-            }
-            for key, value in node.items()
-        ]
-    return new
+    if attributes:
+        node["attributes"] = attributes
+    return node
 
 
-def upgrade_Edge(edge):
-    """Upgrade Edge from 0.9.2 to 1.0.0."""
-    edge = {**edge}
-    edge.pop("id")
-    new = {
-        "subject": edge.pop("source_id"),
-        "object": edge.pop("target_id"),
-    }
+def upgrade_Edge(edge, inplace=False, lazy_attributes=False):
+    """Upgrade Edge from 0.9.2 to 1.0.0.
+
+    If inplace, edge is modified and returned rather than copied.
+    If lazy_attributes, attributes are LazyAttributes.
+    """
+    if not inplace:
+        edge = {**edge}
+    del edge["id"]
+    # move remaining properties to attributes
+    attributes = upgrade_attributes(edge, EDGE_PROPERTIES, lazy_attributes)
+    edge["subject"] = edge.pop("source_id")
+    edge["object"] = edge.pop("target_id")
     if "type" in edge:
-        new["predicate"] = upgrade_BiolinkRelation(edge.pop("type"))
-    if "relation" in edge:
-        new["relation"] = edge.pop("relation")
-    if edge:
-        # add remaining properties as attributes
-        new["attributes"] = [
-            {
-                "name": key,
-                "type": "EDAM:data_0006",  # "data"
-                "value": value,
-            }
-            for key, value in edge.items()
-        ]
+        edge["predicate"] = upgrade_BiolinkRelation(edge.pop("type"))
+    if attributes:
+        edge["attributes"] = attributes
+    return edge
+
+
+def _map_by_id(objs, convert, *args):
+    """Convert each obj in place, and map its id to it."""
+    new = dict()
+    for obj in objs:
+        id_ = obj["id"]  # read before conversion removes it
+        new[id_] = convert(obj, True, *args)
     return new
 
 
-def upgrade_KnowledgeGraph(kgraph):
-    """Upgrade KnowledgeGraph from 0.9.2 to 1.0.0."""
-    return {
-        "nodes": {
-            knode["id"]: upgrade_Node(knode)
-            for knode in kgraph["nodes"]
-        },
-        "edges": {
-            kedge["id"]: upgrade_Edge(kedge)
-            for kedge in kgraph["edges"]
-        },
-    }
+def _replace(obj, new):
+    """Replace the contents of obj with those of new."""
+    obj.clear()
+    obj.update(new)
+    return obj
 
 
-def upgrade_QNode(qnode):
-    """Upgrade QNode from 0.9.2 to 1.0.0."""
-    qnode = {**qnode}
-    qnode.pop("id")
-    new = dict()
+def upgrade_KnowledgeGraph(
+        kgraph,
+        workers=None,
+        chunksize=CHUNK_SIZE,
+        inplace=False,
+        lazy_attributes=False,
+):
+    """Upgrade KnowledgeGraph from 0.9.2 to 1.0.0.
+
+    If workers (a number of processes or an Executor) is provided, nodes and
+    edges are converted in parallel, in chunks of chunksize, where that can
+    pay off (see parallel).
+    If inplace, kgraph and its nodes and edges are modified and returned
+    rather than copied (nodes and edges only when converted serially).
+    If lazy_attributes, node and edge attributes are LazyAttributes.
+    """
+    workers = effective_workers(workers, len(kgraph["nodes"]) + len(kgraph["edges"]))
+    if workers is not None:
+        with executor_for(workers) as executor:
+            new = {
+                "nodes": dict(zip(
+                    (knode["id"] for knode in kgraph["nodes"]),
+                    parallel_map(
+                        upgrade_Node,
+                        ((knode, False, lazy_attributes) for knode in kgraph["nodes"]),
+                        executor, chunksize,
+                    ),
+                )),
+                "edges": dict(zip(
+                    (kedge["id"] for kedge in kgraph["edges"]),
+                    parallel_map(
+                        upgrade_Edge,
+                        ((kedge, False, lazy_attributes) for kedge in kgraph["edges"]),
+                        executor, chunksize,
+                    ),
+                )),
+            }
+    elif inplace:
+        new = {
+            "nodes": _map_by_id(kgraph["nodes"], upgrade_Node, lazy_attributes),
+            "edges": _map_by_id(kgraph["edges"], upgrade_Edge, lazy_attributes),
+        }
+    else:
+        new = {
+            "nodes": {
+                knode["id"]: upgrade_Node(knode, False, lazy_attributes)
+                for knode in kgraph["nodes"]
+            },
+            "edges": {
+                kedge["id"]: upgrade_Edge(kedge, False, lazy_attributes)
+                for kedge in kgraph["edges"]
+            },
+        }
+    if inplace:
+        return _replace(kgraph, new)
+    return new
+
+
+def upgrade_QNode(qnode, inplace=False):
+    """Upgrade QNode from 0.9.2 to 1.0.0.
+
+    If inplace, qnode is modified and returned rather than copied.
+    """
+    if not inplace:
+        qnode = {**qnode}
+    del qnode["id"]
+    # remaining properties are kept verbatim, and take precedence
     if "type" in qnode:
-        new["category"] = upgrade_BiolinkEntity(qnode.pop("type"))
+        qnode.setdefault("category", upgrade_BiolinkEntity(qnode.pop("type")))
     if "curie" in qnode:
-        new["id"] = qnode.pop("curie")
-    # add remaining properties verbatim
-    new = {
-        **new,
-        **qnode,
-    }
-    return new
+        qnode["id"] = qnode.pop("curie")
+    return qnode
 
 
-def upgrade_QEdge(qedge):
-    """Upgrade QEdge from 0.9.2 to 1.0.0."""
-    qedge = {**qedge}
-    qedge.pop("id")
-    new = {
-        "subject": qedge.pop("source_id"),
-        "object": qedge.pop("target_id"),
-    }
+def upgrade_QEdge(qedge, inplace=False):
+    """Upgrade QEdge from 0.9.2 to 1.0.0.
+
+    If inplace, qedge is modified and returned rather than copied.
+    """
+    if not inplace:
+        qedge = {**qedge}
+    del qedge["id"]
+    # remaining properties are kept verbatim, and take precedence
+    qedge.setdefault("subject", qedge.pop("source_id"))
+    qedge.setdefault("object", qedge.pop("target_id"))
     if "type" in qedge:
-        new["predicate"] = upgrade_BiolinkRelation(qedge.pop("type"))
-    if "relation" in qedge:
-        new["relation"] = qedge.pop("relation")
-    # add remaining properties verbatim
-    new = {
-        **new,
-        **qedge,
-    }
-    return new
+        qedge.setdefault("predicate", upgrade_BiolinkRelation(qedge.pop("type")))
+    return qedge
 
 
-def upgrade_QueryGraph(qgraph):
-    """Upgrade QueryGraph from 0.9.2 to 1.0.0."""
+def upgrade_QueryGraph(qgraph, inplace=False):
+    """Upgrade QueryGraph from 0.9.2 to 1.0.0.
+
+    If inplace, qgraph and its nodes and edges are modified and returned
+    rather than copied.
+    """
+    if inplace:
+        return _replace(qgraph, {
+            "nodes": _map_by_id(qgraph["nodes"], upgrade_QNode),
+            "edges": _map_by_id(qgraph["edges"], upgrade_QEdge),
+        })
     return {
         "nodes": {
             qnode["id"]: upgrade_QNode(qnode)
@@ -135,8 +206,17 @@ def upgrade_QueryGraph(qgraph):
     }
 
 
-def upgrade_NodeBinding(node_binding):
-    """Upgrade NodeBinding from 0.9.2 to 1.0.0."""
+def upgrade_NodeBinding(node_binding, inplace=False):
+    """Upgrade NodeBinding from 0.9.2 to 1.0.0.
+
+    If inplace, a NodeBinding with a single kg_id is modified and yielded
+    rather than copied.
+    """
+    if inplace and not isinstance(node_binding["kg_id"], list):
+        del node_binding["qg_id"]
+        node_binding.setdefault("id", node_binding.pop("kg_id"))
+        yield node_binding
+        return
     for kg_id in ensure_list(node_binding["kg_id"]):
         new = {
             "id": kg_id,
@@ -148,8 +228,17 @@ def upgrade_NodeBinding(node_binding):
         yield new
 
 
-def upgrade_EdgeBinding(edge_binding):
-    """Upgrade EdgeBinding from 0.9.2 to 1.0.0."""
+def upgrade_EdgeBinding(edge_binding, inplace=False):
+    """Upgrade EdgeBinding from 0.9.2 to 1.0.0.
+
+    If inplace, an EdgeBinding with a single kg_id is modified and yielded
+    rather than copied.
+    """
+    if inplace and not isinstance(edge_binding["kg_id"], list):
+        del edge_binding["qg_id"]
+        edge_binding.setdefault("id", edge_binding.pop("kg_id"))
+        yield edge_binding
+        return
     for kg_id in ensure_list(edge_binding["kg_id"]):
         new = {
             "id": kg_id,
@@ -161,47 +250,138 @@ def upgrade_EdgeBinding(edge_binding):
         yield new
 
 
-def upgrade_Result(result):
-    """Upgrade Result from 0.9.2 to 1.0.0."""
-    result = {**result}
-    new = {
-        "node_bindings": defaultdict(list),
-        "edge_bindings": defaultdict(list),
-    }
+def upgrade_Result(result, inplace=False):
+    """Upgrade Result from 0.9.2 to 1.0.0.
+
+    If inplace, result and its bindings are modified and returned rather
+    than copied.
+    """
+    if not inplace:
+        result = {**result}
+    node_bindings = defaultdict(list)
     for node_binding in result.pop("node_bindings"):
-        new["node_bindings"][node_binding["qg_id"]].extend(
-            upgrade_NodeBinding(node_binding)
+        node_bindings[node_binding["qg_id"]].extend(
+            upgrade_NodeBinding(node_binding, inplace)
         )
+    edge_bindings = defaultdict(list)
     for edge_binding in result.pop("edge_bindings"):
-        new["edge_bindings"][edge_binding["qg_id"]].extend(
-            upgrade_EdgeBinding(edge_binding)
+        edge_bindings[edge_binding["qg_id"]].extend(
+            upgrade_EdgeBinding(edge_binding, inplace)
         )
-    new = {
-        **new,
-        **result,
-    }
-    return new
+    result["node_bindings"] = node_bindings
+    result["edge_bindings"] = edge_bindings
+    return result
+
+
+def upgrade_Results(results, workers=None, chunksize=CHUNK_SIZE, inplace=False):
+    """Upgrade Results from 0.9.2 to 1.0.0.
 
+    Results are yielded in order, so that the first can be used before the
+    last are converted. If workers (a number of processes or an Executor) is
+    provided, they are converted in parallel, in chunks of chunksize, where
+    that can pay off (see parallel).
+    If inplace, results are modified and yielded rather than copied (only
+    when converted serially).
+    """
+    if hasattr(results, "__len__"):
+        workers = effective_workers(workers, len(results))
+    if workers is None:
+        for result in results:
+            yield upgrade_Result(result, inplace)
+        return
+    yield from parallel_map(
+        upgrade_Result,
+        ((result,) for result in results),
+        workers, chunksize,
+    )
 
-def upgrade_Message(message):
-    """Upgrade Message from 0.9.2 to 1.0.0."""
+
+def upgrade_Message(
+        message,
+        workers=None,
+        chunksize=CHUNK_SIZE,
+        inplace=False,
+        intern=False,
+        lazy_attributes=False,
+        dedupe=False,
+        generated=False,
+):
+    """Upgrade Message from 0.9.2 to 1.0.0.
+
+    If workers (a number of processes or an Executor) is provided, the
+    knowledge graph and results are converted in parallel, where that can
+    pay off (see parallel).
+    If inplace, message and its contents are modified and returned rather
+    than copied.
+    If intern, repeated strings in the output (e.g. CURIEs in the knowledge
+    graph and bindings) are replaced by a single shared instance.
+    If lazy_attributes, knowledge graph attributes are LazyAttributes, which
+    build Attribute dicts only when accessed.
+    If dedupe, repeated bindings within a result, and results with the same
+    bindings as an earlier one, are dropped.
+    If generated, components are converted by the converters generated from
+    codegen.SPEC, which do not support workers, inplace, or lazy_attributes.
+    """
+    if generated:
+        if workers is not None or inplace or lazy_attributes:
+            raise ValueError(
+                "Generated converters do not support workers, inplace, or lazy_attributes"
+            )
+        # codegen imports this module
+        from .codegen import upgrade_Message as convert
+        new = convert(message)
+        if dedupe and "results" in new:
+            new["results"] = list(dedupe_Results(new["results"]))
+        if intern:
+            intern_strings(new, dict())
+        return new
     new = dict()
-    if "query_graph" in message:
-        new["query_graph"] = upgrade_QueryGraph(message["query_graph"])
-    if "knowledge_graph" in message:
-        new["knowledge_graph"] = upgrade_KnowledgeGraph(message["knowledge_graph"])
-    if "results" in message:
-        new["results"] = [
-            upgrade_Result(result)
-            for result in message["results"]
-        ]
+    # start a pool only if a section will use it
+    kgraph_parallel, results_parallel = parallel_sections(workers, message)
+    if not (kgraph_parallel or results_parallel):
+        workers = None
+    with executor_for(workers) as executor:
+        if "query_graph" in message:
+            new["query_graph"] = upgrade_QueryGraph(message["query_graph"], inplace)
+        if "knowledge_graph" in message:
+            new["knowledge_graph"] = upgrade_KnowledgeGraph(
+                message["knowledge_graph"], executor if kgraph_parallel else None,
+                chunksize, inplace, lazy_attributes,
+            )
+        if "results" in message:
+            results = upgrade_Results(
+                message["results"], executor if results_parallel else None,
+                chunksize, inplace,
+            )
+            if dedupe:
+                results = dedupe_Results(results)
+            new["results"] = list(results)
+    if intern:
+        intern_strings(new, dict())
+    if inplace:
+        return _replace(message, new)
     return new
 
 
-def upgrade_Query(query):
-    """Upgrade Query from 0.9.2 to 1.0.0."""
-    query = {**query}
-    return {
-        "message": upgrade_Message(query.pop("message")),
-        **query,
-    }
+def upgrade_Query(
+        query,
+        workers=None,
+        chunksize=CHUNK_SIZE,
+        inplace=False,
+        intern=False,
+        lazy_attributes=False,
+        dedupe=False,
+        generated=False,
+):
+    """Upgrade Query from 0.9.2 to 1.0.0.
+
+    If inplace, query and its contents are modified and returned rather
+    than copied.
+    """
+    if not inplace:
+        query = {**query}
+    query["message"] = upgrade_Message(
+        query["message"], workers, chunksize, inplace, intern,
+        lazy_attributes, dedupe, generated,
+    )
+    return query
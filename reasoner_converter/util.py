@@ -1,8 +1,18 @@
 """Utilities."""
+from functools import lru_cache
+import hashlib
+import json
 import re
 from typing import List, Union
 
+# Maximum number of distinct values memoized per casing function.
+# Real payloads use a few dozen distinct Biolink terms, so this is generous.
+CACHE_SIZE = 4096
 
+memoize = lru_cache(maxsize=CACHE_SIZE)
+
+
+@memoize
 def _snake_case(arg: str):
     """Convert string to snake_case.
 
@@ -26,6 +36,7 @@ def _snake_case(arg: str):
     return tmp
 
 
+@memoize
 def _pascal_case(arg: str):
     """Convert string to PascalCase.
 
@@ -72,3 +83,56 @@ def ensure_list(arg: Union[str, List[str]]):
     if isinstance(arg, list):
         return arg
     return [arg]
+
+
+def intern_strings(obj, table):
+    """Replace strings in obj with canonical instances from table, in place.
+
+    obj is any JSON-like structure of dicts and lists. table maps each
+    string to its canonical instance and is extended as new strings are
+    found; share it across calls to share strings across objects.
+    Returns obj, or its canonical instance if it is a string.
+    """
+    if isinstance(obj, str):
+        return table.setdefault(obj, obj)
+    if isinstance(obj, dict):
+        rekey = False
+        for key, value in obj.items():
+            if table.setdefault(key, key) is not key:
+                rekey = True
+            if isinstance(value, (str, dict, list)):
+                obj[key] = intern_strings(value, table)
+        if rekey:
+            items = list(obj.items())
+            obj.clear()
+            obj.update((table[key], value) for key, value in items)
+    elif isinstance(obj, list):
+        for idx, value in enumerate(obj):
+            if isinstance(value, (str, dict, list)):
+                obj[idx] = intern_strings(value, table)
+    return obj
+
+
+def fingerprint(obj):
+    """Get a digest of JSON-like obj that changes whenever obj does.
+
+    Equal objects have equal fingerprints, regardless of key order.
+    """
+    # a canonical encoding; e.g. marshal output depends on reference counts
+    data = json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def message_size(message):
+    """Count knowledge graph nodes/edges and results in a Message.
+
+    Works for either version.
+    """
+    if not message:
+        return 0
+    kgraph = message.get("knowledge_graph", None) or dict()
+    return (
+        len(kgraph.get("nodes", None) or ())
+        + len(kgraph.get("edges", None) or ())
+        + len(message.get("results", None) or ())
+    )
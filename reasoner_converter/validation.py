@@ -0,0 +1,112 @@
+"""TRAPI schema validation.
+
+The 0.9.2 and 1.0.x component schemas are vendored in data/, so validation
+needs no network access. Each component's validator is built once, on first
+use, and reused.
+
+Requires jsonschema (pip install reasoner-converter[validation]).
+"""
+from functools import lru_cache
+import json
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SCHEMA_FILES = {
+    "0.9.2": "TranslatorReasonerAPI-0.9.2.json",
+    "1.0.0": "TranslatorReasonerAPI-1.0.2.json",
+}
+
+
+def fix_nullable(schema):
+    """Replace nullable: true with json schema-compliant alternative."""
+    if "$ref" in schema:
+        return schema
+    if "oneOf" in schema:
+        if schema.pop("nullable", False):
+            schema["oneOf"].append({"type": "null"})
+    elif "allOf" in schema:
+        if schema.pop("nullable", False):
+            if len(schema["allOf"]) == 1:
+                schema["oneOf"] = [
+                    schema.pop("allOf")[0],
+                    {"type": "null"},
+                ]
+            else:
+                schema["oneOf"] = [
+                    schema.pop("allOf"),
+                    {"type": "null"},
+                ]
+    elif "type" in schema:
+        if schema["type"] == "object":
+            if "properties" in schema:
+                schema["properties"] = {
+                    pname: fix_nullable(property)
+                    for pname, property in schema["properties"].items()
+                }
+            if "additionalProperties" in schema and isinstance(schema["additionalProperties"], dict):
+                schema["additionalProperties"] = fix_nullable(schema["additionalProperties"])
+        if schema.pop("nullable", False):
+            schema = {
+                "oneOf": [
+                    schema,
+                    {"type": "null"}
+                ]
+            }
+    return schema
+
+
+@lru_cache(maxsize=None)
+def load_components(version):
+    """Load component schemas for TRAPI version ("0.9.2" or "1.0.0")."""
+    if version not in SCHEMA_FILES:
+        raise ValueError(f"Unsupported TRAPI version {version!r}")
+    with open(os.path.join(DATA_DIR, SCHEMA_FILES[version]), "r") as stream:
+        components = json.load(stream)["components"]["schemas"]
+    if version != "0.9.2":
+        components = {
+            cname: fix_nullable(component)
+            for cname, component in components.items()
+        }
+    return components
+
+
+@lru_cache(maxsize=None)
+def get_validator(version, component_name):
+    """Get a compiled validator for a TRAPI component."""
+    import jsonschema
+
+    components = load_components(version)
+    if component_name not in components:
+        raise ValueError(f"Unknown TRAPI {version} component {component_name!r}")
+    # $refs are resolved against #/components/schemas/...
+    schema = {
+        **components[component_name],
+        "components": {"schemas": components},
+    }
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def validate(obj, component_name, version):
+    """Validate object against a TRAPI component schema.
+
+    Raises jsonschema.ValidationError if obj is invalid.
+    """
+    import jsonschema
+
+    error = jsonschema.exceptions.best_match(
+        get_validator(version, component_name).iter_errors(obj)
+    )
+    if error is not None:
+        raise error
+
+
+def validate0(obj, component_name):
+    """Validate object against TRAPI 0.9.2 schema."""
+    validate(obj, component_name, "0.9.2")
+
+
+def validate1(obj, component_name):
+    """Validate object against TRAPI 1.0.0 schema."""
+    validate(obj, component_name, "1.0.0")
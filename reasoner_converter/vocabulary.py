@@ -0,0 +1,68 @@
+"""Biolink vocabulary lookup tables.
+
+Known 0.9.2 BiolinkEntities and BiolinkRelations are mapped directly to and
+from their 1.0.0 forms, so converting them is a single dict lookup. Terms
+not in the vocabulary fall back to regex-based casing. This also gets terms
+right that casing cannot round-trip, e.g. "RNA_product" <-> "biolink:RNAProduct".
+
+The default vocabulary is loaded at import from data/biolink_vocabulary.json.
+"""
+import json
+import os
+
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "data",
+    "biolink_vocabulary.json",
+)
+
+# 0.9.2 BiolinkEntity -> 1.0.0 BiolinkEntity
+UPGRADE_ENTITY = dict()
+# 1.0.0 BiolinkEntity -> 0.9.2 BiolinkEntity
+DOWNGRADE_ENTITY = dict()
+# 0.9.2 BiolinkRelation -> 1.0.0 BiolinkPredicate
+UPGRADE_PREDICATE = dict()
+# 1.0.0 BiolinkPredicate -> 0.9.2 BiolinkRelation
+DOWNGRADE_PREDICATE = dict()
+
+
+def _read(path):
+    """Read vocabulary file into the lookup tables."""
+    with open(path, "r") as stream:
+        vocabulary = json.load(stream)
+    for table in (UPGRADE_ENTITY, DOWNGRADE_ENTITY, UPGRADE_PREDICATE, DOWNGRADE_PREDICATE):
+        table.clear()
+    for entity0, entity1 in vocabulary.get("entities", dict()).items():
+        entity1 = "biolink:" + entity1
+        UPGRADE_ENTITY[entity0] = entity1
+        DOWNGRADE_ENTITY[entity1] = entity0
+    for relation in vocabulary.get("predicates", []):
+        predicate = "biolink:" + relation
+        UPGRADE_PREDICATE[relation] = predicate
+        DOWNGRADE_PREDICATE[predicate] = relation
+
+
+def _invalidate():
+    """Clear memoized conversions, which may reflect the old vocabulary."""
+    from .casing import cache_clear
+    cache_clear()
+
+
+def load_vocabulary(path: str = DEFAULT_PATH):
+    """Load vocabulary, replacing any that is currently loaded.
+
+    The file is JSON of the form
+    {"entities": {"<snake_case>": "<PascalCase>", ...}, "predicates": ["<snake_case>", ...]}
+    """
+    _read(path)
+    _invalidate()
+
+
+def clear_vocabulary():
+    """Remove all terms, so that conversion relies on casing alone."""
+    for table in (UPGRADE_ENTITY, DOWNGRADE_ENTITY, UPGRADE_PREDICATE, DOWNGRADE_PREDICATE):
+        table.clear()
+    _invalidate()
+
+
+_read(DEFAULT_PATH)
@@ -14,7 +14,17 @@ setup(
     long_description=long_description,
     long_description_content_type='text/markdown',
     packages=['reasoner_converter'],
+    package_data={'reasoner_converter': ['data/*.json']},
     install_requires=[],
+    extras_require={
+        'validation': ['jsonschema'],
+        'fast': ['orjson'],
+    },
+    entry_points={
+        'console_scripts': [
+            'reasoner-converter=reasoner_converter.cli:main',
+        ],
+    },
     zip_safe=False,
     license='MIT',
     python_requires='>=3.6',
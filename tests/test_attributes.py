@@ -1,9 +1,13 @@
 """Test handling additional properties and `attributes`."""
+import pickle
+
+from reasoner_converter import parallel
+from reasoner_converter.attributes import LazyAttributes
 from reasoner_converter.downgrading import (
     downgrade_Node, downgrade_Edge,
 )
 from reasoner_converter.upgrading import (
-    upgrade_Node, upgrade_Edge,
+    upgrade_Node, upgrade_Edge, upgrade_KnowledgeGraph,
 )
 
 from .util.validators import validate0, validate1
@@ -79,3 +83,41 @@ def test_downgrade_edge_nameless():
         "target_id": "XXX:ZZZ",
         "attribute00": 0,
     }
+
+
+def test_lazy_attributes():
+    """Test lazily-built attributes."""
+    x0a = {
+        "id": "xxx",
+        "source_id": "XXX:YYY",
+        "target_id": "XXX:ZZZ",
+        "a": 1,
+        "b": 2,
+    }
+    x1 = upgrade_Edge(x0a, lazy_attributes=True)
+    assert isinstance(x1["attributes"], LazyAttributes)
+    assert x1 == upgrade_Edge(x0a)
+    assert x1["attributes"][1] == {
+        "name": "b",
+        "type": "EDAM:data_0006",
+        "value": 2,
+    }
+    validate1({**x1, "attributes": x1["attributes"].materialize()}, "Edge")
+    assert downgrade_Edge(x1, x0a["id"]) == x0a
+    assert pickle.loads(pickle.dumps(x1)) == x1
+
+
+def test_lazy_attributes_kgraph(monkeypatch):
+    """Test lazily-built attributes in parallel and in-place conversion."""
+    monkeypatch.setattr(parallel, "MIN_ITEMS", 0)
+    monkeypatch.setattr(parallel, "available_cpus", lambda: 2)
+    kgraph = {
+        "nodes": [{"id": "XXX:YYY", "a": 1}],
+        "edges": [],
+    }
+    expected = upgrade_KnowledgeGraph(kgraph)
+    lazy = upgrade_KnowledgeGraph(kgraph, workers=1, lazy_attributes=True)
+    assert isinstance(lazy["nodes"]["XXX:YYY"]["attributes"], LazyAttributes)
+    assert lazy == expected
+    lazy = upgrade_KnowledgeGraph(kgraph, inplace=True, lazy_attributes=True)
+    assert lazy == expected
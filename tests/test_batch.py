@@ -0,0 +1,39 @@
+"""Test batch conversion."""
+import copy
+
+from reasoner_converter.batch import downgrade_many, upgrade_many
+from reasoner_converter.downgrading import downgrade_Query
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+
+from .util.fixtures import QUERY0
+
+
+def test_upgrade_many():
+    """Test upgrading a batch of Queries and Messages."""
+    objs = [QUERY0, QUERY0["message"], {"message": {"results": [{}]}}]
+    converted = list(upgrade_many(objs, intern=True))
+    assert converted[0].value == upgrade_Query(QUERY0)
+    assert converted[0].error is None
+    assert converted[1].value == upgrade_Message(QUERY0["message"])
+    assert converted[2].value is None
+    assert isinstance(converted[2].error, KeyError)
+    # strings are shared across outputs
+    ids = [
+        next(iter(message["knowledge_graph"]["nodes"]))
+        for message in (converted[0].value["message"], converted[1].value)
+    ]
+    assert ids[0] is ids[1]
+
+
+def test_downgrade_many():
+    """Test downgrading a batch with an invalid QNode, in parallel."""
+    query1 = upgrade_Query(QUERY0)
+    invalid = copy.deepcopy(query1)
+    invalid["message"]["query_graph"]["nodes"]["n0"]["category"] = [
+        "biolink:Disease", "biolink:Gene",
+    ]
+    converted = list(downgrade_many([query1, invalid, query1], workers=2, chunksize=1))
+    assert [value for value, _ in converted] == [
+        downgrade_Query(query1), None, downgrade_Query(query1),
+    ]
+    assert isinstance(converted[1].error, ValueError)
@@ -0,0 +1,45 @@
+"""Test batch Result conversion."""
+import pytest
+
+from reasoner_converter.bindings import ResultDowngrader, ResultUpgrader
+from reasoner_converter.downgrading import downgrade_Result
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Result
+
+from .util.fixtures import QUERY0
+
+MESSAGE0 = QUERY0["message"]
+
+
+def test_upgrade():
+    """Test batch Result upgrade."""
+    upgrader = ResultUpgrader(MESSAGE0["query_graph"])
+    assert upgrader.convert_all(MESSAGE0["results"]) == [
+        upgrade_Result(result)
+        for result in MESSAGE0["results"]
+    ]
+
+
+def test_downgrade():
+    """Test batch Result downgrade."""
+    message1 = upgrade_Message(MESSAGE0)
+    downgrader = ResultDowngrader(message1["query_graph"])
+    assert downgrader.convert_all(message1["results"]) == [
+        downgrade_Result(result)
+        for result in message1["results"]
+    ]
+
+
+def test_unknown_qg_id():
+    """Test bindings to unknown query graph elements."""
+    upgrader = ResultUpgrader(MESSAGE0["query_graph"])
+    with pytest.raises(ValueError, match="node binding to unknown qg_id 'n2'"):
+        upgrader.convert({
+            "node_bindings": [{"qg_id": "n2", "kg_id": "XXX:YYY"}],
+            "edge_bindings": [],
+        })
+    downgrader = ResultDowngrader(upgrade_Message(MESSAGE0)["query_graph"])
+    with pytest.raises(ValueError, match="edge binding to unknown qg_id 'e02'"):
+        downgrader.convert({
+            "node_bindings": {},
+            "edge_bindings": {"e02": [{"id": "xxx"}]},
+        })
@@ -1,6 +1,9 @@
 """Test casing."""
 import pytest
 
+from reasoner_converter.casing import cache_clear, cache_info, prewarm
+from reasoner_converter.downgrading import downgrade_BiolinkEntity
+from reasoner_converter.upgrading import upgrade_BiolinkEntity
 from reasoner_converter.util import pascal_case, snake_case
 
 def test_snake():
@@ -29,3 +32,22 @@ def test_pascal():
     ]
     with pytest.raises(ValueError):
         pascal_case({"a": "ChemicalSubstance"})
+
+
+def test_cache():
+    """Test casing cache statistics and pre-warming."""
+    cache_clear()
+    prewarm(entities=["chemical_substance"], relations=["related_to"])
+    info = cache_info()
+    assert info["upgrade_BiolinkEntity"]["misses"] == 1
+    assert info["downgrade_BiolinkEntity"]["misses"] == 1
+    assert info["upgrade_BiolinkRelation"]["misses"] == 1
+
+    assert upgrade_BiolinkEntity("chemical_substance") == "biolink:ChemicalSubstance"
+    assert downgrade_BiolinkEntity("biolink:ChemicalSubstance") == "chemical_substance"
+    info = cache_info()
+    assert info["upgrade_BiolinkEntity"]["hits"] == 1
+    assert info["downgrade_BiolinkEntity"]["hits"] == 1
+
+    cache_clear()
+    assert cache_info()["snake_case"]["currsize"] == 0
@@ -0,0 +1,105 @@
+"""Test command-line interface."""
+import json
+
+from reasoner_converter.cli import main
+from reasoner_converter.downgrading import downgrade_Message
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+
+MESSAGE0 = {
+    "knowledge_graph": {
+        "nodes": [
+            {
+                "id": "MONDO:0005737",
+                "type": ["disease"],
+            }
+        ],
+        "edges": [],
+    },
+    "results": [
+        {
+            "node_bindings": [
+                {
+                    "qg_id": "n0",
+                    "kg_id": "MONDO:0005737",
+                },
+            ],
+            "edge_bindings": [],
+        }
+    ],
+}
+
+
+def test_file(tmp_path):
+    """Test converting single files."""
+    src = tmp_path / "query.json"
+    src.write_text(json.dumps({"a": 1, "message": MESSAGE0}))
+    dst = tmp_path / "query_1.json"
+    main(["upgrade", str(src), "-o", str(dst), "-q"])
+    assert json.loads(dst.read_text()) == upgrade_Query({"a": 1, "message": MESSAGE0})
+
+    src = tmp_path / "message.json"
+    src.write_text(json.dumps(upgrade_Message(MESSAGE0)))
+    dst = tmp_path / "message_0.json"
+    main(["downgrade", str(src), "-o", str(dst), "-q"])
+    assert json.loads(dst.read_text()) == MESSAGE0
+
+
+def test_jsonl(tmp_path):
+    """Test converting JSON Lines with workers."""
+    src = tmp_path / "messages.jsonl"
+    src.write_text("".join(
+        json.dumps({**MESSAGE0, "results": MESSAGE0["results"] * idx}) + "\n"
+        for idx in range(10)
+    ))
+    dst = tmp_path / "messages_1.jsonl"
+    main(["upgrade", str(src), "-o", str(dst), "-w", "2", "-q"])
+    records = [json.loads(line) for line in dst.read_text().splitlines()]
+    assert len(records) == 10
+    assert [len(record["results"]) for record in records] == list(range(10))
+    assert downgrade_Message(records[3]) == {**MESSAGE0, "results": MESSAGE0["results"] * 3}
+
+
+def test_directory(tmp_path):
+    """Test converting a directory."""
+    src = tmp_path / "in"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.json").write_text(json.dumps(MESSAGE0))
+    (src / "sub" / "b.jsonl").write_text(json.dumps({"message": MESSAGE0}) + "\n")
+    (src / "ignored.txt").write_text("")
+    dst = tmp_path / "out"
+    main(["upgrade", str(src), "-o", str(dst)])
+    assert json.loads((dst / "a.json").read_text()) == upgrade_Message(MESSAGE0)
+    record = json.loads((dst / "sub" / "b.jsonl").read_text())
+    assert record == {"message": upgrade_Message(MESSAGE0)}
+    assert not (dst / "ignored.txt").exists()
+
+
+def test_errors(tmp_path, capsys):
+    """Test that invalid records and files are reported and skipped."""
+    src = tmp_path / "messages.jsonl"
+    src.write_text("\n".join([
+        json.dumps(MESSAGE0),
+        json.dumps({"knowledge_graph": {"nodes": [{"type": ["gene"]}], "edges": []}}),
+        "",
+        "{not json",
+        json.dumps(MESSAGE0),
+    ]) + "\n")
+    dst = tmp_path / "messages_1.jsonl"
+    assert main(["upgrade", str(src), "-o", str(dst), "-q"]) == 1
+    assert len(dst.read_text().splitlines()) == 2
+    err = capsys.readouterr().err
+    assert f"{src}:2: KeyError" in err
+    assert f"{src}:4: JSONDecodeError" in err
+    assert "2 errors" in err
+
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "a.json").write_text(json.dumps(MESSAGE0))
+    (src / "b.json").write_text(json.dumps({"knowledge_graph": {"nodes": [{}], "edges": []}}))
+    dst = tmp_path / "out"
+    assert main(["upgrade", str(src), "-o", str(dst), "-q"]) == 1
+    assert json.loads((dst / "a.json").read_text()) == upgrade_Message(MESSAGE0)
+    assert not (dst / "b.json").exists()
+    assert str(src / "b.json") in capsys.readouterr().err
+
+    assert main(["upgrade", str(src / "a.json"), "-o", str(tmp_path / "a.json"), "-q"]) == 0
@@ -0,0 +1,134 @@
+"""Test generated converters against the hand-written ones."""
+import pytest
+
+from reasoner_converter import codegen, downgrading, upgrading
+from reasoner_converter.downgrading import downgrade_Message, downgrade_Query
+from reasoner_converter.synthetic import message0, message1
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+
+from .util.fixtures import QUERY0
+
+MESSAGE0 = message0(nodes=50, edges=50, results=50, attributes=3, seed=0)
+MESSAGE1 = message1(nodes=50, edges=50, results=50, attributes=3, seed=0)
+
+
+def _graphs0():
+    """Get 0.9.2 query/knowledge graphs."""
+    return [
+        QUERY0["message"]["query_graph"], QUERY0["message"]["knowledge_graph"],
+        MESSAGE0["query_graph"], MESSAGE0["knowledge_graph"],
+    ]
+
+
+def _graphs1():
+    """Get 1.0.0 query/knowledge graphs."""
+    message = upgrade_Query(QUERY0)["message"]
+    return [
+        message["query_graph"], message["knowledge_graph"],
+        MESSAGE1["query_graph"], MESSAGE1["knowledge_graph"],
+    ]
+
+
+@pytest.mark.parametrize("name,graph_idx", [
+    ("upgrade_QNode", 0), ("upgrade_QEdge", 0),
+    ("upgrade_Node", 1), ("upgrade_Edge", 1),
+])
+def test_upgrade(name, graph_idx):
+    """Test generated upgrade converters."""
+    kind = "nodes" if name.endswith("Node") else "edges"
+    for graph in _graphs0()[graph_idx::2]:
+        for obj in graph[kind]:
+            assert codegen.CONVERTERS[name](obj) == getattr(upgrading, name)(obj)
+
+
+@pytest.mark.parametrize("name,graph_idx", [
+    ("downgrade_QNode", 0), ("downgrade_QEdge", 0),
+    ("downgrade_Node", 1), ("downgrade_Edge", 1),
+])
+def test_downgrade(name, graph_idx):
+    """Test generated downgrade converters."""
+    kind = "nodes" if name.endswith("Node") else "edges"
+    for graph in _graphs1()[graph_idx::2]:
+        for id_, obj in graph[kind].items():
+            assert codegen.CONVERTERS[name](obj, id_) == getattr(downgrading, name)(obj, id_)
+
+
+def test_bindings():
+    """Test generated binding converters."""
+    node_binding = {"qg_id": "n0", "kg_id": ["CURIE:1", "CURIE:2"], "score": 1}
+    assert (
+        list(codegen.upgrade_NodeBinding(node_binding))
+        == list(upgrading.upgrade_NodeBinding(node_binding))
+    )
+    edge_binding = {"qg_id": "e01", "kg_id": "e0", "id": "xxx"}
+    assert (
+        list(codegen.upgrade_EdgeBinding(edge_binding))
+        == list(upgrading.upgrade_EdgeBinding(edge_binding))
+    )
+    node_binding = {"id": "CURIE:1", "qg_id": "n1"}
+    assert (
+        codegen.downgrade_NodeBinding(node_binding, "n0")
+        == downgrading.downgrade_NodeBinding(node_binding, "n0")
+    )
+
+
+def test_results():
+    """Test generated result converters."""
+    for message in (QUERY0["message"], MESSAGE0):
+        for result in message["results"]:
+            assert codegen.upgrade_Result(result) == upgrading.upgrade_Result(result)
+    for message in (upgrade_Query(QUERY0)["message"], MESSAGE1):
+        for result in message["results"]:
+            assert codegen.downgrade_Result(result) == downgrading.downgrade_Result(result)
+
+
+def test_graphs():
+    """Test generated graph converters."""
+    for qgraph, kgraph in zip(*[iter(_graphs0())] * 2):
+        assert codegen.upgrade_QueryGraph(qgraph) == upgrading.upgrade_QueryGraph(qgraph)
+        assert codegen.upgrade_KnowledgeGraph(kgraph) == upgrading.upgrade_KnowledgeGraph(kgraph)
+    for qgraph, kgraph in zip(*[iter(_graphs1())] * 2):
+        assert codegen.downgrade_QueryGraph(qgraph) == downgrading.downgrade_QueryGraph(qgraph)
+        assert (
+            codegen.downgrade_KnowledgeGraph(kgraph)
+            == downgrading.downgrade_KnowledgeGraph(kgraph)
+        )
+
+
+def test_generated_option():
+    """Test converting Messages and Queries with generated converters."""
+    assert upgrade_Query(QUERY0, generated=True) == upgrade_Query(QUERY0)
+    assert (
+        upgrade_Message(MESSAGE0, generated=True, dedupe=True)
+        == upgrade_Message(MESSAGE0, dedupe=True)
+    )
+    query1 = upgrade_Query(QUERY0)
+    assert downgrade_Query(query1, generated=True) == downgrade_Query(query1)
+    assert downgrade_Message(MESSAGE1, generated=True) == downgrade_Message(MESSAGE1)
+    message1 = {"query_graph": None, "knowledge_graph": None, "results": None}
+    assert downgrade_Message(message1, generated=True) == downgrade_Message(message1) == {}
+    with pytest.raises(ValueError):
+        upgrade_Message(MESSAGE0, inplace=True, generated=True)
+
+
+def test_precedence():
+    """Test that verbatim properties take precedence where they should."""
+    qnode = {"id": "n0", "type": "gene", "category": "biolink:Disease"}
+    assert codegen.upgrade_QNode(qnode) == upgrading.upgrade_QNode(qnode)
+    qedge = {"subject": "n0", "object": "n1", "id": "e00", "relation": None}
+    assert codegen.downgrade_QEdge(qedge, "e01") == downgrading.downgrade_QEdge(qedge, "e01")
+    node = {"id": "XXX:YYY", "subject": "a"}
+    assert codegen.upgrade_Node(node) == upgrading.upgrade_Node(node)
+
+
+def test_errors():
+    """Test that generated converters raise the same errors."""
+    with pytest.raises(KeyError):
+        codegen.upgrade_Edge({"id": "xxx", "source_id": "XXX:YYY"})
+    with pytest.raises(ValueError, match="multiple categories"):
+        codegen.downgrade_QNode({"category": ["biolink:Gene", "biolink:Disease"]}, "n0")
+
+
+def test_source():
+    """Test that generated source is available."""
+    assert codegen.source(codegen.upgrade_Node).startswith("def upgrade_Node(obj):")
@@ -0,0 +1,71 @@
+"""Test compact knowledge graph representation."""
+import pytest
+
+from reasoner_converter.compact import CompactKnowledgeGraph
+from reasoner_converter.downgrading import downgrade_KnowledgeGraph
+from reasoner_converter.upgrading import upgrade_KnowledgeGraph
+
+KGRAPH0 = {
+    "nodes": [
+        {
+            "id": "MONDO:0005737",
+            "type": ["disease"],
+            "name": "Ebola hemorrhagic fever",
+            "a": [1, 2],
+        },
+        {
+            "id": "HGNC:4897",
+            "type": ["gene", "named_thing"],
+        },
+        {
+            "id": "XXX:YYY",
+        },
+    ],
+    "edges": [
+        {
+            "id": "xxx",
+            "type": "related_to",
+            "source_id": "MONDO:0005737",
+            "target_id": "HGNC:4897",
+            "relation": "abc",
+            "b": {"c": None},
+        },
+        {
+            "id": "yyy",
+            "source_id": "HGNC:4897",
+            "target_id": "XXX:YYY",
+        },
+    ],
+}
+
+
+def test_092():
+    """Test building from and rendering as 0.9.2."""
+    kgraph = CompactKnowledgeGraph.from_092(KGRAPH0)
+    assert kgraph.to_092() == KGRAPH0
+    assert kgraph.to_100() == upgrade_KnowledgeGraph(KGRAPH0)
+    assert kgraph.strings.count("MONDO:0005737") == 1
+
+
+def test_100():
+    """Test building from and rendering as 1.0.0."""
+    kgraph1 = upgrade_KnowledgeGraph(KGRAPH0)
+    kgraph1["nodes"]["XXX:YYY"] = {
+        "category": "biolink:Disease",
+        "attributes": [
+            {"type": "EDAM:data_0006", "value": 0},
+            {"type": "EDAM:data_0006", "value": 1, "url": "http://example.com"},
+        ],
+    }
+    kgraph = CompactKnowledgeGraph.from_100(kgraph1)
+    assert kgraph.to_100() == kgraph1
+    assert kgraph.to_092() == downgrade_KnowledgeGraph(kgraph1)
+
+
+def test_lookup():
+    """Test random access by id."""
+    kgraph = CompactKnowledgeGraph.from_092(KGRAPH0)
+    assert kgraph.node_092("HGNC:4897") == KGRAPH0["nodes"][1]
+    assert kgraph.edge_100("yyy") == {"subject": "HGNC:4897", "object": "XXX:YYY"}
+    with pytest.raises(KeyError):
+        kgraph.node_100("xxx")
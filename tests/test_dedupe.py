@@ -0,0 +1,100 @@
+"""Test result deduplication."""
+import copy
+
+from reasoner_converter.dedupe import dedupe_Result, dedupe_Results
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+
+from .util.fixtures import QUERY0
+
+MESSAGE = {
+    "results": [
+        {
+            "node_bindings": [
+                {"qg_id": "n0", "kg_id": ["MONDO:0005737", "MONDO:0005737"]},
+                {"qg_id": "n1", "kg_id": "HGNC:4897"},
+            ],
+            "edge_bindings": [
+                {"qg_id": "e01", "kg_id": "e0"},
+                {"qg_id": "e01", "kg_id": "e0"},
+            ],
+            "score": 0.9,
+        },
+        {
+            # same bindings, in another order
+            "node_bindings": [
+                {"qg_id": "n1", "kg_id": "HGNC:4897"},
+                {"qg_id": "n0", "kg_id": "MONDO:0005737"},
+            ],
+            "edge_bindings": [
+                {"qg_id": "e01", "kg_id": "e0"},
+            ],
+            "score": 0.5,
+        },
+        {
+            "node_bindings": [
+                {"qg_id": "n0", "kg_id": "MONDO:0005737"},
+                {"qg_id": "n1", "kg_id": "HGNC:4897", "extra": "x"},
+            ],
+            "edge_bindings": [
+                {"qg_id": "e01", "kg_id": "e0"},
+            ],
+        },
+    ],
+}
+
+
+def test_dedupe_message():
+    """Test deduplicating results of an upgraded Message."""
+    message = upgrade_Message(copy.deepcopy(MESSAGE), dedupe=True)
+    assert message["results"] == [
+        {
+            "node_bindings": {
+                "n0": [{"id": "MONDO:0005737"}],
+                "n1": [{"id": "HGNC:4897"}],
+            },
+            "edge_bindings": {"e01": [{"id": "e0"}]},
+            "score": 0.9,
+        },
+        {
+            "node_bindings": {
+                "n0": [{"id": "MONDO:0005737"}],
+                "n1": [{"id": "HGNC:4897", "extra": "x"}],
+            },
+            "edge_bindings": {"e01": [{"id": "e0"}]},
+        },
+    ]
+    assert len(upgrade_Message(copy.deepcopy(MESSAGE))["results"]) == 3
+
+
+def test_dedupe_query():
+    """Test that deduplication does not change distinct results."""
+    assert upgrade_Query(QUERY0, dedupe=True) == upgrade_Query(QUERY0)
+    assert upgrade_Query(QUERY0, workers=2, dedupe=True) == upgrade_Query(QUERY0)
+
+
+def test_dedupe_result():
+    """Test deduplicating bindings, ignoring property order."""
+    result = {
+        "node_bindings": {"n0": [{"id": "a", "x": 1}, {"x": 1, "id": "a"}, {"id": "b"}]},
+        "edge_bindings": {},
+    }
+    assert dedupe_Result(result) is result
+    assert result["node_bindings"]["n0"] == [{"id": "a", "x": 1}, {"id": "b"}]
+    assert len(list(dedupe_Results([
+        {"node_bindings": {"n0": [{"id": "a"}]}, "edge_bindings": {}},
+        {"node_bindings": {}, "edge_bindings": {"n0": [{"id": "a"}]}},
+    ]))) == 2
+
+
+def test_dedupe_shared_values():
+    """Test that bindings sharing values are recognized as duplicates."""
+    value = [f"score{idx}" for idx in range(3)]
+    result = {
+        "node_bindings": {"n0": [
+            {"id": "a", "value": value},
+            {"id": "a", "value": value},
+            {"id": "a", "value": list(value)},
+        ]},
+        "edge_bindings": {},
+    }
+    assert len(dedupe_Result(result)["node_bindings"]["n0"]) == 1
@@ -0,0 +1,36 @@
+"""Test in-place conversion."""
+import copy
+
+from reasoner_converter.downgrading import downgrade_Query
+from reasoner_converter.upgrading import upgrade_Query
+
+from .util.fixtures import QUERY0
+
+
+def test_copy():
+    """Test that conversion does not modify its input by default."""
+    query0 = copy.deepcopy(QUERY0)
+    query1 = upgrade_Query(query0)
+    assert query0 == QUERY0
+    query1b = copy.deepcopy(query1)
+    downgrade_Query(query1)
+    assert query1 == query1b
+
+
+def test_inplace():
+    """Test in-place conversion."""
+    expected1 = upgrade_Query(QUERY0)
+    expected0 = downgrade_Query(expected1)
+
+    query = copy.deepcopy(QUERY0)
+    knode = query["message"]["knowledge_graph"]["nodes"][0]
+    query1 = upgrade_Query(query, inplace=True)
+    assert query1 is query
+    assert query1 == expected1
+    assert query1["message"]["knowledge_graph"]["nodes"]["MONDO:0005737"] is knode
+
+    qedge = query1["message"]["query_graph"]["edges"]["e01"]
+    query0 = downgrade_Query(query1, inplace=True)
+    assert query0 is query
+    assert query0 == expected0
+    assert query0["message"]["query_graph"]["edges"][0] is qedge
@@ -1,5 +1,40 @@
 """Test interface conversions."""
-from reasoner_converter.interfaces import downgrade_reasoner, upgrade_reasoner
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from reasoner_converter.interfaces import (
+    async_downgrade_reasoner, async_upgrade_reasoner,
+    downgrade_reasoner, upgrade_reasoner,
+)
+from reasoner_converter.upgrading import upgrade_Query
+
+QUERY0 = {
+    "message": {
+        "query_graph": {
+            "nodes": [{"id": "n0", "type": "disease"}],
+            "edges": [],
+        },
+        "knowledge_graph": {
+            "nodes": [{"id": "MONDO:0005737", "type": ["disease"]}],
+            "edges": [],
+        },
+        "results": [
+            {
+                "node_bindings": [{"qg_id": "n0", "kg_id": "MONDO:0005737"}],
+                "edge_bindings": [],
+            }
+        ],
+    }
+}
+
+
+def run(coroutine):
+    """Run coroutine to completion."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
 
 
 def test_downgrade():
@@ -118,3 +153,54 @@ def test_upgrade():
     }
     fcn = lambda x: x["message"]
     output = upgrade_reasoner(fcn)(query1)
+
+
+def test_async_downgrade():
+    """Test async downgrading interface."""
+    async def fcn(x):
+        await asyncio.sleep(0)
+        return x
+
+    expected = downgrade_reasoner(lambda x: x)(QUERY0)
+    assert run(async_downgrade_reasoner(fcn)(QUERY0)) == expected
+    with ThreadPoolExecutor(1) as executor:
+        wrapped = async_downgrade_reasoner(threshold=0, executor=executor)(fcn)
+        assert run(wrapped(QUERY0)) == expected
+
+
+def test_async_upgrade():
+    """Test async upgrading interface."""
+    query1 = upgrade_Query(QUERY0)
+    expected = upgrade_reasoner(lambda x: x["message"])(query1)
+
+    async def fcn(x):
+        return x["message"]
+
+    assert run(async_upgrade_reasoner(fcn)(query1)) == expected
+    wrapped = async_upgrade_reasoner(threshold=0)(lambda x: x["message"])
+    assert run(wrapped(query1)) == expected
+
+
+def test_timing_hook():
+    """Test reporting timings of wrapped reasoner calls."""
+    timings = []
+    query1 = upgrade_Query(QUERY0)
+    expected = downgrade_reasoner(lambda x: x)(QUERY0)
+    assert downgrade_reasoner(hook=timings.append)(lambda x: x)(QUERY0) == expected
+    assert set(timings[0]) == {
+        "input_conversion_seconds", "reasoner_seconds",
+        "output_conversion_seconds", "input_size", "output_size",
+    }
+    assert timings[0]["input_size"] == timings[0]["output_size"] == 2
+    assert all(value >= 0 for value in timings[0].values())
+
+    @upgrade_reasoner(hook=timings.append)
+    def fcn(x):
+        return x["message"]
+    assert fcn(query1) == upgrade_reasoner(lambda x: x["message"])(query1)
+
+    async def afcn(x):
+        return x["message"]
+    run(async_upgrade_reasoner(hook=timings.append)(afcn)(query1))
+    run(async_downgrade_reasoner(lambda x: x, hook=timings.append)(QUERY0))
+    assert len(timings) == 4
@@ -0,0 +1,69 @@
+"""Test string interning."""
+import json
+
+from reasoner_converter.downgrading import downgrade_Message
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+from reasoner_converter.util import intern_strings
+
+MESSAGE0 = json.loads(json.dumps({
+    "knowledge_graph": {
+        "nodes": [
+            {"id": "MONDO:0005737", "type": ["disease"]},
+            {"id": "HGNC:4897", "type": ["gene"]},
+        ],
+        "edges": [
+            {
+                "id": "xxx",
+                "type": "related_to",
+                "source_id": "MONDO:0005737",
+                "target_id": "HGNC:4897",
+            },
+        ],
+    },
+    "results": [
+        {
+            "node_bindings": [
+                {"qg_id": "n0", "kg_id": "MONDO:0005737"},
+                {"qg_id": "n1", "kg_id": "HGNC:4897"},
+            ],
+            "edge_bindings": [
+                {"qg_id": "e01", "kg_id": "xxx"},
+            ],
+        },
+    ],
+}))
+
+
+def test_intern_strings():
+    """Test interning strings in nested structures."""
+    table = dict()
+    a = "".join(["X:", "1"])
+    b = "".join(["X:", "1"])
+    assert a is not b
+    obj = intern_strings({a: [b, {"c": b}]}, table)
+    assert obj == {"X:1": ["X:1", {"c": "X:1"}]}
+    assert obj[a][0] is a
+    assert obj[a][1]["c"] is a
+    assert intern_strings({b: 0}, table) == {"X:1": 0}
+
+
+def test_upgrade():
+    """Test upgrading with interning."""
+    message1 = upgrade_Message(MESSAGE0, intern=True)
+    assert message1 == upgrade_Message(MESSAGE0)
+    key = next(iter(message1["knowledge_graph"]["nodes"]))
+    edge = message1["knowledge_graph"]["edges"]["xxx"]
+    binding = message1["results"][0]["node_bindings"]["n0"][0]
+    assert edge["subject"] is key
+    assert binding["id"] is key
+    assert upgrade_Query({"message": MESSAGE0}, intern=True) == {"message": message1}
+
+
+def test_downgrade():
+    """Test downgrading with interning."""
+    message1 = json.loads(json.dumps(upgrade_Message(MESSAGE0)))
+    message0 = downgrade_Message(message1, intern=True)
+    assert message0 == MESSAGE0
+    node_id = message0["knowledge_graph"]["nodes"][0]["id"]
+    assert message0["knowledge_graph"]["edges"][0]["source_id"] is node_id
+    assert message0["results"][0]["node_bindings"][0]["kg_id"] is node_id
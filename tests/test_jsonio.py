@@ -0,0 +1,52 @@
+"""Test JSON bytes conversion."""
+import json
+
+import pytest
+
+from reasoner_converter import jsonio
+from reasoner_converter.downgrading import downgrade_Message, downgrade_Query
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+
+from .util.fixtures import QUERY0
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request):
+    """Use each available JSON backend."""
+    pytest.importorskip(request.param)
+    previous = jsonio.BACKEND
+    jsonio.use_backend(request.param)
+    yield request.param
+    jsonio.use_backend(previous)
+
+
+def test_query(backend):
+    """Test Query bytes conversion."""
+    data = jsonio.upgrade_query_bytes(json.dumps(QUERY0).encode())
+    assert isinstance(data, bytes)
+    query1 = json.loads(data)
+    assert query1 == json.loads(json.dumps(upgrade_Query(QUERY0)))
+    assert json.loads(jsonio.downgrade_query_bytes(data)) == downgrade_Query(query1)
+
+
+def test_message(backend):
+    """Test Message bytes conversion."""
+    message1 = upgrade_Message(QUERY0["message"])
+    data = jsonio.downgrade_message_bytes(json.dumps(message1), intern=True)
+    assert json.loads(data) == downgrade_Message(message1)
+    data = jsonio.upgrade_message_bytes(data)
+    assert json.loads(data) == json.loads(json.dumps(message1))
+
+
+def test_lazy_attributes(backend):
+    """Test serializing LazyAttributes."""
+    data = json.dumps(QUERY0).encode()
+    assert jsonio.upgrade_query_bytes(data, lazy_attributes=True) == jsonio.upgrade_query_bytes(data)
+    with pytest.raises(TypeError):
+        jsonio.dumps({"value": object()})
+
+
+def test_unknown_backend():
+    """Test unknown JSON backend."""
+    with pytest.raises(ValueError):
+        jsonio.use_backend("simplejson5")
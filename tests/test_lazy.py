@@ -0,0 +1,53 @@
+"""Test lazy conversion."""
+import copy
+
+from reasoner_converter.downgrading import downgrade_Message
+from reasoner_converter.lazy import lazy_downgrade_Message, lazy_upgrade_Message
+from reasoner_converter.upgrading import upgrade_Message
+
+from .util.fixtures import QUERY0
+
+MESSAGE0 = QUERY0["message"]
+
+
+def test_upgrade():
+    """Test lazy upgrade matches eager upgrade."""
+    lazy = lazy_upgrade_Message(copy.deepcopy(MESSAGE0))
+    eager = upgrade_Message(MESSAGE0)
+    assert lazy == eager
+    assert lazy.materialize() == eager
+    assert isinstance(lazy.materialize()["results"], list)
+
+
+def test_downgrade():
+    """Test lazy downgrade matches eager downgrade."""
+    message1 = upgrade_Message(MESSAGE0)
+    lazy = lazy_downgrade_Message(message1)
+    eager = downgrade_Message(message1)
+    assert lazy == eager
+    assert lazy.materialize() == eager
+
+
+def test_on_access():
+    """Test that objects are converted only when accessed, once."""
+    message0 = copy.deepcopy(MESSAGE0)
+    message0["results"] *= 3
+    lazy = lazy_upgrade_Message(message0)
+    results = lazy["results"]
+    assert repr(results).endswith("0/3 converted>")
+    first = results[0]
+    assert results[0] is first
+    assert repr(results).endswith("1/3 converted>")
+    assert len(results[:2]) == 2
+
+    nodes = lazy["knowledge_graph"]["nodes"]
+    assert "HGNC:4897" in nodes
+    assert repr(nodes).endswith("0/2 converted>")
+    assert nodes["MONDO:0005737"]["category"] == ["biolink:Disease"]
+    assert repr(nodes).endswith("1/2 converted>")
+
+
+def test_null_sections():
+    """Test that null sections are dropped on downgrade."""
+    lazy = lazy_downgrade_Message({"query_graph": None, "results": []})
+    assert lazy == {"results": []}
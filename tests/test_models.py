@@ -0,0 +1,97 @@
+"""Test typed models."""
+import pytest
+
+from reasoner_converter import downgrading, models, upgrading
+from reasoner_converter.models import (
+    Edge092, Edge100, Node092, Node100, QEdge092, QEdge100, QNode092, QNode100,
+    Result092, Result100,
+)
+from reasoner_converter.synthetic import message0, message1
+from reasoner_converter.upgrading import upgrade_Query
+
+from .util.fixtures import QUERY0
+
+MESSAGES0 = [QUERY0["message"], message0(nodes=20, edges=20, results=20, attributes=3, seed=0)]
+MESSAGES1 = [
+    upgrade_Query(QUERY0)["message"],
+    message1(nodes=20, edges=20, results=20, attributes=3, seed=0),
+]
+
+
+def _drop_none(obj):
+    """Drop null-valued properties."""
+    return {key: value for key, value in obj.items() if value is not None}
+
+
+@pytest.mark.parametrize("name,model,graph,kind", [
+    ("upgrade_Node", Node092, "knowledge_graph", "nodes"),
+    ("upgrade_Edge", Edge092, "knowledge_graph", "edges"),
+    ("upgrade_QNode", QNode092, "query_graph", "nodes"),
+    ("upgrade_QEdge", QEdge092, "query_graph", "edges"),
+])
+def test_upgrade(name, model, graph, kind):
+    """Test upgrading models."""
+    for message in MESSAGES0:
+        for obj in message[graph][kind]:
+            converted = getattr(models, name)(model.from_dict(obj))
+            assert converted.to_dict() == _drop_none(getattr(upgrading, name)(obj))
+
+
+@pytest.mark.parametrize("name,model,graph,kind", [
+    ("downgrade_Node", Node100, "knowledge_graph", "nodes"),
+    ("downgrade_Edge", Edge100, "knowledge_graph", "edges"),
+    ("downgrade_QNode", QNode100, "query_graph", "nodes"),
+    ("downgrade_QEdge", QEdge100, "query_graph", "edges"),
+])
+def test_downgrade(name, model, graph, kind):
+    """Test downgrading models."""
+    for message in MESSAGES1:
+        for id_, obj in message[graph][kind].items():
+            converted = getattr(models, name)(model.from_dict(obj), id_)
+            assert converted.to_dict() == _drop_none(getattr(downgrading, name)(obj, id_))
+
+
+def test_results():
+    """Test converting Results."""
+    for message in MESSAGES0:
+        for result in message["results"]:
+            converted = models.upgrade_Result(Result092.from_dict(result))
+            assert converted.to_dict() == upgrading.upgrade_Result(result)
+            assert models.downgrade_Result(converted).to_dict() == downgrading.downgrade_Result(
+                upgrading.upgrade_Result(result)
+            )
+    for message in MESSAGES1:
+        for result in message["results"]:
+            converted = models.downgrade_Result(Result100.from_dict(result))
+            assert converted.to_dict() == downgrading.downgrade_Result(result)
+
+
+def test_model_round_trip():
+    """Test that models render what they were built from."""
+    for message in MESSAGES0:
+        for node in message["knowledge_graph"]["nodes"]:
+            model = Node092.from_dict(node)
+            assert model.to_dict() == _drop_none(node)
+            assert Node092.from_dict(model.to_dict()) == model
+    edge = {"subject": "a", "object": "b", "extra": 1}
+    assert Edge100.from_dict(edge).to_dict() == edge
+    assert Edge100.from_dict(edge).extra == {"extra": 1}
+    assert Edge100.from_dict(edge) != Edge092.from_dict(downgrading.downgrade_Edge(edge, "e"))
+    assert repr(Node100(name="x")) == "Node100(category=None, name='x', attributes=None, extra={})"
+
+
+def test_slots():
+    """Test that models have no per-instance dict."""
+    node = Node100(name="x")
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.color = "red"
+
+
+def test_errors():
+    """Test that model conversion raises the same errors."""
+    qnode = QNode100.from_dict({"category": ["biolink:Gene", "biolink:Disease"]})
+    with pytest.raises(ValueError, match="multiple categories"):
+        models.downgrade_QNode(qnode, "n0")
+    with pytest.raises(KeyError):
+        Edge092.from_dict({"id": "e0", "source_id": "a"})
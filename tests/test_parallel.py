@@ -0,0 +1,138 @@
+"""Test parallel conversion."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from reasoner_converter import parallel
+from reasoner_converter.downgrading import (
+    downgrade_KnowledgeGraph, downgrade_Query, downgrade_Result, downgrade_Results,
+)
+from reasoner_converter.parallel import effective_workers
+from reasoner_converter.upgrading import (
+    upgrade_KnowledgeGraph, upgrade_Query, upgrade_Result, upgrade_Results,
+)
+
+KGRAPH0 = {
+    "nodes": [
+        {
+            "id": f"XXX:{idx}",
+            "type": ["disease"],
+            "name": f"node {idx}",
+            "a": idx,
+        }
+        for idx in range(25)
+    ],
+    "edges": [
+        {
+            "id": f"e{idx}",
+            "type": "related_to",
+            "source_id": f"XXX:{idx}",
+            "target_id": f"XXX:{idx + 1}",
+            "b": idx,
+        }
+        for idx in range(24)
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def force_parallel(monkeypatch):
+    """Convert in parallel regardless of size and available CPUs."""
+    monkeypatch.setattr(parallel, "MIN_ITEMS", 0)
+    monkeypatch.setattr(parallel, "available_cpus", lambda: 2)
+
+
+def test_effective_workers(monkeypatch):
+    """Test falling back to serial conversion."""
+    monkeypatch.setattr(parallel, "MIN_ITEMS", 100)
+    assert effective_workers(None, 1000) is None
+    assert effective_workers(4, 99) is None
+    assert effective_workers(4, 100) == 4
+    monkeypatch.setattr(parallel, "available_cpus", lambda: 1)
+    assert effective_workers(4, 1000) is None
+    with ThreadPoolExecutor(2) as executor:
+        assert effective_workers(executor, 1000) is executor
+
+
+def test_kgraph_processes():
+    """Test parallel kgraph conversion across processes."""
+    kgraph1 = upgrade_KnowledgeGraph(KGRAPH0, workers=2, chunksize=4)
+    assert kgraph1 == upgrade_KnowledgeGraph(KGRAPH0)
+    assert list(kgraph1["nodes"]) == [knode["id"] for knode in KGRAPH0["nodes"]]
+
+    kgraph0 = downgrade_KnowledgeGraph(kgraph1, workers=2, chunksize=4)
+    assert kgraph0 == downgrade_KnowledgeGraph(kgraph1) == KGRAPH0
+
+
+def test_kgraph_executor():
+    """Test parallel kgraph conversion with a given executor."""
+    with ThreadPoolExecutor(2) as executor:
+        kgraph1 = upgrade_KnowledgeGraph(KGRAPH0, workers=executor, chunksize=3)
+        kgraph0 = downgrade_KnowledgeGraph(kgraph1, workers=executor, chunksize=3)
+    assert kgraph0 == KGRAPH0
+
+
+def test_results():
+    """Test chunked results conversion."""
+    results0 = [
+        {
+            "node_bindings": [
+                {"qg_id": "n0", "kg_id": f"XXX:{idx}"},
+            ],
+            "edge_bindings": [
+                {"qg_id": "e01", "kg_id": [f"e{idx}", f"e{idx + 1}"]},
+            ],
+            "score": idx,
+        }
+        for idx in range(30)
+    ]
+    serial = list(upgrade_Results(results0))
+    assert serial == [upgrade_Result(result) for result in results0]
+
+    results1 = upgrade_Results(results0, workers=2, chunksize=4)
+    assert next(results1) == serial[0]
+    assert list(results1) == serial[1:]
+
+    results0b = list(downgrade_Results(serial, workers=2, chunksize=4))
+    assert results0b == [downgrade_Result(result) for result in serial]
+
+
+def test_message():
+    """Test parallel message conversion."""
+    message0 = {
+        "knowledge_graph": KGRAPH0,
+        "results": [
+            {
+                "node_bindings": [{"qg_id": "n0", "kg_id": "XXX:1"}],
+                "edge_bindings": [{"qg_id": "e01", "kg_id": "e1"}],
+            },
+        ] * 10,
+    }
+    query1 = upgrade_Query({"message": message0}, workers=2, chunksize=4)
+    assert query1 == upgrade_Query({"message": message0})
+    assert downgrade_Query(query1, workers=2, chunksize=4) == {"message": message0}
+
+
+def test_message_sections(monkeypatch):
+    """Test that parallelism is decided per Message section."""
+    message0 = {
+        "knowledge_graph": KGRAPH0,
+        "results": [
+            {
+                "node_bindings": [{"qg_id": "n0", "kg_id": "XXX:1"}],
+                "edge_bindings": [{"qg_id": "e01", "kg_id": "e1"}],
+            },
+        ] * 10,
+    }
+    # neither section is large enough, though together they are
+    monkeypatch.setattr(parallel, "MIN_ITEMS", 50)
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", None)
+    message1 = upgrade_Query({"message": message0}, workers=2)["message"]
+    assert downgrade_Query({"message": message1}, workers=2) == {"message": message0}
+
+    # only the knowledge graph is
+    monkeypatch.setattr(parallel, "MIN_ITEMS", 20)
+    with ThreadPoolExecutor(2) as executor:
+        assert upgrade_Query({"message": message0}, workers=executor)["message"] == message1
+    assert parallel.parallel_sections(2, message0) == (True, False)
+    assert parallel.parallel_sections(2, message1) == (True, False)
@@ -0,0 +1,121 @@
+"""Test converter instrumentation."""
+from contextlib import contextmanager
+import threading
+
+import pytest
+
+from reasoner_converter import upgrading
+from reasoner_converter.interfaces import upgrade_reasoner
+from reasoner_converter.profiling import Profile
+from reasoner_converter.upgrading import upgrade_Query
+
+from .util.fixtures import QUERY0
+
+
+def test_profile():
+    """Test recording converter measurements."""
+    original = upgrading.upgrade_Node
+    with Profile() as profile:
+        assert upgrading.upgrade_Node is not original
+        upgrading.upgrade_Query(QUERY0)
+    assert upgrading.upgrade_Node is original
+
+    stats = profile.stats
+    assert stats["upgrade_Query"]["calls"] == 1
+    assert stats["upgrade_Query"]["objects"] == 4
+    assert stats["upgrade_KnowledgeGraph"]["objects"] == 3
+    assert stats["upgrade_Node"]["calls"] == 2
+    assert stats["upgrade_Results"]["objects"] == 1
+    assert stats["upgrade_NodeBinding"]["objects"] == 3
+    assert stats["upgrade_Query"]["seconds"] >= stats["upgrade_Message"]["seconds"]
+
+    text = profile.prometheus()
+    assert "# TYPE reasoner_converter_calls_total counter" in text
+    assert 'reasoner_converter_calls_total{function="upgrade_Node"} 2' in text
+
+
+def test_interfaces():
+    """Test that conversions in other modules are recorded."""
+    calls = []
+    wrapped = upgrade_reasoner(lambda query: query["message"])
+    with Profile(callback=lambda *args: calls.append(args[0])):
+        wrapped(upgrade_Query(QUERY0))
+    assert "downgrade_Query" in calls
+    assert "upgrade_Message" in calls
+
+
+class Tracer:
+    """Fake OpenTelemetry tracer."""
+
+    def __init__(self):
+        """Initialize."""
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name):
+        """Start span."""
+        attributes = dict()
+        self.spans.append((name, attributes))
+
+        class Span:
+            set_attribute = attributes.__setitem__
+        yield Span()
+
+
+def test_spans():
+    """Test reporting coarse-grained converters as spans."""
+    tracer = Tracer()
+    with Profile(tracer=tracer):
+        upgrading.upgrade_Query(QUERY0)
+    names = [name for name, _ in tracer.spans]
+    assert names[0] == "upgrade_Query"
+    assert "upgrade_KnowledgeGraph" in names
+    assert "upgrade_Node" not in names
+    assert tracer.spans[0][1] == {"reasoner_converter.objects": 4}
+
+
+def test_nested():
+    """Test that only one profile can be active."""
+    with Profile():
+        with pytest.raises(RuntimeError):
+            with Profile():
+                pass
+
+
+def test_keyword_arguments():
+    """Test recording converters called with keyword arguments only."""
+    with Profile() as profile:
+        upgrading.upgrade_KnowledgeGraph(kgraph=QUERY0["message"]["knowledge_graph"])
+    assert profile.stats["upgrade_KnowledgeGraph"]["objects"] == 3
+
+
+def test_threads():
+    """Test that conversions in other threads are not recorded."""
+    profiles = []
+
+    def convert():
+        with Profile() as profile:
+            for _ in range(100):
+                upgrading.upgrade_Query(QUERY0)
+        profiles.append(profile)
+
+    with Profile() as profile:
+        threads = [threading.Thread(target=convert) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(100):
+            upgrading.upgrade_Query(QUERY0)
+        for thread in threads:
+            thread.join()
+    for profile in profiles + [profile]:
+        assert profile.stats["upgrade_Query"]["calls"] == 100
+        assert profile.stats["upgrade_Node"]["calls"] == 200
+    assert upgrading.upgrade_Node.__module__ == upgrading.__name__
+    assert not hasattr(upgrading.upgrade_Node, "__wrapped__")
+
+
+def test_other_modules():
+    """Test that other modules' namespaces are not modified."""
+    with Profile():
+        assert hasattr(upgrading.upgrade_Query, "__wrapped__")
+        assert not hasattr(globals()["upgrade_Query"], "__wrapped__")
@@ -0,0 +1,121 @@
+"""Test incremental conversion sessions."""
+import copy
+
+from reasoner_converter.downgrading import downgrade_Message
+from reasoner_converter.session import DowngradeSession, UpgradeSession
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+
+from .util.fixtures import QUERY0
+
+MESSAGE0 = QUERY0["message"]
+
+
+def test_upgrade():
+    """Test incremental upgrade."""
+    message0 = copy.deepcopy(MESSAGE0)
+    session = UpgradeSession()
+    assert session.convert(message0) == upgrade_Message(message0)
+    assert (session.converted, session.reused) == (4, 0)
+
+    # add an edge and modify a node in place
+    message0["knowledge_graph"]["edges"].append({
+        "id": "yyy",
+        "source_id": "HGNC:4897",
+        "target_id": "MONDO:0005737",
+    })
+    message0["knowledge_graph"]["nodes"][1]["score"] = 1.0
+    session.mark_modified(message0["knowledge_graph"]["nodes"][1])
+    message1 = session.convert(message0)
+    assert message1 == upgrade_Message(message0)
+    assert (session.converted, session.reused) == (2, 3)
+
+    # remove a node
+    del message0["knowledge_graph"]["nodes"][0]
+    message1 = session.convert(message0)
+    assert message1 == upgrade_Message(message0)
+    assert (session.converted, session.reused) == (0, 4)
+
+
+def test_downgrade():
+    """Test incremental downgrade."""
+    message1 = upgrade_Message(MESSAGE0)
+    session = DowngradeSession()
+    assert session.convert(message1) == downgrade_Message(message1)
+
+    message1["results"].append({
+        "node_bindings": {"n0": [{"id": "HGNC:4897"}]},
+        "edge_bindings": {},
+    })
+    assert session.convert(message1) == downgrade_Message(message1)
+    assert (session.converted, session.reused) == (1, 4)
+
+    # modify a result in place
+    message1["results"][0]["score"] = 1.0
+    session.mark_modified(message1["results"][0])
+    assert session.convert(message1) == downgrade_Message(message1)
+    assert (session.converted, session.reused) == (1, 4)
+
+    session.reset()
+    session.convert(message1)
+    assert session.reused == 0
+
+
+def test_query():
+    """Test incremental Query conversion."""
+    query1 = upgrade_Query(QUERY0)
+    assert UpgradeSession().convert_query(QUERY0) == query1
+
+
+def _message0(count):
+    """Build a 0.9.2 Message with non-interned values."""
+    return {
+        "knowledge_graph": {
+            "nodes": [
+                {"id": f"CURIE:{idx}", "type": [f"type{idx % 3}"], "name": f"node {idx}"}
+                for idx in range(count)
+            ],
+            "edges": [
+                {
+                    "id": f"e{idx}",
+                    "source_id": f"CURIE:{idx}",
+                    "target_id": f"CURIE:{(idx + 1) % count}",
+                    "type": "treats",
+                    "value": [f"v{idx}"],
+                }
+                for idx in range(count)
+            ],
+        },
+        "results": [
+            {
+                "node_bindings": [{"qg_id": "n0", "kg_id": f"CURIE:{idx}"}],
+                "edge_bindings": [{"qg_id": "e01", "kg_id": f"e{idx}"}],
+            }
+            for idx in range(count)
+        ],
+    }
+
+
+def test_copied():
+    """Test that copies are reconverted."""
+    session = UpgradeSession()
+    session.convert(MESSAGE0)
+    session.convert(copy.deepcopy(MESSAGE0))
+    assert (session.converted, session.reused) == (4, 0)
+
+
+def test_reconvert_unchanged():
+    """Test that reconverting the same unchanged Message reuses everything."""
+    message0 = _message0(20)
+    session = UpgradeSession()
+    message1 = session.convert(message0)
+    assert (session.converted, session.reused) == (60, 0)
+    for _ in range(2):
+        assert session.convert(message0) == message1
+        assert (session.converted, session.reused) == (0, 60)
+
+    session = DowngradeSession()
+    message0 = session.convert(message1)
+    assert (session.converted, session.reused) == (60, 0)
+    for _ in range(2):
+        assert session.convert(message1) == message0
+        assert (session.converted, session.reused) == (0, 60)
@@ -0,0 +1,124 @@
+"""Test memory-mapped knowledge graph stores."""
+import gc
+import io
+import json
+import warnings
+
+import pytest
+
+from reasoner_converter.downgrading import downgrade_KnowledgeGraph
+from reasoner_converter.store import (
+    KnowledgeGraphStore, KnowledgeGraphStoreWriter,
+    downgrade_KnowledgeGraph_store, downgrade_message_store,
+    upgrade_KnowledgeGraph_store, upgrade_message_store,
+)
+from reasoner_converter.upgrading import upgrade_KnowledgeGraph, upgrade_Query
+
+from .util.fixtures import QUERY0
+
+KGRAPH0 = QUERY0["message"]["knowledge_graph"]
+
+
+def test_upgrade(tmp_path):
+    """Test upgrading into a store."""
+    path = str(tmp_path / "kgraph.store")
+    upgrade_KnowledgeGraph_store(KGRAPH0, path)
+    expected = upgrade_KnowledgeGraph(KGRAPH0)
+    with KnowledgeGraphStore(path) as store:
+        assert store.version == "1.0.0"
+        assert store.nodes["MONDO:0005737"] == expected["nodes"]["MONDO:0005737"]
+        assert store.edges["xxx"] == expected["edges"]["xxx"]
+        assert "HGNC:4897" in store.nodes
+        assert "HGNC:0000" not in store.nodes
+        with pytest.raises(KeyError):
+            store.edges["yyy"]
+        assert list(store.nodes) == list(expected["nodes"])
+        assert store.to_dict() == expected
+
+
+def test_downgrade(tmp_path):
+    """Test downgrading into a store."""
+    path = str(tmp_path / "kgraph.store")
+    kgraph1 = upgrade_KnowledgeGraph(KGRAPH0)
+    downgrade_KnowledgeGraph_store(kgraph1, path)
+    expected = downgrade_KnowledgeGraph(kgraph1)
+    with KnowledgeGraphStore(path) as store:
+        assert store.version == "0.9.2"
+        assert store.nodes["HGNC:4897"] == expected["nodes"][1]
+        assert len(store.edges) == 1
+        assert store.to_dict() == expected
+
+
+def test_stream(tmp_path):
+    """Test converting a streamed Query/Message into a store."""
+    path = str(tmp_path / "kgraph.store")
+    upgrade_message_store(io.BytesIO(json.dumps(QUERY0).encode()), path)
+    with KnowledgeGraphStore(path) as store:
+        assert store.to_dict() == upgrade_KnowledgeGraph(KGRAPH0)
+
+    message1 = upgrade_Query(QUERY0)["message"]
+    downgrade_message_store(io.StringIO(json.dumps(message1)), path)
+    with KnowledgeGraphStore(path) as store:
+        assert store.to_dict() == downgrade_KnowledgeGraph(message1["knowledge_graph"])
+
+    upgrade_message_store(io.StringIO('{"knowledge_graph": null}'), path)
+    with KnowledgeGraphStore(path) as store:
+        assert store.to_dict() == {"nodes": {}, "edges": {}}
+
+
+def test_many(tmp_path):
+    """Test lookups in a larger store."""
+    path = str(tmp_path / "kgraph.store")
+    kgraph = {
+        "nodes": [{"id": f"XXX:{idx}", "type": ["gene"]} for idx in range(1000)],
+        "edges": [],
+    }
+    upgrade_KnowledgeGraph_store(kgraph, path)
+    with KnowledgeGraphStore(path) as store:
+        assert all(
+            store.nodes[f"XXX:{idx}"] == {"category": ["biolink:Gene"]}
+            for idx in range(1000)
+        )
+
+
+def test_invalid(tmp_path):
+    """Test opening a file that is not a store."""
+    path = tmp_path / "kgraph.json"
+    path.write_text(json.dumps(KGRAPH0))
+    with pytest.raises(ValueError):
+        KnowledgeGraphStore(str(path))
+
+
+def test_empty(tmp_path):
+    """Test opening an empty file, which cannot be memory-mapped."""
+    path = tmp_path / "kgraph.store"
+    path.write_bytes(b"")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        with pytest.raises(ValueError, match="not a knowledge graph store"):
+            KnowledgeGraphStore(str(path))
+        gc.collect()
+    assert not [warning for warning in caught if warning.category is ResourceWarning]
+
+
+def test_failed_conversion(tmp_path):
+    """Test that a conversion failing partway leaves no store."""
+    path = tmp_path / "kgraph.store"
+    message = {"knowledge_graph": {
+        "nodes": [{"id": "a"}, {"id": "b"}, {"type": ["gene"]}],
+        "edges": [],
+    }}
+    with pytest.raises(KeyError):
+        upgrade_message_store(io.BytesIO(json.dumps(message).encode()), str(path))
+    assert not path.exists()
+
+
+def test_lazy_attributes(tmp_path):
+    """Test storing nodes and edges with LazyAttributes."""
+    path = str(tmp_path / "kgraph.store")
+    kgraph = upgrade_KnowledgeGraph(KGRAPH0, lazy_attributes=True)
+    with KnowledgeGraphStoreWriter(path, "1.0.0") as writer:
+        for id_, node in kgraph["nodes"].items():
+            writer.add_node(id_, node)
+    with KnowledgeGraphStore(path) as store:
+        assert dict(store.nodes.iter_items()) == upgrade_KnowledgeGraph(KGRAPH0)["nodes"]
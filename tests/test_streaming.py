@@ -0,0 +1,161 @@
+"""Test streaming conversions."""
+import io
+import json
+
+import pytest
+
+from reasoner_converter.downgrading import downgrade_Message, downgrade_Query
+from reasoner_converter.streaming import (
+    JSONReader,
+    downgrade_message_stream, downgrade_query_stream,
+    upgrade_message_stream, upgrade_query_stream,
+)
+from reasoner_converter.upgrading import upgrade_Message, upgrade_Query
+
+MESSAGE0 = {
+    "query_graph": {
+        "nodes": [
+            {
+                "id": "n0",
+                "type": "disease",
+            }
+        ],
+        "edges": [
+            {
+                "id": "e01",
+                "type": "related_to",
+                "source_id": "n0",
+                "target_id": "n1",
+            }
+        ]
+    },
+    "knowledge_graph": {
+        "nodes": [
+            {
+                "id": "MONDO:0005737",
+                "type": ["disease"],
+                "name": "Ebola hemorrhagic fever é",
+                "score": 12345.678,
+            },
+            {
+                "id": "HGNC:4897",
+                "type": ["gene"],
+            },
+        ],
+        "edges": [
+            {
+                "id": "xxx",
+                "type": "related_to",
+                "source_id": "MONDO:0005737",
+                "target_id": "HGNC:4897",
+                "publications": ["PMID:1", "PMID:2"],
+            }
+        ]
+    },
+    "results": [
+        {
+            "node_bindings": [
+                {
+                    "qg_id": "n0",
+                    "kg_id": ["MONDO:0005737", "HGNC:4897"],
+                },
+            ],
+            "edge_bindings": [
+                {
+                    "qg_id": "e01",
+                    "kg_id": "xxx",
+                },
+            ],
+            "score": 1000000,
+        }
+    ],
+    "extra": {"ignored": [1, 2, {"x": None}]},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_upgrade_message_stream(chunk_size):
+    """Test streaming Message 0.9.2 -> 1.0.0."""
+    instream = io.BytesIO(json.dumps(MESSAGE0, indent=2).encode("utf-8"))
+    outstream = io.BytesIO()
+    upgrade_message_stream(instream, outstream, chunk_size=chunk_size)
+    assert json.loads(outstream.getvalue()) == upgrade_Message(MESSAGE0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_downgrade_message_stream(chunk_size):
+    """Test streaming Message 1.0.0 -> 0.9.2."""
+    message1 = upgrade_Message(MESSAGE0)
+    instream = io.StringIO(json.dumps(message1))
+    outstream = io.StringIO()
+    downgrade_message_stream(instream, outstream, chunk_size=chunk_size)
+    assert json.loads(outstream.getvalue()) == downgrade_Message(message1)
+
+
+def test_query_stream():
+    """Test streaming Query round trip."""
+    query0 = {"message": MESSAGE0, "a": [1, 2]}
+    upgraded = io.StringIO()
+    upgrade_query_stream(io.StringIO(json.dumps(query0)), upgraded)
+    query1 = json.loads(upgraded.getvalue())
+    assert query1 == upgrade_Query(query0)
+
+    downgraded = io.StringIO()
+    downgrade_query_stream(io.StringIO(upgraded.getvalue()), downgraded)
+    assert json.loads(downgraded.getvalue()) == downgrade_Query(query1)
+
+
+def test_null_sections():
+    """Test streaming Message with null sections."""
+    outstream = io.StringIO()
+    downgrade_message_stream(
+        io.StringIO('{"query_graph": null, "knowledge_graph": null, "results": null}'),
+        outstream,
+    )
+    assert json.loads(outstream.getvalue()) == {}
+
+
+def test_malformed():
+    """Test streaming malformed JSON."""
+    with pytest.raises(ValueError):
+        upgrade_message_stream(io.StringIO('{"results": [{"node_bindings": ['), io.StringIO())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_multibyte_split(chunk_size):
+    """Test reading with chunks that split multi-byte characters."""
+    message0 = {
+        "knowledge_graph": {
+            "nodes": [{"id": "CURIE:é", "type": ["gene"], "name": "α-synucléine €"}],
+            "edges": [],
+        },
+        "é": "ü",
+    }
+    instream = io.BytesIO(json.dumps(message0, ensure_ascii=False).encode("utf-8"))
+    outstream = io.BytesIO()
+    upgrade_message_stream(instream, outstream, chunk_size=chunk_size)
+    assert json.loads(outstream.getvalue()) == upgrade_Message(message0)
+
+    reader = JSONReader(io.BytesIO('{"é":1}'.encode("utf-8")), chunk_size=chunk_size)
+    assert [(key, reader.value()) for key in reader.members()] == [("é", 1)]
+
+
+def test_malformed_early():
+    """Test that a malformed element is reported without reading further."""
+    nodes = ", ".join('{"id": "n%d", "type": ["gene"]}' % idx for idx in range(10000))
+    text = '{"knowledge_graph": {"nodes": [{"id": x}, ' + nodes + "]}}"
+    instream = io.BytesIO(text.encode())
+    with pytest.raises(ValueError):
+        upgrade_message_stream(instream, io.StringIO(), chunk_size=256)
+    assert instream.tell() < 1024
+
+
+def test_max_value_size():
+    """Test that elements larger than max_value_size are rejected."""
+    reader = JSONReader(io.StringIO(json.dumps(["x" * 1000])), chunk_size=16, max_value_size=100)
+    next(reader.elements())
+    with pytest.raises(ValueError):
+        reader.value()
+    reader = JSONReader(io.StringIO(json.dumps(["x" * 50])), chunk_size=16, max_value_size=100)
+    next(reader.elements())
+    assert reader.value() == "x" * 50
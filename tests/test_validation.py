@@ -0,0 +1,31 @@
+"""Test schema validation."""
+from jsonschema import ValidationError
+import pytest
+
+from reasoner_converter.validation import get_validator, validate0, validate1
+
+
+def test_invalid():
+    """Test validating invalid objects."""
+    with pytest.raises(ValidationError):
+        validate0({"id": "xxx"}, "Edge")
+    with pytest.raises(ValidationError):
+        validate1({"subject": "XXX:YYY"}, "Edge")
+
+
+def test_nullable():
+    """Test that nullable 1.0.0 properties accept null."""
+    validate1({"category": None, "name": None, "attributes": None}, "Node")
+
+
+def test_unknown():
+    """Test validating against unknown component or version."""
+    with pytest.raises(ValueError):
+        validate1({}, "Nothing")
+    with pytest.raises(ValueError):
+        get_validator("2.0.0", "Node")
+
+
+def test_cached():
+    """Test that validators are built once."""
+    assert get_validator("1.0.0", "Message") is get_validator("1.0.0", "Message")
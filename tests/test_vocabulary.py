@@ -0,0 +1,49 @@
+"""Test Biolink vocabulary lookup."""
+import json
+
+from reasoner_converter.downgrading import (
+    downgrade_BiolinkEntity, downgrade_BiolinkPredicate,
+)
+from reasoner_converter.upgrading import (
+    upgrade_BiolinkEntity, upgrade_BiolinkRelation,
+)
+from reasoner_converter.vocabulary import (
+    clear_vocabulary, load_vocabulary, UPGRADE_ENTITY,
+)
+
+
+def test_irregular_casing():
+    """Test terms that casing alone cannot round-trip."""
+    assert upgrade_BiolinkEntity("RNA_product") == "biolink:RNAProduct"
+    assert downgrade_BiolinkEntity("biolink:RNAProduct") == "RNA_product"
+    assert upgrade_BiolinkEntity("noncoding_RNA_product") == "biolink:NoncodingRNAProduct"
+    assert downgrade_BiolinkEntity("biolink:NoncodingRNAProduct") == "noncoding_RNA_product"
+
+
+def test_fallback():
+    """Test terms outside the vocabulary."""
+    assert "made_up_thing" not in UPGRADE_ENTITY
+    assert upgrade_BiolinkEntity("made_up_thing") == "biolink:MadeUpThing"
+    assert downgrade_BiolinkEntity("biolink:MadeUpThing") == "made_up_thing"
+    assert upgrade_BiolinkRelation("made_up_to") == "biolink:made_up_to"
+    assert downgrade_BiolinkPredicate("biolink:made_up_to") == "made_up_to"
+
+
+def test_load(tmp_path):
+    """Test loading a custom vocabulary."""
+    path = tmp_path / "vocabulary.json"
+    path.write_text(json.dumps({
+        "entities": {"made_up_thing": "MadeUPThing"},
+        "predicates": [],
+    }))
+    try:
+        load_vocabulary(str(path))
+        assert upgrade_BiolinkEntity("made_up_thing") == "biolink:MadeUPThing"
+        assert downgrade_BiolinkEntity("biolink:MadeUPThing") == "made_up_thing"
+        assert downgrade_BiolinkEntity("biolink:RNAProduct") == "RNAProduct"
+
+        clear_vocabulary()
+        assert upgrade_BiolinkEntity("made_up_thing") == "biolink:MadeUpThing"
+    finally:
+        load_vocabulary()
+    assert downgrade_BiolinkEntity("biolink:RNAProduct") == "RNA_product"
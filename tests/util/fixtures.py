@@ -0,0 +1,74 @@
+"""Shared test data."""
+QUERY0 = {
+    "message": {
+        "query_graph": {
+            "nodes": [
+                {
+                    "id": "n0",
+                    "type": "disease",
+                    "curie": "MONDO:0005737",
+                    "a": 1,
+                },
+                {
+                    "id": "n1",
+                },
+            ],
+            "edges": [
+                {
+                    "id": "e01",
+                    "type": "related_to",
+                    "source_id": "n0",
+                    "target_id": "n1",
+                    "relation": "abc",
+                    "b": 2,
+                }
+            ]
+        },
+        "knowledge_graph": {
+            "nodes": [
+                {
+                    "id": "MONDO:0005737",
+                    "type": ["disease"],
+                    "name": "Ebola hemorrhagic fever",
+                    "c": 3,
+                },
+                {
+                    "id": "HGNC:4897",
+                },
+            ],
+            "edges": [
+                {
+                    "id": "xxx",
+                    "type": "related_to",
+                    "source_id": "MONDO:0005737",
+                    "target_id": "HGNC:4897",
+                    "relation": "abc",
+                    "d": 4,
+                }
+            ]
+        },
+        "results": [
+            {
+                "node_bindings": [
+                    {
+                        "qg_id": "n0",
+                        "kg_id": "MONDO:0005737",
+                        "e": 5,
+                    },
+                    {
+                        "qg_id": "n1",
+                        "kg_id": ["HGNC:4897", "MONDO:0005737"],
+                    },
+                ],
+                "edge_bindings": [
+                    {
+                        "qg_id": "e01",
+                        "kg_id": "xxx",
+                    },
+                ],
+                "f": 6,
+            }
+        ]
+    },
+    "g": 7,
+}